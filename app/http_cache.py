@@ -0,0 +1,135 @@
+# app/http_cache.py: Response compression and cache headers for the dashboard.
+# - Static URLs carry a content hash (?v=<hash>) and are served as immutable for a year;
+#   any other ?v (stale or made up) gets a response the browser revalidates.
+# - Text responses (HTML, CSS, JS, JSON) are gzip/brotli compressed when the client accepts it.
+
+import gzip
+import hashlib
+import os
+import threading
+
+from flask import request
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/csv",
+    "application/javascript", "text/javascript", "application/json",
+}
+
+# Smaller bodies aren't worth the CPU or the extra headers
+MIN_COMPRESS_SIZE = 500
+
+STATIC_MAX_AGE = 31536000  # one year
+
+_static_hashes = {}          # filename -> (mtime, hash)
+_compressed_static = {}      # (filename, encoding) -> (hash, compressed bytes); one version per file
+_cache_lock = threading.Lock()
+
+
+def _static_hash(static_folder, filename):
+    """Returns a short content hash for a static file, cached until its mtime changes."""
+    path = os.path.join(static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _static_hashes.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:10]
+    with _cache_lock:
+        _static_hashes[filename] = (mtime, digest)
+    return digest
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def init_http_caching(app):
+    """
+    Registers content-hashed static URLs, long-lived caching for them and
+    response compression on the Flask app.
+    """
+
+    @app.url_defaults
+    def add_static_hash(endpoint, values):
+        # url_for('static', filename=...) -> /static/<filename>?v=<content hash>
+        if endpoint == "static" and "filename" in values and "v" not in values:
+            digest = _static_hash(app.static_folder, values["filename"])
+            if digest:
+                values["v"] = digest
+
+    @app.after_request
+    def cache_and_compress(response):
+        is_static = request.endpoint == "static"
+        filename = (request.view_args or {}).get("filename") if is_static else None
+        digest = _static_hash(app.static_folder, filename) if filename else None
+
+        if digest and request.args.get("v") == digest:
+            # The URL changes whenever the file does, so the browser never needs to revalidate
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        elif is_static and request.args.get("v"):
+            # Not the current content: caching this URL for a year would pin the wrong file
+            response.cache_control.no_cache = True
+
+        if (
+            response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "Content-Encoding" in response.headers
+            or (response.is_streamed and not response.direct_passthrough)
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        # Static files are sent as file wrappers; read them so they can be compressed
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return response
+
+        # Keyed by the server's own content hash, never the client's ?v, so the cache holds
+        # at most one version of each static file per encoding
+        cached = _compressed_static.get((filename, encoding)) if digest else None
+        if cached and cached[0] == digest:
+            compressed = cached[1]
+        else:
+            compressed = _compress(data, encoding)
+            if digest:
+                with _cache_lock:
+                    _compressed_static[(filename, encoding)] = (digest, compressed)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+
+        # Same resource in a different encoding: keep the validator, but as a weak ETag
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
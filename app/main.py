@@ -7,6 +7,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from flask import Flask
 from utils.logger import get_logger
 from app.routes import register_routes
+from app.http_cache import init_http_caching
 import logging
 
 # Silence Supabase/httpx outgoing requests details
@@ -17,7 +18,7 @@ logging.getLogger('httpcore').setLevel(logging.WARNING)
 class PollingFilter(logging.Filter):
     def filter(self, record):
         msg = record.getMessage()
-        return not ("/api/stats" in msg or "/api/progress" in msg)
+        return not ("/api/stats" in msg or "/api/progress" in msg or "/api/activity" in msg)
 
 logging.getLogger('werkzeug').addFilter(PollingFilter())
 
@@ -28,6 +29,14 @@ app = Flask(__name__, template_folder='../templates', static_folder='../static')
 # Register all routes from routes.py
 register_routes(app)
 
+# Compression and cache headers for static assets and JSON APIs
+init_http_caching(app)
+
+# Resident scheduler for automated generation (replaces the external cron run)
+from services.sheduler import SCHEDULER_ENABLED, start_scheduler
+if SCHEDULER_ENABLED:
+    start_scheduler()
+
 if __name__ == '__main__':
     host = os.getenv("FLASK_HOST", "127.0.0.1")
     port = int(os.getenv("FLASK_PORT", 5000))
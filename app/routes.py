@@ -1,11 +1,14 @@
 import asyncio
+import hashlib
+import time
 from flask import render_template, request, jsonify
-from flask import render_template, request, jsonify
+from flask import Response, stream_with_context
 from notifier.telegram import pending_posts, topic_id_map
+from services.linkedin import enqueue_publish
 from utils.logger import get_logger
 from memory.db_handler import (
-    get_stats, get_activity, log_activity,
-    get_pending_posts, update_post_status, get_setting, update_setting, log_activity
+    get_stats, get_activity, get_activity_version, activity_cursor, log_activity, log_activities, update_posts_status,
+    get_pending_posts_page, update_post_status, get_bool_setting, update_setting, log_activity, iter_export
 )
 
 logger = get_logger("Flask Dashboard")
@@ -13,6 +16,69 @@ logger = get_logger("Flask Dashboard")
 # Global state for generation progress
 generation_status = {"progress": 0, "message": "Idle", "status": "idle"}
 
+# Number of posts rendered per page on the review queue
+REVIEW_PAGE_SIZE = 20
+
+# Maximum number of posts accepted by one bulk approve/dismiss request
+BULK_MAX_POSTS = 100
+
+# Upper bound for /api/post/<id>/wait long-polls, in seconds
+LONG_POLL_MAX_TIMEOUT = 60
+
+# Activity rows shown on the dashboard feed
+ACTIVITY_LIMIT = 5
+
+# Most activity rows returned by one /api/activity delta; the feed asks again while there are more
+ACTIVITY_PAGE_SIZE = 50
+
+# Activity ETags also roll over on this interval, so rows written by other
+# processes (e.g. the cron pipeline) are picked up without a query on every poll
+ACTIVITY_REVALIDATE_SECONDS = 15
+
+
+def _activity_etag(cursor):
+    """ETag for an activity delta request: changes when this process logs activity,
+    when the revalidation window rolls over, or when the cursor changes."""
+    window = int(time.time() // ACTIVITY_REVALIDATE_SECONDS)
+    raw = f"{get_activity_version()}:{window}:{cursor or ''}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _status_matcher(args):
+    """
+    Status predicate of a long-poll request: ?status=pending waits for that status,
+    ?status!=dismissed (which arrives as the key "status!") for any other.
+    """
+    not_status = args.get('status!')
+    wanted_status = args.get('status')
+
+    def matches(status):
+        if not_status is not None and status == not_status:
+            return False
+        if wanted_status is not None and status != wanted_status:
+            return False
+        return True
+    return matches
+
+
+def _review_card(post):
+    """Projects a post onto the fields the review page renders."""
+    return {"id": post['id'], "topic": post['topic'], "content": post['content'], "platform": post.get('platform')}
+
+
+def _in_memory_drafts(exclude_ids):
+    """
+    Returns Telegram drafts held in memory that aren't already in exclude_ids.
+    """
+    drafts = []
+    for callback_id, topic in topic_id_map.items():
+        if callback_id in exclude_ids:
+            continue
+        draft = pending_posts.get(topic)
+        if draft:
+            drafts.append({"id": callback_id, "topic": topic, "content": draft})
+    return drafts
+
 def register_routes(app):
     """
     Registers all Flask endpoints for the app.
@@ -37,8 +103,9 @@ def register_routes(app):
     @app.route('/')
     def dashboard():
         stats = get_stats()
-        activity = get_activity()
-        return render_template('dashboard.html', stats=stats, activity=activity)
+        activity = get_activity(limit=ACTIVITY_LIMIT)
+        cursor = activity_cursor(activity[0]) if activity and activity[0].get("id") is not None else ""
+        return render_template('dashboard.html', stats=stats, activity=activity, activity_cursor=cursor)
 
     #-------------------------------
     # Review Page
@@ -49,28 +116,34 @@ def register_routes(app):
     #-------------------------------
     @app.route('/review')
     def review():
-        db_posts = get_pending_posts()
-        
-        posts = []
-        for p in db_posts:
-            posts.append({
-                "id": p['id'],
-                "topic": p['topic'],
-                "content": p['content']
-            })
-        
-        # Include in-memory legacy posts
-        for callback_id, topic in topic_id_map.items():
-            if not any(p['id'] == callback_id for p in posts):
-                draft = pending_posts.get(topic)
-                if draft:
-                    posts.append({
-                        "id": callback_id,
-                        "topic": topic,
-                        "content": draft
-                    })
-        
-        return render_template('review.html', posts=posts)
+        db_posts, next_cursor = get_pending_posts_page(limit=REVIEW_PAGE_SIZE)
+        posts = [_review_card(p) for p in db_posts]
+
+        # Include in-memory legacy posts (set lookup instead of scanning the list per draft)
+        posts.extend(_in_memory_drafts({p['id'] for p in posts}))
+
+        return render_template('review.html', posts=posts, next_cursor=next_cursor)
+
+    #-------------------------------
+    # API: Review Queue Page
+    # Returns the next page of pending posts for the review page.
+    # URL: /api/review?cursor=<cursor>
+    # Method: GET
+    #-------------------------------
+    @app.route('/api/review')
+    def api_review_page():
+        cursor = request.args.get('cursor')
+        limit = min(max(request.args.get('limit', REVIEW_PAGE_SIZE, type=int), 1), 100)
+        try:
+            db_posts, next_cursor = get_pending_posts_page(limit=limit, cursor=cursor)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        return jsonify({
+            "status": "success",
+            "posts": [_review_card(p) for p in db_posts],
+            "next_cursor": next_cursor
+        })
 
     #-------------------------------
     # Settings Page
@@ -83,22 +156,44 @@ def register_routes(app):
     #-------------------------------
     # Generate Content
     # Triggers post generation in a background thread using async pipeline.
-    # Does not block the request; returns immediately.
+    # Does not block the request; returns immediately. A repeated request for the same
+    # topic and platforms joins the running job (the response has "coalesced": true).
     #-------------------------------
     @app.route('/generate', methods=['POST'])
     def trigger_generation():
         """Manual trigger for post generation via a background thread."""
         try:
             import threading
-            from pipeline.worker import create_post
+            from pipeline.worker import create_post, generation_flight_key
             
+            from llms.prompts import PLATFORMS
+            from utils.jobs import GENERATION_JOB_TIMEOUT, JobCancelled, join_flight, new_job_id, run_job
+
             data = request.json or {}
             user_topic = data.get('topic')
+            # Optional list of target platforms, e.g. ["linkedin", "twitter"]
+            platforms = data.get('platforms') or None
+            if platforms is not None:
+                if not isinstance(platforms, list) or any(p not in PLATFORMS for p in platforms):
+                    return jsonify({
+                        "status": "error",
+                        "message": f"'platforms' must be a list of: {', '.join(PLATFORMS)}"
+                    }), 400
             
+            # A repeated request for the same generation attaches to the running job
+            flight, leader = join_flight(generation_flight_key(user_topic, platforms), job_id=new_job_id())
+            job_id = flight.job_id
+            if not leader and generation_status.get("job_id") == job_id:
+                # The progress bar already follows that job
+                return jsonify({
+                    "status": "success", "message": "Generation already running.", "job_id": job_id, "coalesced": True
+                })
+
             # Reset status
-            generation_status["progress"] = 5
-            generation_status["message"] = "Starting..."
+            generation_status["progress"] = 5 if leader else 50
+            generation_status["message"] = "Starting..." if leader else "Joined running generation..."
             generation_status["status"] = "generating"
+            generation_status["job_id"] = job_id
             
             def update_progress(progress, message):
                 generation_status["progress"] = progress
@@ -109,14 +204,30 @@ def register_routes(app):
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
                 try:
-                    # Pass the callback and optional topic to create_post
-                    loop.run_until_complete(create_post(progress_callback=update_progress, user_topic=user_topic))
+                    if leader:
+                        # Pass the callback and optional topic to create_post, as a cancellable job with a deadline
+                        loop.run_until_complete(flight.run(
+                            run_job, create_post, progress_callback=update_progress, user_topic=user_topic, platforms=platforms,
+                            kind="dashboard", label=user_topic, timeout=GENERATION_JOB_TIMEOUT, job_id=job_id
+                        ))
+                    else:
+                        # Joined a run started elsewhere (e.g. the scheduler): report its outcome
+                        loop.run_until_complete(flight.wait())
                     
                     # Mark as complete
                     update_progress(100, "Completed!")
                     generation_status["status"] = "idle"
-                    log_activity("info", f"Content generation completed{' for topic: ' + user_topic if user_topic else ''}.")
+                    if leader:
+                        log_activity("info", f"Content generation completed{' for topic: ' + user_topic if user_topic else ''}.")
                     
+                except (JobCancelled, asyncio.CancelledError) as e:
+                    logger.warning(f"Generation stopped: {e}")
+                    deadline = getattr(e, "reason", None) == "deadline"
+                    update_progress(0, "Timed Out" if deadline else "Cancelled")
+                    generation_status["status"] = "cancelled"
+                    if leader:
+                        log_activity("warning", "Content generation timed out." if deadline else "Content generation cancelled.")
+
                 except Exception as e:
                     logger.error(f"Generation failed: {e}")
                     update_progress(0, "Error Failed")
@@ -126,25 +237,88 @@ def register_routes(app):
 
             # Start the thread
             thread = threading.Thread(target=run_in_background, daemon=True)
-            thread.start()
-            
+            try:
+                thread.start()
+            except Exception:
+                if leader:
+                    flight.abandon()
+                raise
+
+            if not leader:
+                return jsonify({
+                    "status": "success", "message": "Joined running generation.", "job_id": job_id, "coalesced": True
+                })
             log_activity("info", "Content generation triggered in background.")
-            return jsonify({"status": "success", "message": "Generation started."})
+            return jsonify({"status": "success", "message": "Generation started.", "job_id": job_id})
         except Exception as e:
             logger.error(f"Failed to trigger generation: {e}")
             return jsonify({"status": "error", "message": str(e)}), 500
 
+    #-------------------------------
+    # API: Jobs
+    # Running generation jobs (dashboard and scheduled) in this process, and cancelling one.
+    # Cancelling aborts the in-flight LLM request; a draft already being edited is not saved.
+    # URL: /api/jobs, /api/jobs/<job_id>/cancel
+    #-------------------------------
+    @app.route('/api/jobs')
+    def api_jobs():
+        from utils.jobs import list_jobs
+        return jsonify({"status": "success", "jobs": list_jobs()})
+
+    @app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+    def api_cancel_job(job_id):
+        from utils.jobs import cancel_job
+        if not cancel_job(job_id):
+            return jsonify({"status": "error", "message": "No such running job"}), 404
+        return jsonify({"status": "success", "job_id": job_id})
+
     #-------------------------------
     # API: Stats
     # Returns JSON of current stats and activity for UI polling.
     #-------------------------------
     @app.route('/api/stats')
     def api_stats():
-        """Endpoint for UI polling to get latest stats and activity."""
-        return jsonify({
-            "stats": get_stats(),
-            "activity": get_activity()
+        """Endpoint for UI polling to get latest stats and activity.
+        Pass ?activity=false to skip the activity rows (served by /api/activity)."""
+        data = {"stats": get_stats()}
+        if request.args.get('activity', 'true').lower() != 'false':
+            data["activity"] = get_activity(limit=ACTIVITY_LIMIT)
+        return jsonify(data)
+
+    #-------------------------------
+    # API: Activity Feed
+    # Returns activity rows logged after the cursor, oldest first, with the cursor to ask
+    # with next; "more" is true when a full page came back. Without a cursor, the newest
+    # ACTIVITY_LIMIT rows (still oldest first).
+    # Supports If-None-Match: unchanged polls get a 304 without querying the DB.
+    # URL: /api/activity?cursor=<cursor>
+    # Method: GET
+    #-------------------------------
+    @app.route('/api/activity')
+    def api_activity():
+        cursor = request.args.get('cursor') or None
+        etag = _activity_etag(cursor)
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        try:
+            if cursor:
+                activity = get_activity(limit=ACTIVITY_PAGE_SIZE, cursor=cursor)
+            else:
+                activity = get_activity(limit=ACTIVITY_LIMIT)[::-1]
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        response = jsonify({
+            "status": "success",
+            "activity": activity,
+            "cursor": activity_cursor(activity[-1]) if activity and activity[-1].get("id") is not None else cursor,
+            "more": bool(cursor) and len(activity) == ACTIVITY_PAGE_SIZE
         })
+        response.set_etag(etag)
+        return response
 
     #-------------------------------
     # API: Get Post Status
@@ -155,9 +329,119 @@ def register_routes(app):
         from memory.db_handler import get_post
         post = get_post(post_id)
         if post:
-            return jsonify({"status": "success", "post": post})
+            # ETag lets unchanged polls revalidate with a bodyless 304
+            response = jsonify({"status": "success", "post": post})
+            response.add_etag()
+            return response.make_conditional(request)
         return jsonify({"status": "error", "message": "Post not found"}), 404
 
+    #-------------------------------
+    # API: Wait For Post Status
+    # Long-polls until the post's status matches, or the timeout expires.
+    # Woken in-process by add_post/update_post_status (e.g. when a rewrite job finishes).
+    # URL: /api/post/<id>/wait?status!=dismissed&timeout=30  (or ?status=pending)
+    # Method: GET
+    #-------------------------------
+    @app.route('/api/post/<post_id>/wait')
+    def api_wait_for_post(post_id):
+        from memory.db_handler import get_post
+        from memory.post_events import current_sequence, wait_for_post_update
+
+        matches = _status_matcher(request.args)
+        timeout = min(max(request.args.get('timeout', 30, type=float), 0), LONG_POLL_MAX_TIMEOUT)
+
+        sequence = current_sequence()
+        post = get_post(post_id)
+        if not post:
+            return jsonify({"status": "error", "message": "Post not found"}), 404
+        if matches(post.get('status')):
+            return jsonify({"status": "success", "post": post})
+
+        if wait_for_post_update(post_id, matches, sequence, timeout) is None:
+            # Timed out (or the update happened in another worker process): report the latest row
+            post = get_post(post_id) or post
+            state = "success" if matches(post.get('status')) else "timeout"
+            return jsonify({"status": state, "post": post})
+
+        return jsonify({"status": "success", "post": get_post(post_id) or post})
+
+    #-------------------------------
+    # API: Wait For Several Posts
+    # Long-polls until any of the posts' statuses match, or the timeout expires, so a bulk
+    # action holds one request (and one worker thread) however many posts it touched.
+    # Returns the posts that match and the ids that don't exist; poll again with the rest.
+    # URL: /api/posts/wait?ids=a,b,c&status=pending&timeout=30
+    # Method: GET
+    #-------------------------------
+    @app.route('/api/posts/wait')
+    def api_wait_for_posts():
+        from memory.db_handler import get_posts
+        from memory.post_events import current_sequence, wait_for_posts_update
+
+        post_ids = list(dict.fromkeys(i for i in request.args.get('ids', '').split(',') if i))
+        if not post_ids or len(post_ids) > BULK_MAX_POSTS:
+            return jsonify({"status": "error", "message": f"Send between 1 and {BULK_MAX_POSTS} ids."}), 400
+        matches = _status_matcher(request.args)
+        timeout = min(max(request.args.get('timeout', 30, type=float), 0), LONG_POLL_MAX_TIMEOUT)
+
+        sequence = current_sequence()
+        found = {post['id']: post for post in get_posts(post_ids)}
+        if not found:
+            return jsonify({"status": "error", "message": "Posts not found"}), 404
+        missing = [post_id for post_id in post_ids if post_id not in found]
+        ready = [post for post in found.values() if matches(post.get('status'))]
+
+        if not ready and not missing:
+            # On a timeout nothing matched here, but another worker process may have updated them
+            updated = wait_for_posts_update(list(found), matches, sequence, timeout)
+            ready = [post for post in get_posts(list(updated) or list(found)) if matches(post.get('status'))]
+
+        state = "success" if ready or missing else "timeout"
+        return jsonify({"status": state, "posts": ready, "missing": missing})
+
+    #-------------------------------
+    # API: Post Attempts
+    # Checkpointed editor history for a post: every draft with its scores, issues and instructions.
+    #-------------------------------
+    @app.route('/api/post/<post_id>/attempts')
+    def api_post_attempts(post_id):
+        from memory.db_handler import get_post_attempts
+        return jsonify({"status": "success", "attempts": get_post_attempts(post_id)})
+
+    #-------------------------------
+    # API: Post Variants
+    # The other platform versions generated from the same topic as a post.
+    #-------------------------------
+    @app.route('/api/post/<post_id>/variants')
+    def api_post_variants(post_id):
+        from memory.db_handler import get_post, get_post_variants
+        post = get_post(post_id)
+        if not post:
+            return jsonify({"status": "error", "message": "Post not found"}), 404
+        variants = get_post_variants(post.get('group_id')) or [post]
+        return jsonify({"status": "success", "group_id": post.get('group_id'), "variants": variants})
+
+    #-------------------------------
+    # API: Publish Post
+    # Queues an approved post for LinkedIn publishing, e.g. to retry a failed publish.
+    # Posts already queued or published are not published again.
+    # Method: POST
+    #-------------------------------
+    @app.route('/api/post/<post_id>/publish', methods=['POST'])
+    def api_publish_post(post_id):
+        from memory.db_handler import get_post
+        post = get_post(post_id)
+        if not post:
+            return jsonify({"status": "error", "message": "Post not found"}), 404
+        if post.get('status') != 'approved':
+            return jsonify({"status": "error", "message": "Only approved posts can be published"}), 409
+        if (post.get('platform') or 'linkedin') != 'linkedin':
+            return jsonify({"status": "error", "message": f"{post['platform'].capitalize()} posts are not published to LinkedIn"}), 409
+        if not enqueue_publish(post_id):
+            return jsonify({"status": "error", "message": "Post is already queued or published, or LinkedIn is not configured",
+                            "publish_status": post.get('publish_status')}), 409
+        return jsonify({"status": "success", "publish_status": "queued"})
+
     #-------------------------------
     # API: Settings
     #-------------------------------
@@ -175,8 +459,10 @@ def register_routes(app):
             return jsonify({"status": "success", "enabled": enabled})
         
         # GET request
-        enabled = get_setting("daily_generation_enabled", default=True)
-        return jsonify({"status": "success", "enabled": enabled})
+        enabled = get_bool_setting("daily_generation_enabled")
+        response = jsonify({"status": "success", "enabled": enabled})
+        response.add_etag()
+        return response.make_conditional(request)
 
     #-------------------------------
     # API: Approve Post
@@ -202,10 +488,87 @@ def register_routes(app):
         
         if success:
             log_activity("success", f"Post approved!")
-            return jsonify({"status": "success"})
+            # Publishing runs in the background; the request doesn't wait for LinkedIn
+            queued = enqueue_publish(post_id)
+            return jsonify({"status": "success", "publish": "queued" if queued else "skipped"})
             
         return jsonify({"status": "error", "message": "Post not found"}), 404
     #-------------------------------
+    # API: Search
+    # Ranked full-text search over post topics, content and hashtags (see memory/search.py),
+    # served from a local index, so it is cheap enough to call on every keystroke.
+    # Query: q (words, "phrases", #hashtags), status, platform, limit
+    # URL: /api/search
+    #-------------------------------
+    @app.route('/api/search')
+    def api_search():
+        from memory.search import SEARCH_MAX_RESULTS, search_posts
+
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), SEARCH_MAX_RESULTS)
+        except ValueError:
+            return jsonify({"status": "error", "message": "'limit' must be a number"}), 400
+
+        started = time.perf_counter()
+        results = search_posts(
+            request.args.get('q', ''), status=request.args.get('status'),
+            platform=request.args.get('platform'), limit=limit
+        )
+        took_ms = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify({"status": "success", "results": results, "took_ms": took_ms})
+
+    #-------------------------------
+    # API: Analytics
+    # First-attempt pass rate, average rewrites per post, criterion score averages and
+    # throughput, read from rollups the editor updates as it evaluates (see memory/analytics.py).
+    # Query: days (default 30), platform, bucket (day, week or month)
+    # URL: /api/analytics
+    #-------------------------------
+    @app.route('/api/analytics')
+    def api_analytics():
+        from memory.analytics import ANALYTICS_DEFAULT_DAYS, BUCKETS, get_analytics
+
+        try:
+            days = int(request.args.get('days', ANALYTICS_DEFAULT_DAYS))
+        except ValueError:
+            return jsonify({"status": "error", "message": "'days' must be a number"}), 400
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in BUCKETS:
+            return jsonify({"status": "error", "message": f"'bucket' must be one of: {', '.join(BUCKETS)}"}), 400
+
+        analytics = get_analytics(days, platform=request.args.get('platform'), bucket=bucket)
+        response = jsonify({"status": "success", **analytics})
+        response.add_etag()
+        return response.make_conditional(request)
+
+    #-------------------------------
+    # API: Export
+    # Streams posts, topics or activity, oldest first, as NDJSON (default) or CSV. Rows are
+    # read in keyset pages and sent as they arrive, so memory use doesn't grow with the table.
+    # Query: format, since / until (ISO date or timestamp; until is exclusive),
+    #        status (post status, activity type, or used/unused for topics), cursor
+    # URL: /api/export/<table>
+    #-------------------------------
+    @app.route('/api/export/<table>')
+    def api_export(table):
+        from memory.export import EXPORT_FORMATS, stream_export
+
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"status": "error", "message": f"'format' must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        try:
+            rows = iter_export(
+                table, since=request.args.get('since'), until=request.args.get('until'),
+                status=request.args.get('status'), cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        response = Response(stream_with_context(stream_export(rows, table, fmt)), mimetype=EXPORT_FORMATS[fmt])
+        response.headers["Content-Disposition"] = f'attachment; filename="{table}.{fmt}"'
+        return response
+
+    #-------------------------------
     # API: Dismiss Post
     # Dismisses a post and triggers a rewrite loop in background.
     #-------------------------------
@@ -220,14 +583,15 @@ def register_routes(app):
         update_post_status(post_id, "dismissed")
         
         # Trigger rewrite loop in background
-        from pipeline.editor import run_evaluation_flow
+        # A second dismiss of the same post attaches to the rewrite already running
+        from pipeline.editor import run_redraft
         import threading
         
         def run_rewrite():
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             try:
-                loop.run_until_complete(run_evaluation_flow(content, topic, post_id=post_id, force_rewrite=True))
+                loop.run_until_complete(run_redraft(content, topic, post_id))
                 log_activity("info", f"Manual rewrite triggered for post on '{topic}'")
             except Exception as e:
                 logger.error(f"Rewrite failed: {e}")
@@ -237,3 +601,101 @@ def register_routes(app):
         threading.Thread(target=run_rewrite, daemon=True).start()
         
         return jsonify({"status": "success", "message": "Rewrite triggered."})
+
+    #-------------------------------
+    # API: Bulk Approve Posts
+    # Approves several posts with one set-based update and one activity insert.
+    # Payload: { "ids": [str, ...] }
+    #-------------------------------
+    @app.route('/api/approve/bulk', methods=['POST'])
+    def bulk_approve_posts():
+        data = request.json or {}
+        post_ids = list(dict.fromkeys(data.get('ids') or []))  # de-duplicate, keep order
+        if not post_ids or len(post_ids) > BULK_MAX_POSTS:
+            return jsonify({"status": "error", "message": f"Send between 1 and {BULK_MAX_POSTS} ids."}), 400
+
+        # Only drafts still pending; ids that don't exist or were already handled are skipped
+        approved = set(update_posts_status(post_ids, "approved", from_status="pending"))
+
+        # Also handle in-memory drafts
+        for post_id in post_ids:
+            topic = topic_id_map.pop(post_id, None)
+            if topic:
+                pending_posts.pop(topic, None)
+                approved.add(post_id)
+
+        if not approved:
+            return jsonify({"status": "error", "message": "Posts not found"}), 404
+
+        approved = [post_id for post_id in post_ids if post_id in approved]
+        log_activities([("success", "Post approved!") for _ in approved])
+        queued = [post_id for post_id in approved if enqueue_publish(post_id)]
+        return jsonify({"status": "success", "approved": approved, "queued": queued})
+
+    #-------------------------------
+    # API: Bulk Dismiss Posts
+    # Dismisses several posts with one set-based update and queues their rewrites as one batch.
+    # Payload: { "posts": [{ "id": str, "content": str, "topic": str }, ...] }
+    #-------------------------------
+    @app.route('/api/dismiss/bulk', methods=['POST'])
+    def bulk_dismiss_posts():
+        data = request.json or {}
+        posts = {p['id']: p for p in (data.get('posts') or []) if p.get('id')}  # de-duplicate by id
+        posts = list(posts.values())
+        if not posts or len(posts) > BULK_MAX_POSTS:
+            return jsonify({"status": "error", "message": f"Send between 1 and {BULK_MAX_POSTS} posts."}), 400
+
+        # Only drafts still pending; a post already approved or dismissed elsewhere is left alone
+        dismissed = set(update_posts_status([p['id'] for p in posts], "dismissed", from_status="pending"))
+        posts = [p for p in posts if p['id'] in dismissed]
+        if not posts:
+            return jsonify({"status": "error", "message": "Posts not found"}), 404
+
+        # Run every rewrite on one background loop, with bounded concurrency
+        from pipeline.editor import run_rewrite_batch
+        import threading
+
+        def run_rewrites():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                results = loop.run_until_complete(run_rewrite_batch(posts))
+                topics = {p['id']: p.get('topic') for p in posts}
+                log_activities([
+                    ("info", f"Manual rewrite triggered for post on '{topics[post_id]}'")
+                    for post_id, error in results if error is None
+                ])
+            except Exception as e:
+                logger.error(f"Bulk rewrite failed: {e}")
+            finally:
+                loop.close()
+
+        threading.Thread(target=run_rewrites, daemon=True).start()
+
+        return jsonify({
+            "status": "success",
+            "message": f"{len(posts)} rewrites triggered.",
+            "dismissed": [p['id'] for p in posts]
+        })
+
+    #-------------------------------
+    # Telegram Webhook
+    # Receives bot updates (review button presses) when Telegram is in webhook mode.
+    # Only requests carrying TELEGRAM_WEBHOOK_SECRET in X-Telegram-Bot-Api-Secret-Token
+    # are accepted; the update is handled in the background so Telegram gets a quick 200.
+    # Method: POST
+    #-------------------------------
+    @app.route('/telegram/webhook', methods=['POST'])
+    def telegram_webhook():
+        from notifier.telegram import webhook_enabled, verify_webhook_secret, dispatch_update
+        if not webhook_enabled():
+            return jsonify({"status": "error", "message": "Telegram webhook is not enabled"}), 404
+        if not verify_webhook_secret(request.headers.get('X-Telegram-Bot-Api-Secret-Token')):
+            return jsonify({"status": "error", "message": "Invalid secret token"}), 403
+
+        update = request.get_json(silent=True)
+        if not isinstance(update, dict) or 'update_id' not in update:
+            return jsonify({"status": "error", "message": "Expected a Telegram update"}), 400
+
+        dispatched = dispatch_update(update)
+        return jsonify({"status": "success", "duplicate": not dispatched})
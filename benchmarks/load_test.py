@@ -0,0 +1,385 @@
+# benchmarks/load_test.py: Load test for the dashboard and review APIs against an in-process app.
+#
+# Simulates N browser tabs on app.main:app, each on its own thread (like gunicorn --threads):
+#   dashboard tabs  - load "/", then every 5s poll /api/stats?activity=false and /api/activity
+#                     with If-None-Match, as templates/dashboard.html does
+#   review tabs     - load /review, page through /api/review, then approve or redraft a post;
+#                     a redraft long-polls /api/post/<id>/wait like templates/review.html
+#   generator tabs  - POST /generate, then poll /api/progress every 1s until it finishes
+#
+# Storage is a throwaway SQLite database seeded with posts, topics and activity. LLM and
+# Telegram calls are replaced by fakes with a fixed latency, so only the app and storage
+# are measured. Every storage backend call is counted (utils.metrics) and attributed to the
+# endpoint that made it; calls from background jobs (generation, rewrites) are counted apart.
+#
+# Usage:
+#   python -m benchmarks.load_test --tabs 50 --duration 60
+#   python -m benchmarks.load_test --tabs 200 --duration 30 --speedup 5   (poll 5x faster than a browser)
+
+import argparse
+import contextvars
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Never touch a real database, Telegram or LinkedIn
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="redraft-load-"), "load.db")
+os.environ["SCHEDULER_ENABLED"] = "False"
+os.environ.pop("LINKEDIN_ACCESS_TOKEN", None)
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+
+from app.main import app
+from memory import db_handler
+import pipeline.editor
+import pipeline.worker
+from utils.metrics import get_metrics, increment, reset_metrics
+
+# Browser cadence, in seconds (divided by --speedup)
+DASHBOARD_POLL_INTERVAL = 5
+PROGRESS_POLL_INTERVAL = 1
+REDRAFT_RETRY_DELAY = 2
+# Time a reviewer spends on a post before approving or redrafting it
+REVIEW_THINK_TIME = 10
+# Time between two generations from one generator tab
+GENERATE_INTERVAL = 30
+
+_CURSOR_RE = re.compile(r'data-next-cursor="([^"]*)"')
+_POST_RE = re.compile(r'id="post-([^"]+)"')
+BROWSER_HEADERS = {"Accept-Encoding": "gzip, br"}
+
+# Endpoint whose request is being served on this thread; background jobs have none
+_endpoint = contextvars.ContextVar("load_test_endpoint", default="(background)")
+
+
+class CountingBackend:
+    """Wraps the storage backend and counts every call, per endpoint."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            increment("db.calls")
+            increment(f"db.calls.{_endpoint.get()}")
+            return attr(*args, **kwargs)
+        return counted
+
+
+class Results:
+    """Latencies and status codes per endpoint, shared by every tab."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, endpoint, status, seconds):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+
+
+#-------------------------------
+# Fakes
+#-------------------------------
+def install_fakes(llm_latency):
+    """Replaces the LLM and Telegram calls made by generation and rewrites."""
+
+    def generate_post(prompt):
+        time.sleep(llm_latency)
+        return f"Load test draft {uuid.uuid4().hex[:6]}"
+
+    def rewrite_post(original_post, rewrite_instructions, platform="linkedin"):
+        time.sleep(llm_latency)
+        return f"{original_post} (rewritten)"
+
+    def evaluate_post(post_text, stream=None, platform="linkedin"):
+        time.sleep(llm_latency)
+        return {
+            "pass": True,
+            "scores": {"hook": 8, "clarity": 8, "human_likeness": 8},
+            "issues": [],
+            "rewrite_instructions": "",
+        }
+
+    async def send_to_telegram(draft, topic, post_id=None, review_required=False):
+        return None
+
+    pipeline.worker.generate_post = generate_post
+    pipeline.worker.get_topic = lambda user_topic=None: user_topic or "Load testing a Flask dashboard"
+    pipeline.editor.rewrite_post = rewrite_post
+    pipeline.editor.evaluate_post = evaluate_post
+    pipeline.editor.send_to_telegram = send_to_telegram
+
+
+def seed(posts, topics):
+    """Fills the throwaway database with pending posts, unused topics and some activity."""
+    db_handler.add_posts([
+        {"id": uuid.uuid4().hex[:8], "topic": f"Seed topic {i}", "content": f"Seed draft {i}. " * 40, "status": "pending"}
+        for i in range(posts)
+    ])
+    db_handler.add_topics([f"Unused topic {i}" for i in range(topics)])
+    db_handler.log_activities([("info", f"Seed activity {i}") for i in range(20)])
+
+
+#-------------------------------
+# Tabs
+#-------------------------------
+class Tab:
+    """One simulated browser tab with its own client, until `deadline`."""
+
+    def __init__(self, results, deadline, speedup, rng):
+        self.client = app.test_client()
+        self.results = results
+        self.deadline = deadline
+        self.speedup = speedup
+        self.rng = rng
+
+    def request(self, method, url, endpoint, **kwargs):
+        headers = {**BROWSER_HEADERS, **kwargs.pop("headers", {})}
+        token = _endpoint.set(endpoint)
+        start = time.perf_counter()
+        try:
+            response = self.client.open(url, method=method, headers=headers, **kwargs)
+            status = response.status_code
+        except Exception:
+            response, status = None, "exception"
+        finally:
+            _endpoint.reset(token)
+        self.results.add(endpoint, status, time.perf_counter() - start)
+        return response
+
+    def sleep(self, seconds):
+        """Sleeps for browser time `seconds`; returns False once the test is over."""
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(seconds / self.speedup, remaining))
+        return time.monotonic() < self.deadline
+
+    @staticmethod
+    def text(response):
+        """Response body as a browser sees it, after content decoding."""
+        if response is None:
+            return ""
+        data = response.get_data()
+        encoding = response.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "br":
+            import brotli
+            data = brotli.decompress(data)
+        return data.decode("utf-8")
+
+    @staticmethod
+    def json(response):
+        if response is None or not response.is_json:
+            return {}
+        try:
+            return json.loads(Tab.text(response)) or {}
+        except ValueError:
+            return {}
+
+
+def dashboard_tab(tab):
+    tab.request("GET", "/", "/")
+    cursor, etag = "", None
+    # Tabs opened at the same moment don't poll in lockstep
+    tab.sleep(tab.rng.uniform(0, DASHBOARD_POLL_INTERVAL))
+    while True:
+        tab.request("GET", "/api/stats?activity=false", "/api/stats")
+        headers = {"If-None-Match": etag} if etag else {}
+        response = tab.request("GET", f"/api/activity?cursor={cursor}", "/api/activity", headers=headers)
+        if response is not None and response.status_code == 200:
+            etag = response.headers.get("ETag")
+            cursor = Tab.json(response).get("cursor") or cursor
+        if not tab.sleep(DASHBOARD_POLL_INTERVAL):
+            return
+
+
+def review_tab(tab):
+    while True:
+        response = tab.request("GET", "/review", "/review")
+        page = Tab.text(response)
+        post_ids = _POST_RE.findall(page)
+        cursor = _CURSOR_RE.search(page)
+        if cursor and cursor.group(1):
+            more = Tab.json(tab.request("GET", f"/api/review?cursor={cursor.group(1)}", "/api/review"))
+            post_ids += [p["id"] for p in more.get("posts", [])]
+
+        if not tab.sleep(tab.rng.uniform(0.5, 1.5) * REVIEW_THINK_TIME):
+            return
+        if not post_ids:
+            continue
+
+        post_id = tab.rng.choice(post_ids)
+        post = Tab.json(tab.request("GET", f"/api/post/{post_id}", "/api/post/<id>")).get("post") or {}
+        if tab.rng.random() < 0.7:
+            tab.request("POST", "/api/approve", "/api/approve", json={"id": post_id, "content": post.get("content")})
+            continue
+
+        tab.request("POST", "/api/dismiss", "/api/dismiss",
+                    json={"id": post_id, "content": post.get("content"), "topic": post.get("topic")})
+        while time.monotonic() < tab.deadline:
+            timeout = max(1, int(30 / tab.speedup))
+            data = Tab.json(tab.request("GET", f"/api/post/{post_id}/wait?status=pending&timeout={timeout}", "/api/post/<id>/wait"))
+            if data.get("status") == "success":
+                break
+            if data.get("status") != "timeout" and not tab.sleep(REDRAFT_RETRY_DELAY):
+                return
+
+
+def generator_tab(tab):
+    tab.sleep(tab.rng.uniform(0, GENERATE_INTERVAL))
+    while time.monotonic() < tab.deadline:
+        tab.request("POST", "/generate", "/generate", json={"topic": None})
+        while tab.sleep(PROGRESS_POLL_INTERVAL):
+            status = Tab.json(tab.request("GET", "/api/progress", "/api/progress"))
+            if status.get("status") == "error" or (status.get("status") == "idle" and status.get("progress") == 100):
+                break
+        if not tab.sleep(GENERATE_INTERVAL):
+            return
+
+
+#-------------------------------
+# Report
+#-------------------------------
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def build_report(results, metrics, elapsed):
+    """Per-endpoint throughput, latency percentiles (ms), error counts and DB calls per request."""
+    endpoints = {}
+    for endpoint, latencies in sorted(results.latencies.items()):
+        statuses = results.statuses[endpoint]
+        errors = sum(n for status, n in statuses.items() if status == "exception" or status >= 500)
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(max(latencies) * 1000, 2),
+            "db_per_request": round(metrics.get(f"db.calls.{endpoint}", 0) / len(latencies), 2),
+            "statuses": {str(status): n for status, n in sorted(statuses.items(), key=str)},
+        }
+
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "db_calls": metrics.get("db.calls", 0),
+        "background_db_calls": metrics.get("db.calls.(background)", 0),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report):
+    print(f"{'endpoint':<22} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'db/req':>7}")
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<22} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8} {row['p50_ms']:>8} "
+            f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8} {row['db_per_request']:>7}"
+        )
+    print(
+        f"\nTotal: {report['requests']} requests in {report['elapsed_s']}s ({report['rps']} req/s), "
+        f"{report['db_calls']} DB calls ({report['background_db_calls']} from background jobs)"
+    )
+
+
+def run(tabs=20, duration=30, review_share=0.3, generators=1, speedup=1.0, llm_latency=0.5,
+        seed_posts=200, seed_topics=50, random_seed=None):
+    """
+    Runs the load test and returns the report (see build_report).
+
+    Args:
+        tabs (int): Dashboard plus review tabs
+        duration (float): Seconds to run
+        review_share (float): Share of the tabs that are review tabs
+        generators (int): Tabs triggering generation, on top of `tabs`
+        speedup (float): Divides every browser interval, to push more load with fewer tabs
+        llm_latency (float): Seconds each fake LLM call takes
+    """
+    rng = random.Random(random_seed)
+    install_fakes(llm_latency)
+    seed(seed_posts, seed_topics)
+
+    if not isinstance(db_handler.backend, CountingBackend):
+        db_handler.backend = CountingBackend(db_handler.backend)
+    reset_metrics()
+
+    review_tabs = round(tabs * review_share)
+    roles = [review_tab] * review_tabs + [dashboard_tab] * (tabs - review_tabs) + [generator_tab] * generators
+
+    results = Results()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=role, args=(Tab(results, deadline, speedup, random.Random(rng.random())),),
+            name=f"{role.__name__}-{i}", daemon=True,
+        )
+        for i, role in enumerate(roles)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        # A tab may be inside a long-poll when time runs out
+        thread.join(max(0.0, deadline - time.monotonic()) + 35)
+    elapsed = time.monotonic() - started
+
+    return build_report(results, get_metrics(), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the dashboard and review APIs in-process.")
+    parser.add_argument("--tabs", type=int, default=20, help="dashboard + review tabs")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--review-share", type=float, default=0.3, help="share of tabs on the review page")
+    parser.add_argument("--generators", type=int, default=1, help="tabs triggering generation")
+    parser.add_argument("--speedup", type=float, default=1.0, help="divide browser intervals by this")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake LLM call")
+    parser.add_argument("--seed-posts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Load testing {args.tabs} tabs (+{args.generators} generating) for {args.duration}s "
+          f"at {args.speedup}x browser cadence; database {os.environ['SQLITE_PATH']}")
+    report = run(
+        tabs=args.tabs, duration=args.duration, review_share=args.review_share, generators=args.generators,
+        speedup=args.speedup, llm_latency=args.llm_latency, seed_posts=args.seed_posts, random_seed=args.seed,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
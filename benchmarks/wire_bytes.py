@@ -0,0 +1,71 @@
+# benchmarks/wire_bytes.py: Measures bytes over the wire for dashboard pages, assets and JSON APIs.
+#
+# Compares three cases for each URL:
+#   identity     - no compression, no validators (what a plain client gets)
+#   compressed   - Accept-Encoding: gzip, br
+#   revalidated  - a repeat request with If-None-Match (304s carry no body)
+#
+# Usage: python -m benchmarks.wire_bytes
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The Telegram module refuses to import without a token; the benchmark never talks to Telegram
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "0:benchmark")
+
+from flask import url_for
+from app.main import app
+
+PAGES = ["/", "/review", "/settings", "/api/stats", "/api/activity", "/api/settings/automation"]
+ASSETS = ["css/style.css", "js/theme.js"]
+
+
+def _wire_size(response):
+    """Body bytes as sent (already compressed, if it was) plus header bytes."""
+    headers = sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    return len(response.get_data()) + headers
+
+
+def measure(client, url):
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+
+    etag = compressed.headers.get("ETag")
+    revalidated = None
+    if etag:
+        revalidated = client.get(url, headers={"Accept-Encoding": "gzip, br", "If-None-Match": etag})
+
+    return {
+        "url": url,
+        "identity": _wire_size(identity),
+        "compressed": _wire_size(compressed),
+        "encoding": compressed.headers.get("Content-Encoding", "-"),
+        "revalidated": _wire_size(revalidated) if revalidated is not None else None,
+        "cache_control": compressed.headers.get("Cache-Control", "-"),
+    }
+
+
+def main():
+    client = app.test_client()
+    with app.test_request_context():
+        urls = PAGES + [url_for("static", filename=f) for f in ASSETS]
+
+    rows = [measure(client, url) for url in urls]
+
+    print(f"{'URL':<42} {'identity':>9} {'compressed':>11} {'enc':>5} {'304':>6}  cache-control")
+    for row in rows:
+        revalidated = row["revalidated"] if row["revalidated"] is not None else "-"
+        print(
+            f"{row['url']:<42} {row['identity']:>9} {row['compressed']:>11} "
+            f"{row['encoding']:>5} {revalidated:>6}  {row['cache_control']}"
+        )
+
+    before = sum(r["identity"] for r in rows)
+    after = sum(r["compressed"] for r in rows)
+    print(f"\nTotal: {before} -> {after} bytes ({100 * (1 - after / before):.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,22 @@
 import os
 import json
 from google import genai
-from google.genai.types import GenerateContentConfig, ThinkingConfig, ThinkingLevel
+from google.genai.types import GenerateContentConfig, HttpOptions, ThinkingConfig, ThinkingLevel
+from utils.jobs import JobCancelled, check_job
 from utils.logger import get_logger
-from llms.prompts import EVALUATOR_PROMPT_LINKEDIN as EVALUATOR_SYSTEM_PROMPT
+from utils.retry import LLM_RETRY_POLICY
+from utils.recorder import recordable
+from utils.validators import validate_evaluation
+from llms.prompts import EVALUATOR_PROMPT_LINKEDIN as EVALUATOR_SYSTEM_PROMPT, EVALUATOR_BATCH_INSTRUCTIONS, PLATFORMS
 
 logger = get_logger("Gemini Evaluator")
 
+# Maximum number of drafts sent in a single evaluate_posts() request
+EVALUATOR_MAX_BATCH_SIZE = int(os.getenv("EVALUATOR_MAX_BATCH_SIZE", 5))
+
+# Stream evaluator output and stop as soon as a passing verdict is known
+EVALUATOR_STREAMING = os.getenv("EVALUATOR_STREAMING", "True").lower() == "true"
+
 # Note: newer GenAI SDK client expects Application Credentials (google.key.json) file path.
 
 _client = None
@@ -42,27 +52,96 @@ def _get_client():
     return _client
 
 
-def evaluate_post(post_text):
+def _evaluate_streaming(client, post_text, timeout, system_prompt=EVALUATOR_SYSTEM_PROMPT):
+    """
+    Streams the evaluator response through an incremental JSON parser.
+
+    The schema puts "pass" and "scores" first, so once both are parsed a passing
+    verdict is returned immediately and the rest of the stream is dropped.
+    Failing drafts keep streaming so issues and rewrite_instructions are complete.
+    A cancelled or expired job (utils/jobs.py) closes the stream between chunks.
     """
-    Evaluates a LinkedIn post draft using Gemini 3 Flash with service account auth.
+    from utils.json_parser import IncrementalJSONParser, parse_json_safely
+
+    stream = client.models.generate_content_stream(
+        model="gemini-2.0-flash",
+        contents=post_text,
+        config=GenerateContentConfig(
+            system_instruction=system_prompt,
+            max_output_tokens=1024,
+            temperature=0.0,
+            http_options=HttpOptions(timeout=int(timeout * 1000))
+        )
+    )
+
+    parser = IncrementalJSONParser()
+    try:
+        for chunk in stream:
+            check_job()
+            fields = parser.feed(chunk.text or "")
+            if fields.get("pass") is True and "scores" in fields:
+                logger.info("Evaluator verdict is PASS. Ending stream early.")
+                return {
+                    "pass": True,
+                    "scores": fields["scores"],
+                    "issues": fields.get("issues", []),
+                    "rewrite_instructions": ""
+                }
+    finally:
+        # Closing the generator releases the underlying HTTP response
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+
+    if parser.done:
+        return parser.fields
+    return parse_json_safely(parser.buffer.strip())
+
+
+@recordable("llm.evaluate_post")
+def evaluate_post(post_text, stream=None, platform="linkedin"):
+    """
+    Evaluates a post draft using Gemini 3 Flash with service account auth.
 
     Args:
-        post_text: str, generated LinkedIn post
+        post_text: str, generated post
+        stream: bool, stream the response and return early on a pass
+            (defaults to EVALUATOR_STREAMING)
+        platform: str, key of llms.prompts.PLATFORMS whose rubric is used
 
     Returns:
         dict: Parsed evaluator response
     """
+    if stream is None:
+        stream = EVALUATOR_STREAMING
+    system_prompt = PLATFORMS[platform]["evaluator_prompt"]
+
     try:
         client = _get_client()
+
+        if stream:
+            try:
+                return LLM_RETRY_POLICY.call(
+                    lambda timeout: _evaluate_streaming(client, post_text, timeout, system_prompt),
+                    label="evaluate_post"
+                )
+            except ValueError as e:
+                logger.error(f"Evaluator returned invalid JSON: {e}")
+                raise
+
         # Call the Gemini 3 Flash model
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=post_text,
-            config=GenerateContentConfig(
-                system_instruction=EVALUATOR_SYSTEM_PROMPT,
-                max_output_tokens=1024,
-                temperature=0.0  # deterministic evaluation
-            )
+        response = LLM_RETRY_POLICY.call(
+            lambda timeout: client.models.generate_content(
+                model="gemini-2.0-flash",
+                contents=post_text,
+                config=GenerateContentConfig(
+                    system_instruction=system_prompt,
+                    max_output_tokens=1024,
+                    temperature=0.0,  # deterministic evaluation
+                    http_options=HttpOptions(timeout=int(timeout * 1000))  # milliseconds
+                )
+            ),
+            label="evaluate_post"
         )
 
         raw_output = response.text.strip()
@@ -79,3 +158,97 @@ def evaluate_post(post_text):
     except Exception as e:
         logger.error(f"Evaluator failed: {e}")
         raise
+
+
+@recordable("llm.evaluate_batch")
+def _evaluate_batch(drafts, platform="linkedin"):
+    """
+    Sends several drafts to the evaluator in one request, graded with the platform's rubric.
+
+    Returns:
+        list: validated evaluation per draft, in order; None for drafts missing from
+        the response or with a malformed result
+    """
+    client = _get_client()
+    contents = "\n\n".join(f"=== DRAFT {n} ===\n{draft}" for n, draft in enumerate(drafts, start=1))
+    system_prompt = PLATFORMS[platform]["evaluator_prompt"] + EVALUATOR_BATCH_INSTRUCTIONS
+
+    response = LLM_RETRY_POLICY.call(
+        lambda timeout: client.models.generate_content(
+            model="gemini-2.0-flash",
+            contents=contents,
+            config=GenerateContentConfig(
+                system_instruction=system_prompt,
+                max_output_tokens=1024 * len(drafts),
+                temperature=0.0,
+                http_options=HttpOptions(timeout=int(timeout * 1000))
+            )
+        ),
+        label="evaluate_posts"
+    )
+
+    from utils.json_parser import parse_json_safely
+    parsed = parse_json_safely(response.text.strip())
+    if not isinstance(parsed, list):
+        raise ValueError("Batch evaluator response is not a JSON array")
+
+    results = [None] * len(drafts)
+    for item in parsed:
+        try:
+            index = int(item.pop("index"))
+            if not 1 <= index <= len(drafts):
+                raise ValueError(f"index {index} out of range")
+            results[index - 1] = validate_evaluation(item)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed batch evaluation entry: {e}")
+    return results
+
+
+def _evaluate_one(draft, platform):
+    """Per-draft fallback of evaluate_posts; a failure becomes a failing evaluation with an "error"."""
+    try:
+        return validate_evaluation(evaluate_post(draft, platform=platform))
+    except JobCancelled:
+        raise
+    except Exception as e:
+        logger.warning(f"Evaluation of one draft failed: {e}")
+        return {"pass": False, "scores": {}, "issues": [], "rewrite_instructions": "", "error": str(e)}
+
+
+def evaluate_posts(drafts, max_batch_size=EVALUATOR_MAX_BATCH_SIZE, platform="linkedin"):
+    """
+    Evaluates several drafts, packing up to max_batch_size of them into each evaluator call
+    so the rubric system prompt is paid once per batch instead of once per draft.
+
+    Drafts whose result can't be recovered from the batch response (parse failure,
+    missing or malformed entry) fall back to an individual evaluate_post() call.
+
+    Args:
+        drafts: list[str], post drafts
+        max_batch_size: int, maximum drafts per request
+        platform: str, key of llms.prompts.PLATFORMS whose rubric is used
+
+    Returns:
+        list[dict]: validated evaluations, in the same order as drafts. A draft that
+        could not be evaluated at all gets a failing one with an "error" key.
+    """
+    max_batch_size = max(1, max_batch_size)
+    evaluations = []
+    for start in range(0, len(drafts), max_batch_size):
+        chunk = drafts[start:start + max_batch_size]
+
+        batch_results = [None] * len(chunk)
+        if len(chunk) > 1:
+            try:
+                batch_results = _evaluate_batch(chunk, platform=platform)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                logger.warning(f"Batch evaluation failed ({e}). Falling back to per-draft calls.")
+
+        for draft, evaluation in zip(chunk, batch_results):
+            if evaluation is None:
+                evaluation = _evaluate_one(draft, platform)
+            evaluations.append(evaluation)
+
+    return evaluations
@@ -6,7 +6,10 @@ import os
 from openai import OpenAI
 from utils.logger import get_logger
 from dotenv import load_dotenv
-from llms.prompts import SYSTEM_PROMPT_1
+from llms.prompts import PLATFORMS
+from utils.jobs import check_job
+from utils.retry import LLM_RETRY_POLICY
+from utils.recorder import recordable
 
 logger = get_logger("GPT4 Generator")
 load_dotenv()
@@ -21,10 +24,38 @@ def _get_client():
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("Set your OPENAI_API_KEY environment variable!")
-        _client = OpenAI(api_key=api_key)
+        # Retries are handled by LLM_RETRY_POLICY, not the SDK
+        _client = OpenAI(api_key=api_key, max_retries=0)
     return _client
 
 
+def _complete_streaming(client, prompt, timeout):
+    """
+    Streams one completion. The current job (utils/jobs.py) is checked between chunks;
+    if it was cancelled or ran out of time the stream is closed, which aborts the
+    request instead of letting it run to the end.
+    """
+    stream = client.chat.completions.create(
+        model="gpt-4",
+        messages=prompt,
+        max_tokens=500,
+        temperature=0.7,
+        top_p=1.0,
+        timeout=timeout,
+        stream=True
+    )
+    parts = []
+    try:
+        for chunk in stream:
+            check_job()
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+    finally:
+        stream.close()
+    return "".join(parts)
+
+
+@recordable("llm.generate_post")
 def generate_post(prompt):
     """
     Generate a new post using GPT-4.
@@ -37,28 +68,26 @@ def generate_post(prompt):
     """
     try:
         client = _get_client()
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=prompt,
-            max_tokens=500,
-            temperature=0.7,
-            top_p=1.0
+        text = LLM_RETRY_POLICY.call(
+            lambda timeout: _complete_streaming(client, prompt, timeout),
+            label="generate_post"
         )
 
-        return response.choices[0].message.content.strip()
+        return text.strip()
 
     except Exception as e:
         logger.error(f"Error generating post: {e}")
         raise
 
 
-def rewrite_post(original_post, rewrite_instructions):
+def rewrite_post(original_post, rewrite_instructions, platform="linkedin"):
     """
     Rewrite an existing post using evaluator feedback while maintaining global rules.
 
     Args:
         original_post (str): The post to be rewritten
         rewrite_instructions (str): Specific instructions for rewriting
+        platform (str): Key of llms.prompts.PLATFORMS whose writing rules apply
 
     Returns:
         str: Rewritten post
@@ -68,7 +97,7 @@ def rewrite_post(original_post, rewrite_instructions):
             {
                 "role": "system",
                 "content": (
-                    f"{SYSTEM_PROMPT_1}\n\n"
+                    f"{PLATFORMS[platform]['writer_prompt']}\n\n"
                     "TASK: You are editing a draft. You MUST maintain all the global rules above "
                     "while applying the specific REWRITE INSTRUCTIONS provided by the evaluator."
                 )
@@ -22,7 +22,7 @@ FINAL CHECK: Ensure the post is concise and sounds human without corporate jargo
 """
 
 
-SYSTEM_PROMPT_2 = """ You are a Twitter post generator. Generate a Twitter-style post for the given topic. Use simple phrases and avoid complex words."""
+SYSTEM_PROMPT_2 = """ You are a Twitter post generator. Generate a Twitter-style post for the given topic. Use simple phrases and avoid complex words. The post must fit in a single tweet (280 characters maximum)."""
 
 LinkedIn_prompt = [
     {"role": "system", "content": SYSTEM_PROMPT_1},
@@ -45,6 +45,16 @@ def build_linkedin_prompt(topic):
     ]
 
 
+def build_twitter_prompt(topic):
+    """
+    Returns a GPT messages list for a Twitter post with the topic injected.
+    """
+    return [
+        {"role": msg["role"], "content": msg["content"].format(topic=topic)}
+        for msg in Twitter_prompt
+    ]
+
+
 #------------- Prompts for topics generation -------------
 
 topics_prompt_linkedin = [
@@ -185,4 +195,108 @@ IMPORTANT BEHAVIOR RULES
 - If the post fails, clearly explain why.
 - Rewrite instructions should be directive, not vague.
 
-"""
\ No newline at end of file
+"""
+
+
+EVALUATOR_PROMPT_TWITTER = """
+
+You are a strict content evaluator for Twitter (X) posts.
+
+Your job is to critically evaluate a single tweet draft and decide whether it is good enough to be published without rewriting.
+
+You must be harsh, objective, and consistent.
+Do NOT be polite. Do NOT inflate scores.
+
+---
+
+SCORING RUBRIC (0-10 per category, integers only)
+
+1. Hook
+Does the first line stop scrolling?
+
+2. Clarity
+Is there one clear, immediately understandable point?
+
+3. Human Likeness
+Does it sound like a real person, not a brand or an AI?
+Strongly penalize generic phrases, hype words and robotic sentence patterns.
+
+4. Twitter Fit
+Is it native to Twitter?
+Evaluate:
+- Fits in one tweet: 280 characters or fewer (hard requirement)
+- Punchy, conversational phrasing
+- At most 2 hashtags
+
+---
+
+SCORING RULES
+
+- Each category must be scored from 0 to 10 (integers only).
+- Be conservative with high scores.
+
+PASS / FAIL CONDITIONS
+
+The post PASSES only if ALL conditions are met:
+- Average score ≥ 7.0
+- No individual score below 6
+- The post is 280 characters or fewer (otherwise Twitter Fit must be below 6)
+
+If ANY condition fails, the post FAILS.
+
+---
+
+OUTPUT FORMAT (STRICT JSON)
+
+Return ONLY valid JSON.
+Do NOT include explanations outside the JSON.
+
+Schema:
+
+{
+  "pass": false,
+  "scores": {
+    "hook": 0,
+    "clarity": 0,
+    "human_likeness": 0,
+    "twitter_fit": 0
+  },
+  "issues": [
+    "List concrete problems with the post (use single sentences)"
+  ],
+  "rewrite_instructions": "Give CONCISE, actionable instructions on how to improve the post to pass."
+}
+
+"""
+
+
+EVALUATOR_BATCH_INSTRUCTIONS = """
+
+---
+
+BATCH MODE
+
+You will receive several drafts. Each one starts with a line "=== DRAFT <n> ===".
+Evaluate every draft independently, using the rubric and rules above.
+
+Return ONLY a JSON array with exactly one object per draft, in the same order.
+Each object must follow the schema above, plus an "index" field holding the draft number <n>.
+
+"""
+
+
+#------------- Platforms -------------
+
+# Per-platform generation prompt builder, writer rules (used for rewrites) and evaluator rubric
+PLATFORMS = {
+    "linkedin": {
+        "build_prompt": build_linkedin_prompt,
+        "writer_prompt": SYSTEM_PROMPT_1,
+        "evaluator_prompt": EVALUATOR_PROMPT_LINKEDIN,
+    },
+    "twitter": {
+        "build_prompt": build_twitter_prompt,
+        "writer_prompt": SYSTEM_PROMPT_2,
+        "evaluator_prompt": EVALUATOR_PROMPT_TWITTER,
+    },
+}
@@ -0,0 +1,238 @@
+# memory/analytics.py: Evaluation analytics, read from rollups kept up to date by the editor.
+#
+# Usage:
+#   python -m memory.analytics                       # last 30 days
+#   python -m memory.analytics --days 90 --bucket week
+#   python -m memory.analytics --rebuild             # recompute every rollup from post_attempts
+#
+# pipeline/editor.py adds to per-day, per-platform totals (the analytics_rollups table) as it
+# records each evaluation and finishes each run, so reading analytics never scans history.
+# Every metric is a (total, count) pair:
+#   evaluations            one per evaluated draft
+#   first_attempt_pass     total = 1 if a run's first draft passed, per run
+#   score.<criterion>      total = the score, per evaluation
+#   rewrites               total = rewrites the run made, per finished run
+#   outcome.<outcome>      one per finished run (passed, stalled, exhausted, deadline, ...)
+#
+# The rollups can be rebuilt from the checkpointed attempts at any time. A rebuild dates
+# runs by their last checkpoint, so a run finishing just after midnight may move a day.
+
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from utils.logger import get_logger
+
+load_dotenv()
+logger = get_logger("Analytics")
+
+# Default and longest range served, in days
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_DAYS = 366
+
+BUCKETS = ("day", "week", "month")
+
+
+def _today():
+    return datetime.now(timezone.utc).date()
+
+
+def _numeric_scores(scores):
+    return {
+        name: value for name, value in (scores or {}).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+def evaluation_increments(day, platform, attempt, passed, scores):
+    """Rollup increments for one evaluated draft: (day, platform, metric, total, count) tuples."""
+    increments = [(day, platform, "evaluations", 1, 1)]
+    if attempt == 0:
+        increments.append((day, platform, "first_attempt_pass", 1 if passed else 0, 1))
+    for name, value in _numeric_scores(scores).items():
+        increments.append((day, platform, f"score.{name}", value, 1))
+    return increments
+
+
+def run_increments(day, platform, rewrites, outcome):
+    """Rollup increments for one finished editor run."""
+    return [
+        (day, platform, "rewrites", rewrites, 1),
+        (day, platform, f"outcome.{outcome}", 1, 1),
+    ]
+
+
+def _fold(merged, increments):
+    """Adds increments into a running {(day, platform, metric): (total, count)} dict."""
+    for day, platform, metric, total, count in increments:
+        key = (day, platform, metric)
+        previous = merged.get(key, (0, 0))
+        merged[key] = (previous[0] + total, previous[1] + count)
+    return merged
+
+
+def _rows(merged):
+    """Turns folded totals into rows for db_handler.add_rollups."""
+    return [
+        {"day": day, "platform": platform, "metric": metric, "total": total, "count": count}
+        for (day, platform, metric), (total, count) in merged.items()
+    ]
+
+
+def _merge(increments):
+    """Sums increments per (day, platform, metric), as rows for db_handler.add_rollups."""
+    return _rows(_fold({}, increments))
+
+
+def record_evaluation(platform, attempt, evaluation):
+    """Adds one evaluated draft of an editor run to today's rollups."""
+    from memory.db_handler import add_rollups
+    add_rollups(_merge(evaluation_increments(
+        _today().isoformat(), platform or "linkedin", attempt, evaluation.get("pass"), evaluation.get("scores")
+    )))
+
+
+def record_run(platform, rewrites, outcome):
+    """Adds one finished editor run to today's rollups."""
+    from memory.db_handler import add_rollups
+    add_rollups(_merge(run_increments(_today().isoformat(), platform or "linkedin", rewrites, outcome)))
+
+
+#-------------------------------
+# Reading
+#-------------------------------
+def _bucket_key(day, bucket):
+    if bucket == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if bucket == "month":
+        return day.strftime("%Y-%m")
+    return day.isoformat()
+
+
+def _summarize(totals):
+    """Turns {metric: [total, count]} into the figures the dashboard shows."""
+    def ratio(metric, digits=3):
+        total, count = totals.get(metric, (0, 0))
+        return round(total / count, digits) if count else None
+
+    return {
+        "runs": totals.get("rewrites", (0, 0))[1],
+        "evaluations": totals.get("evaluations", (0, 0))[1],
+        "first_attempt_pass_rate": ratio("first_attempt_pass"),
+        "avg_rewrites": ratio("rewrites", 2),
+        "outcomes": {
+            metric.split(".", 1)[1]: count
+            for metric, (_, count) in sorted(totals.items()) if metric.startswith("outcome.")
+        },
+        "scores": {
+            metric.split(".", 1)[1]: ratio(metric, 2)
+            for metric in sorted(totals) if metric.startswith("score.")
+        },
+    }
+
+
+def get_analytics(days=ANALYTICS_DEFAULT_DAYS, platform=None, bucket="day"):
+    """
+    Evaluation analytics for the last `days` days (UTC), from the rollups.
+
+    Args:
+        platform (str): Only this platform (all platforms when None)
+        bucket (str): "day", "week" or "month"
+
+    Returns:
+        dict: since, until, bucket, summary (over the whole range) and buckets (one per
+              day/week/month in the range, oldest first, each with its own summary)
+    """
+    from memory.db_handler import get_rollups
+
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+    days = max(1, min(int(days), ANALYTICS_MAX_DAYS))
+    today = _today()
+    since = today - timedelta(days=days - 1)
+
+    # Every bucket in the range, so days without runs show up as zero throughput
+    buckets = {}
+    for offset in range(days):
+        buckets.setdefault(_bucket_key(since + timedelta(days=offset), bucket), {})
+    overall = {}
+
+    for row in get_rollups(since.isoformat()):
+        if platform and row["platform"] != platform:
+            continue
+        day = row["day"] if isinstance(row["day"], date) else date.fromisoformat(str(row["day"])[:10])
+        for totals in (buckets.setdefault(_bucket_key(day, bucket), {}), overall):
+            previous = totals.get(row["metric"], (0, 0))
+            totals[row["metric"]] = (previous[0] + row["total"], previous[1] + row["count"])
+
+    return {
+        "since": since.isoformat(),
+        "until": today.isoformat(),
+        "bucket": bucket,
+        "summary": _summarize(overall),
+        "buckets": [{"start": key, **_summarize(totals)} for key, totals in sorted(buckets.items())],
+    }
+
+
+#-------------------------------
+# Rebuild
+#-------------------------------
+def rebuild(batch_size=500):
+    """
+    Recomputes every rollup from the checkpointed editor attempts and replaces the stored
+    ones. Reads the attempts as a stream, folding each evaluation into running totals as it
+    goes; memory holds those totals plus one small summary per finished run.
+
+    Returns:
+        int: Number of finished runs counted
+    """
+    from memory.db_handler import backend, replace_rollups
+
+    if backend is None:
+        return 0
+
+    merged = {}  # (day, platform, metric) -> (total, count)
+    runs = {}  # run_id -> (platform, last attempt, outcome, last checkpoint day)
+    for row in backend.export_rows("post_attempts", batch_size=batch_size):
+        platform = row.get("platform") or "linkedin"
+        day = str(row["updated_at"])[:10]
+        if row.get("passed") is not None:
+            scores = row.get("scores")
+            if isinstance(scores, str):
+                scores = json.loads(scores)
+            _fold(merged, evaluation_increments(day, platform, row["attempt"], row["passed"], scores))
+        if row.get("outcome"):
+            previous = runs.get(row["run_id"])
+            if previous is None or row["attempt"] >= previous[1]:
+                runs[row["run_id"]] = (platform, row["attempt"], row["outcome"], max(day, previous[3]) if previous else day)
+
+    for platform, rewrites, outcome, day in runs.values():
+        _fold(merged, run_increments(day, platform, rewrites, outcome))
+
+    rollups = _rows(merged)
+    if not replace_rollups(rollups):
+        raise RuntimeError("Could not store the rebuilt analytics rollups")
+    logger.info(f"Rebuilt analytics rollups from {len(runs)} runs ({len(rollups)} rows).")
+    return len(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluation analytics from the editor's rollups.")
+    parser.add_argument("--days", type=int, default=ANALYTICS_DEFAULT_DAYS)
+    parser.add_argument("--platform")
+    parser.add_argument("--bucket", choices=BUCKETS, default="day")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every rollup from post_attempts first")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"Rebuilt rollups from {rebuild()} runs.")
+    print(json.dumps(get_analytics(args.days, args.platform, args.bucket), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# memory/backends: Pluggable storage backends behind memory.db_handler.
+#
+# STORAGE_BACKEND=supabase  Hosted PostgreSQL over HTTP (needs SUPABASE_URL / SUPABASE_KEY)
+# STORAGE_BACKEND=sqlite    Local SQLite file at SQLITE_PATH (default: data/redraft.db)
+#
+# If STORAGE_BACKEND is unset, Supabase is used when credentials exist, otherwise SQLite.
+
+import os
+
+DEFAULT_SQLITE_PATH = "data/redraft.db"
+
+
+def create_backend(name=None):
+    """
+    Builds the configured storage backend.
+
+    Args:
+        name (str): "supabase" or "sqlite"; defaults to STORAGE_BACKEND / auto-detection
+
+    Returns:
+        StorageBackend
+    """
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    name = (name or os.getenv("STORAGE_BACKEND") or ("supabase" if url and key else "sqlite")).lower()
+
+    if name == "supabase":
+        if not (url and key):
+            raise ValueError("STORAGE_BACKEND=supabase requires SUPABASE_URL and SUPABASE_KEY")
+        from memory.backends.supabase_backend import SupabaseBackend
+        return SupabaseBackend(url, key)
+
+    if name == "sqlite":
+        from memory.backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH))
+
+    raise ValueError(f"Unknown storage backend: {name}")
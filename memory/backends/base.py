@@ -0,0 +1,222 @@
+# memory/backends/base.py: Storage interface implemented by every backend.
+# Backends raise on failure; memory.db_handler catches, logs and falls back.
+
+import hashlib
+
+# Tables copied by memory.transfer, with the column used to page through them
+TABLES = {
+    "posts": "id",
+    "topics": "id",
+    "activity": "id",
+    "settings": "key",
+    "post_attempts": "id",
+}
+
+# Tables memory.export streams, with the column its status filter matches
+EXPORT_TABLES = {
+    "posts": "status",
+    "topics": "used",
+    "activity": "type",
+}
+
+
+def topic_content_hash(content):
+    """
+    Identity of a topic: sha256 of its stripped text.
+    Must match the generated column in memory/migrations/postgres/0003_topic_content_hash.sql.
+    """
+    return hashlib.sha256(content.strip(" \t\r\n").encode("utf-8")).hexdigest()
+
+
+class StorageBackend:
+    """
+    Posts, topics, activity and settings storage.
+    """
+
+    name = "base"
+
+    # ---- Posts ----
+
+    def get_stats(self):
+        """Returns {"total_generated", "pending_review", "topics_available"}."""
+        raise NotImplementedError
+
+    def get_pending_posts(self, limit=None, columns="*"):
+        """Pending posts, newest first."""
+        raise NotImplementedError
+
+    def get_pending_posts_page(self, limit, position=None, columns="*"):
+        """
+        Up to `limit` pending posts ordered by (created_at, id) descending, strictly
+        after `position` (a (created_at, id) tuple) when given.
+        """
+        raise NotImplementedError
+
+    def get_post(self, post_id):
+        """A single post as a dict, or None."""
+        raise NotImplementedError
+
+    def get_posts(self, post_ids):
+        """The posts with these ids (those that exist), in one query."""
+        raise NotImplementedError
+
+    def add_post(self, post_id, topic, content, status, platform="linkedin", group_id=None):
+        """Inserts or replaces a post."""
+        raise NotImplementedError
+
+    def add_posts(self, posts):
+        """
+        Inserts or replaces several posts in one write: dicts with id, topic, content,
+        status and optionally platform and group_id.
+        """
+        raise NotImplementedError
+
+    def get_post_variants(self, group_id):
+        """Every post of a variant group (one per platform), oldest first."""
+        raise NotImplementedError
+
+    def update_post_status(self, post_id, status, content=None):
+        """Updates a post's status and optionally its content."""
+        raise NotImplementedError
+
+    def update_posts_status(self, post_ids, status, from_status=None):
+        """
+        Sets the status of many posts in one set-based update; with from_status, only
+        of those currently in that status. Returns the ids that were updated.
+        """
+        raise NotImplementedError
+
+    # ---- Publishing ----
+
+    def claim_post_publish(self, post_id, publish_key):
+        """
+        Atomically marks a LinkedIn post "queued" for publishing unless it is already
+        queued, publishing or published. Posts for other platforms are never claimed.
+        Returns True if this call claimed it.
+        """
+        raise NotImplementedError
+
+    def update_publish_status(self, post_id, publish_status, expected=None, **fields):
+        """
+        Sets publish_status plus any of publish_attempts, publish_error, linkedin_post_id,
+        published_at. With `expected`, only updates a post currently in that publish status.
+        Returns True if the post was updated.
+        """
+        raise NotImplementedError
+
+    def get_queued_publishes(self):
+        """Posts waiting in the "queued" publish status (e.g. left by a restart)."""
+        raise NotImplementedError
+
+    # ---- Editor attempts ----
+
+    def save_post_attempt(self, attempt):
+        """
+        Inserts or updates (by run_id + attempt) one checkpointed editor attempt: a dict with
+        run_id, post_id, topic, attempt, max_retries, draft and, once evaluated, passed,
+        scores, issues and rewrite_instructions.
+        """
+        raise NotImplementedError
+
+    def finish_post_run(self, run_id, outcome):
+        """Sets the outcome on every attempt of an editor run."""
+        raise NotImplementedError
+
+    def get_post_attempts(self, post_id):
+        """Every checkpointed attempt for a post, oldest first."""
+        raise NotImplementedError
+
+    def get_recent_post_attempts(self, limit):
+        """The `limit` most recent attempts (run_id, attempt, passed, scores, outcome), newest first."""
+        raise NotImplementedError
+
+    def get_unfinished_attempts(self, updated_before):
+        """
+        The latest attempt of each run with no outcome whose most recent checkpoint is older
+        than `updated_before`. A run still checkpointing is left out, however old its
+        earlier attempts are.
+        """
+        raise NotImplementedError
+
+    # ---- Topics ----
+
+    def add_topics(self, topic_list):
+        """Inserts topics, skipping any whose content hash already exists."""
+        raise NotImplementedError
+
+    def get_unused_topics(self):
+        raise NotImplementedError
+
+    def mark_topic_used(self, topic_id=None, content_hash=None):
+        """Marks a topic used, looked up by id or by content hash."""
+        raise NotImplementedError
+
+    def delete_topic(self, topic_id=None, content_hash=None):
+        """Deletes a topic, looked up by id or by content hash."""
+        raise NotImplementedError
+
+    # ---- Activity ----
+
+    def get_activity(self, limit, position=None):
+        """
+        Activity rows newest first. With a (created_at, id) keyset position, the rows after
+        it instead, oldest first, so a caller can page through everything it hasn't seen.
+        """
+        raise NotImplementedError
+
+    def log_activity(self, activity_type, message):
+        raise NotImplementedError
+
+    def log_activities(self, entries):
+        """Inserts many (activity_type, message) rows in one write."""
+        raise NotImplementedError
+
+    # ---- Settings ----
+
+    def get_setting(self, key, default=None):
+        raise NotImplementedError
+
+    def get_all_settings(self):
+        """Every setting as a {key: value} dict, in one query."""
+        raise NotImplementedError
+
+    def update_setting(self, key, value):
+        raise NotImplementedError
+
+    # ---- Analytics ----
+
+    def add_rollups(self, increments):
+        """
+        Adds increments to the analytics rollups in one write: dicts with day, platform,
+        metric, total and count (one per key).
+        """
+        raise NotImplementedError
+
+    def get_rollups(self, since_day, until_day=None):
+        """Rollup rows with since_day <= day (< until_day when given)."""
+        raise NotImplementedError
+
+    def replace_rollups(self, rollups):
+        """Replaces every rollup row, atomically (a rebuild from history)."""
+        raise NotImplementedError
+
+    # ---- Export ----
+
+    def export_page(self, table, limit, position=None, since=None, until=None, status=None):
+        """
+        Up to `limit` rows of an EXPORT_TABLES table ordered by (created_at, id), strictly
+        after `position` (a (created_at, id) tuple) when given. `since` (inclusive) and
+        `until` (exclusive) bound created_at; `status` matches the table's EXPORT_TABLES
+        column (a bool for topics.used).
+        """
+        raise NotImplementedError
+
+    # ---- Bulk transfer ----
+
+    def export_rows(self, table, batch_size=500):
+        """Yields every row of a table (see TABLES), in primary key order."""
+        raise NotImplementedError
+
+    def import_rows(self, table, rows):
+        """Upserts a batch of rows, as produced by export_rows, into a table."""
+        raise NotImplementedError
@@ -0,0 +1,416 @@
+# memory/backends/sqlite_backend.py: Embedded SQLite storage backend for single-node deployments.
+# Uses WAL mode so the dashboard can read while a generation job writes.
+# The schema lives in memory/migrations/sqlite and is applied on first connection.
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from utils.logger import get_logger
+from memory.backends.base import EXPORT_TABLES, StorageBackend, TABLES, topic_content_hash
+from memory.migrations import apply_sqlite_migrations, register_functions
+
+logger = get_logger("SQLite Backend")
+
+# Columns callers may project; anything else is rejected rather than interpolated into SQL
+POST_COLUMNS = {"id", "topic", "content", "status", "created_at", "platform", "group_id"}
+
+# Publishing columns update_publish_status may set
+PUBLISH_COLUMNS = {"publish_attempts", "publish_error", "linkedin_post_id", "published_at"}
+
+# Columns stored as JSON text / 0-1 integers
+JSON_COLUMNS = {"settings": {"value"}, "post_attempts": {"scores", "issues"}}
+BOOL_COLUMNS = {"topics": {"used"}, "post_attempts": {"passed"}}
+
+# Columns of a checkpointed editor attempt
+ATTEMPT_COLUMNS = [
+    "run_id", "post_id", "topic", "attempt", "max_retries", "draft",
+    "passed", "scores", "issues", "rewrite_instructions", "platform", "group_id",
+]
+
+
+def now_iso():
+    """UTC timestamp in a fixed-width ISO format, so text ordering matches time ordering."""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Stores everything in a local SQLite database file.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._migrate_lock = threading.Lock()
+        self._migrated = False
+        self._conn()  # create the file and schema eagerly
+        logger.info(f"SQLite storage initialized at {path}")
+
+    def _conn(self):
+        """One connection per thread (sqlite3 connections aren't shareable across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            register_functions(conn)
+            with self._migrate_lock:
+                if not self._migrated:
+                    apply_sqlite_migrations(conn)
+                    self._migrated = True
+            self._local.conn = conn
+        return conn
+
+    def _query(self, sql, params=()):
+        return [self._to_dict(row) for row in self._conn().execute(sql, params).fetchall()]
+
+    def _execute(self, sql, params=()):
+        return self._conn().execute(sql, params)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Runs a multi-statement write as one transaction (the connection autocommits
+        otherwise), so a failure partway through leaves nothing behind.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _to_dict(row, table=None):
+        data = dict(row)
+        for column in BOOL_COLUMNS.get(table, ()):
+            if data.get(column) is not None:
+                data[column] = bool(data[column])
+        for column in JSON_COLUMNS.get(table, ()):
+            if data.get(column) is not None:
+                data[column] = json.loads(data[column])
+        return data
+
+    @staticmethod
+    def _columns(columns):
+        if columns == "*":
+            return "*"
+        names = [c.strip() for c in columns.split(",")]
+        unknown = set(names) - POST_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown post columns: {', '.join(sorted(unknown))}")
+        return ", ".join(names)
+
+    # ---- Posts ----
+
+    def get_stats(self):
+        row = self._conn().execute(
+            "SELECT (SELECT COUNT(*) FROM posts) AS total_generated, "
+            "(SELECT COUNT(*) FROM posts WHERE status = 'pending') AS pending_review, "
+            "(SELECT COUNT(*) FROM topics WHERE used = 0) AS topics_available"
+        ).fetchone()
+        return dict(row)
+
+    def get_pending_posts(self, limit=None, columns="*"):
+        sql = f"SELECT {self._columns(columns)} FROM posts WHERE status = 'pending' ORDER BY created_at DESC"
+        params = ()
+        if limit:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return self._query(sql, params)
+
+    def get_pending_posts_page(self, limit, position=None, columns="*"):
+        sql = f"SELECT {self._columns(columns)} FROM posts WHERE status = 'pending'"
+        params = []
+        if position:
+            sql += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params += [position[0], position[0], position[1]]
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return self._query(sql, params)
+
+    def get_post(self, post_id):
+        rows = self._query("SELECT * FROM posts WHERE id = ?", (post_id,))
+        return rows[0] if rows else None
+
+    def get_posts(self, post_ids):
+        post_ids = list(post_ids)
+        placeholders = ", ".join("?" for _ in post_ids)
+        return self._query(f"SELECT * FROM posts WHERE id IN ({placeholders})", post_ids)
+
+    def get_post_variants(self, group_id):
+        return self._query("SELECT * FROM posts WHERE group_id = ? ORDER BY created_at", (group_id,))
+
+    # Upsert that keeps the original created_at, like the Supabase upsert
+    _UPSERT_POST = (
+        "INSERT INTO posts (id, topic, content, status, platform, group_id, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET topic = excluded.topic, content = excluded.content, "
+        "status = excluded.status, platform = excluded.platform, group_id = excluded.group_id"
+    )
+
+    def add_post(self, post_id, topic, content, status, platform="linkedin", group_id=None):
+        self._execute(self._UPSERT_POST, (post_id, topic, content, status, platform, group_id, now_iso()))
+
+    def add_posts(self, posts):
+        created_at = now_iso()
+        with self._transaction() as conn:
+            conn.executemany(self._UPSERT_POST, [
+                (p["id"], p["topic"], p["content"], p["status"], p.get("platform", "linkedin"), p.get("group_id"), created_at)
+                for p in posts
+            ])
+
+    def update_post_status(self, post_id, status, content=None):
+        if content:
+            self._execute("UPDATE posts SET status = ?, content = ? WHERE id = ?", (status, content, post_id))
+        else:
+            self._execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
+
+    def update_posts_status(self, post_ids, status, from_status=None):
+        post_ids = list(post_ids)
+        placeholders = ", ".join("?" for _ in post_ids)
+        sql = f"UPDATE posts SET status = ? WHERE id IN ({placeholders})"
+        params = [status, *post_ids]
+        if from_status is not None:
+            sql += " AND status = ?"
+            params.append(from_status)
+        return [row["id"] for row in self._execute(sql + " RETURNING id", params).fetchall()]
+
+    # ---- Publishing ----
+
+    def claim_post_publish(self, post_id, publish_key):
+        cursor = self._execute(
+            "UPDATE posts SET publish_status = 'queued', publish_key = ?, publish_error = NULL "
+            "WHERE id = ? AND platform = 'linkedin' AND (publish_status IS NULL OR publish_status = 'failed')",
+            (publish_key, post_id)
+        )
+        return cursor.rowcount == 1
+
+    def update_publish_status(self, post_id, publish_status, expected=None, **fields):
+        unknown = set(fields) - PUBLISH_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown publish columns: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(["publish_status = ?"] + [f"{column} = ?" for column in fields])
+        sql = f"UPDATE posts SET {assignments} WHERE id = ?"
+        params = [publish_status, *fields.values(), post_id]
+        if expected:
+            sql += " AND publish_status = ?"
+            params.append(expected)
+        return self._execute(sql, params).rowcount == 1
+
+    def get_queued_publishes(self):
+        return self._query("SELECT * FROM posts WHERE publish_status = 'queued'")
+
+    # ---- Editor attempts ----
+
+    def save_post_attempt(self, attempt):
+        values = [attempt.get(column) for column in ATTEMPT_COLUMNS]
+        values = [json.dumps(v) if isinstance(v, (dict, list)) else v for v in values]
+        now = now_iso()
+        updates = ", ".join(f"{c} = excluded.{c}" for c in ATTEMPT_COLUMNS[2:])
+        self._execute(
+            f"INSERT INTO post_attempts ({', '.join(ATTEMPT_COLUMNS)}, created_at, updated_at) "
+            f"VALUES ({', '.join('?' for _ in ATTEMPT_COLUMNS)}, ?, ?) "
+            f"ON CONFLICT(run_id, attempt) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+            (*values, now, now)
+        )
+
+    def finish_post_run(self, run_id, outcome):
+        self._execute("UPDATE post_attempts SET outcome = ? WHERE run_id = ?", (outcome, run_id))
+
+    def get_post_attempts(self, post_id):
+        rows = self._conn().execute("SELECT * FROM post_attempts WHERE post_id = ? ORDER BY id", (post_id,)).fetchall()
+        return [self._to_dict(row, "post_attempts") for row in rows]
+
+    def get_recent_post_attempts(self, limit):
+        rows = self._conn().execute(
+            "SELECT run_id, attempt, passed, scores, outcome FROM post_attempts ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._to_dict(row, "post_attempts") for row in rows]
+
+    def get_unfinished_attempts(self, updated_before):
+        rows = self._conn().execute(
+            "SELECT a.* FROM post_attempts a JOIN ("
+            "SELECT run_id, MAX(attempt) AS attempt FROM post_attempts WHERE outcome IS NULL "
+            "GROUP BY run_id HAVING MAX(updated_at) < ?"
+            ") latest ON a.run_id = latest.run_id AND a.attempt = latest.attempt",
+            (updated_before,)
+        ).fetchall()
+        return [self._to_dict(row, "post_attempts") for row in rows]
+
+    # ---- Topics ----
+
+    def add_topics(self, topic_list):
+        created_at = now_iso()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO topics (content, content_hash, used, created_at) VALUES (?, ?, 0, ?)",
+                [(t, topic_content_hash(t), created_at) for t in topic_list]
+            )
+
+    def get_unused_topics(self):
+        rows = self._conn().execute("SELECT * FROM topics WHERE used = 0").fetchall()
+        return [self._to_dict(row, "topics") for row in rows]
+
+    @staticmethod
+    def _topic_match(topic_id, content_hash):
+        if topic_id is not None:
+            return "id = ?", (topic_id,)
+        return "content_hash = ?", (content_hash,)
+
+    def mark_topic_used(self, topic_id=None, content_hash=None):
+        where, params = self._topic_match(topic_id, content_hash)
+        self._execute(f"UPDATE topics SET used = 1 WHERE {where}", params)
+
+    def delete_topic(self, topic_id=None, content_hash=None):
+        where, params = self._topic_match(topic_id, content_hash)
+        self._execute(f"DELETE FROM topics WHERE {where}", params)
+
+    # ---- Activity ----
+
+    def get_activity(self, limit, position=None):
+        if position:
+            created_at, row_id = position
+            return self._query(
+                "SELECT * FROM activity WHERE created_at >= ? AND (created_at > ? OR id > ?) "
+                "ORDER BY created_at, id LIMIT ?",
+                (created_at, created_at, row_id, limit)
+            )
+        return self._query("SELECT * FROM activity ORDER BY created_at DESC, id DESC LIMIT ?", (limit,))
+
+    def log_activity(self, activity_type, message):
+        self._execute(
+            "INSERT INTO activity (type, message, created_at) VALUES (?, ?, ?)",
+            (activity_type, message, now_iso())
+        )
+
+    def log_activities(self, entries):
+        created_at = now_iso()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO activity (type, message, created_at) VALUES (?, ?, ?)",
+                [(activity_type, message, created_at) for activity_type, message in entries]
+            )
+
+    # ---- Settings ----
+
+    def get_setting(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def get_all_settings(self):
+        rows = self._conn().execute("SELECT key, value FROM settings").fetchall()
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def update_setting(self, key, value):
+        self._execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
+
+    # ---- Analytics ----
+
+    _ROLLUP_COLUMNS = ("day", "platform", "metric", "total", "count")
+
+    def add_rollups(self, increments):
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO analytics_rollups (day, platform, metric, total, count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(day, platform, metric) DO UPDATE SET "
+                "total = analytics_rollups.total + excluded.total, count = analytics_rollups.count + excluded.count",
+                [tuple(row[c] for c in self._ROLLUP_COLUMNS) for row in increments]
+            )
+
+    def get_rollups(self, since_day, until_day=None):
+        sql = "SELECT * FROM analytics_rollups WHERE day >= ?"
+        params = [since_day]
+        if until_day:
+            sql += " AND day < ?"
+            params.append(until_day)
+        return self._query(sql, params)
+
+    def replace_rollups(self, rollups):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM analytics_rollups")
+            conn.executemany(
+                "INSERT INTO analytics_rollups (day, platform, metric, total, count) VALUES (?, ?, ?, ?, ?)",
+                [tuple(row[c] for c in self._ROLLUP_COLUMNS) for row in rollups]
+            )
+
+    # ---- Export ----
+
+    def export_page(self, table, limit, position=None, since=None, until=None, status=None):
+        conditions, params = [], []
+        if status is not None:
+            conditions.append(f"{EXPORT_TABLES[table]} = ?")
+            params.append(int(status) if isinstance(status, bool) else status)
+        if since:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if position:
+            # The leading >= keeps this an index range rather than a scan from the start
+            conditions.append("created_at >= ? AND (created_at > ? OR id > ?)")
+            params += [position[0], position[0], position[1]]
+        sql = f"SELECT * FROM {table}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at, id LIMIT ?"
+        params.append(limit)
+        return [self._to_dict(row, table) for row in self._conn().execute(sql, params).fetchall()]
+
+    # ---- Bulk transfer ----
+
+    def export_rows(self, table, batch_size=500):
+        pk = TABLES[table]
+        last = None
+        while True:
+            if last is None:
+                rows = self._conn().execute(f"SELECT * FROM {table} ORDER BY {pk} LIMIT ?", (batch_size,)).fetchall()
+            else:
+                rows = self._conn().execute(
+                    f"SELECT * FROM {table} WHERE {pk} > ? ORDER BY {pk} LIMIT ?", (last, batch_size)
+                ).fetchall()
+            for row in rows:
+                yield self._to_dict(row, table)
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][pk]
+
+    def import_rows(self, table, rows):
+        if not rows:
+            return
+        if table == "topics":
+            rows = [{**row, "content_hash": row.get("content_hash") or topic_content_hash(row["content"])} for row in rows]
+        # Only copy columns this schema knows about (the source may have extra ones)
+        known = {row["name"] for row in self._conn().execute(f"PRAGMA table_info({table})")}
+        columns = [c for c in rows[0].keys() if c in known]
+        pk = TABLES[table]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != pk)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT({pk}) DO UPDATE SET {updates}"
+        )
+
+        def encode(column, value):
+            if column in JSON_COLUMNS.get(table, ()):
+                return json.dumps(value)
+            if isinstance(value, bool):
+                return int(value)
+            return value
+
+        with self._transaction() as conn:
+            conn.executemany(sql, [[encode(c, row.get(c)) for c in columns] for row in rows])
@@ -0,0 +1,269 @@
+# memory/backends/supabase_backend.py: Supabase (hosted PostgreSQL over HTTP) storage backend.
+
+import time
+from datetime import datetime, timezone
+from supabase import create_client
+from utils.logger import get_logger
+from memory.backends.base import EXPORT_TABLES, StorageBackend, TABLES
+
+logger = get_logger("Supabase Backend")
+
+# Generated by Postgres (see memory/migrations/postgres); never written by clients
+GENERATED_COLUMNS = {"topics": {"content_hash"}}
+
+# Tables keyed by a bigserial id, whose sequence must be moved past imported ids
+SERIAL_TABLES = {"topics", "activity", "post_attempts"}
+
+
+def safe_execute(query_builder, max_retries=3):
+    """
+    Executes a Supabase query with retries specifically for WinError 10035 (Windows socket busy).
+    """
+    for attempt in range(max_retries):
+        try:
+            return query_builder.execute()
+        except Exception as e:
+            err_msg = str(e)
+            if ("10035" in err_msg or "WSAEWOULDBLOCK" in err_msg) and attempt < max_retries - 1:
+                wait_time = 0.2 * (attempt + 1)
+                logger.warning(f"Database busy (10035). Retrying in {wait_time}s... (Attempt {attempt + 1})")
+                time.sleep(wait_time)
+                continue
+            raise e
+
+
+class SupabaseBackend(StorageBackend):
+    """
+    Stores everything in Supabase tables: posts, topics, activity and settings.
+    """
+
+    name = "supabase"
+
+    def __init__(self, url, key):
+        self.client = create_client(url, key)
+        logger.info("Supabase client initialized successfully.")
+
+    def _table(self, name):
+        return self.client.table(name)
+
+    # ---- Posts ----
+
+    def get_stats(self):
+        posts = safe_execute(self._table("posts").select("id", count="exact"))
+        pending = safe_execute(self._table("posts").select("id", count="exact").eq("status", "pending"))
+        topics = safe_execute(self._table("topics").select("id", count="exact").eq("used", False))
+        return {
+            "total_generated": posts.count or 0,
+            "pending_review": pending.count or 0,
+            "topics_available": topics.count or 0
+        }
+
+    def get_pending_posts(self, limit=None, columns="*"):
+        query = self._table("posts").select(columns).eq("status", "pending").order("created_at", desc=True)
+        if limit:
+            query = query.limit(limit)
+        return safe_execute(query).data
+
+    def get_pending_posts_page(self, limit, position=None, columns="*"):
+        query = (
+            self._table("posts").select(columns).eq("status", "pending")
+            .order("created_at", desc=True).order("id", desc=True)
+            .limit(limit)
+        )
+        if position:
+            created_at, post_id = position
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{post_id}")'
+            )
+        return safe_execute(query).data
+
+    def get_post(self, post_id):
+        response = safe_execute(self._table("posts").select("*").eq("id", post_id))
+        return response.data[0] if response.data else None
+
+    def get_posts(self, post_ids):
+        return safe_execute(self._table("posts").select("*").in_("id", list(post_ids))).data
+
+    def get_post_variants(self, group_id):
+        return safe_execute(self._table("posts").select("*").eq("group_id", group_id).order("created_at")).data
+
+    def add_post(self, post_id, topic, content, status, platform="linkedin", group_id=None):
+        safe_execute(self._table("posts").upsert({
+            "id": post_id,
+            "topic": topic,
+            "content": content,
+            "status": status,
+            "platform": platform,
+            "group_id": group_id
+        }))
+
+    def add_posts(self, posts):
+        # One bulk upsert request for every row
+        rows = [{"platform": "linkedin", "group_id": None, **p} for p in posts]
+        safe_execute(self._table("posts").upsert(rows))
+
+    def update_post_status(self, post_id, status, content=None):
+        update_data = {"status": status}
+        if content:
+            update_data["content"] = content
+        safe_execute(self._table("posts").update(update_data).eq("id", post_id))
+
+    def update_posts_status(self, post_ids, status, from_status=None):
+        query = self._table("posts").update({"status": status}).in_("id", list(post_ids))
+        if from_status is not None:
+            query = query.eq("status", from_status)
+        return [row["id"] for row in safe_execute(query).data or []]
+
+    # ---- Publishing ----
+
+    def claim_post_publish(self, post_id, publish_key):
+        # Conditional update: only one concurrent caller gets the row back
+        response = safe_execute(
+            self._table("posts")
+            .update({"publish_status": "queued", "publish_key": publish_key, "publish_error": None})
+            .eq("id", post_id)
+            .eq("platform", "linkedin")
+            .or_("publish_status.is.null,publish_status.eq.failed")
+        )
+        return bool(response.data)
+
+    def update_publish_status(self, post_id, publish_status, expected=None, **fields):
+        query = self._table("posts").update({"publish_status": publish_status, **fields}).eq("id", post_id)
+        if expected:
+            query = query.eq("publish_status", expected)
+        return bool(safe_execute(query).data)
+
+    def get_queued_publishes(self):
+        return safe_execute(self._table("posts").select("*").eq("publish_status", "queued")).data
+
+    # ---- Editor attempts ----
+
+    def save_post_attempt(self, attempt):
+        row = {**attempt, "updated_at": datetime.now(timezone.utc).isoformat()}
+        safe_execute(self._table("post_attempts").upsert(row, on_conflict="run_id,attempt"))
+
+    def finish_post_run(self, run_id, outcome):
+        safe_execute(self._table("post_attempts").update({"outcome": outcome}).eq("run_id", run_id))
+
+    def get_post_attempts(self, post_id):
+        return safe_execute(self._table("post_attempts").select("*").eq("post_id", post_id).order("id")).data
+
+    def get_recent_post_attempts(self, limit):
+        return safe_execute(
+            self._table("post_attempts").select("run_id,attempt,passed,scores,outcome").order("id", desc=True).limit(limit)
+        ).data
+
+    def get_unfinished_attempts(self, updated_before):
+        # GROUP BY ... HAVING lives in a function (memory/migrations/postgres/0010_interrupted_runs.sql)
+        return safe_execute(self.client.rpc("interrupted_editor_runs", {"updated_before": updated_before})).data
+
+    # ---- Topics ----
+
+    def add_topics(self, topic_list):
+        # content_hash is a generated column with a unique index; duplicates are skipped
+        data = [{"content": t, "used": False} for t in topic_list]
+        safe_execute(self._table("topics").upsert(data, on_conflict="content_hash", ignore_duplicates=True))
+
+    def get_unused_topics(self):
+        return safe_execute(self._table("topics").select("*").eq("used", False)).data
+
+    def _match_topic(self, query, topic_id, content_hash):
+        if topic_id is not None:
+            return query.eq("id", topic_id)
+        return query.eq("content_hash", content_hash)
+
+    def mark_topic_used(self, topic_id=None, content_hash=None):
+        query = self._table("topics").update({"used": True})
+        safe_execute(self._match_topic(query, topic_id, content_hash))
+
+    def delete_topic(self, topic_id=None, content_hash=None):
+        query = self._table("topics").delete()
+        safe_execute(self._match_topic(query, topic_id, content_hash))
+
+    # ---- Activity ----
+
+    def get_activity(self, limit, position=None):
+        if position:
+            created_at, row_id = position
+            query = (
+                self._table("activity").select("*").order("created_at").order("id").limit(limit)
+                .gte("created_at", created_at).or_(f'created_at.gt."{created_at}",id.gt."{row_id}"')
+            )
+        else:
+            query = self._table("activity").select("*").order("created_at", desc=True).order("id", desc=True).limit(limit)
+        return safe_execute(query).data
+
+    def log_activity(self, activity_type, message):
+        safe_execute(self._table("activity").insert({"type": activity_type, "message": message}))
+
+    def log_activities(self, entries):
+        data = [{"type": activity_type, "message": message} for activity_type, message in entries]
+        safe_execute(self._table("activity").insert(data))
+
+    # ---- Settings ----
+
+    def get_setting(self, key, default=None):
+        response = safe_execute(self._table("settings").select("value").eq("key", key))
+        return response.data[0]["value"] if response.data else default
+
+    def get_all_settings(self):
+        rows = safe_execute(self._table("settings").select("key,value")).data
+        return {row["key"]: row["value"] for row in rows}
+
+    def update_setting(self, key, value):
+        safe_execute(self._table("settings").upsert({"key": key, "value": value}))
+
+    # ---- Analytics ----
+
+    def add_rollups(self, increments):
+        # Additive upsert, done by a function (see memory/migrations/postgres/0008_analytics_rollups.sql)
+        safe_execute(self.client.rpc("add_analytics_rollups", {"increments": increments}))
+
+    def get_rollups(self, since_day, until_day=None):
+        query = self._table("analytics_rollups").select("*").gte("day", since_day)
+        if until_day:
+            query = query.lt("day", until_day)
+        return safe_execute(query).data
+
+    def replace_rollups(self, rollups):
+        safe_execute(self.client.rpc("replace_analytics_rollups", {"rollups": rollups}))
+
+    # ---- Export ----
+
+    def export_page(self, table, limit, position=None, since=None, until=None, status=None):
+        query = self._table(table).select("*").order("created_at").order("id").limit(limit)
+        if status is not None:
+            query = query.eq(EXPORT_TABLES[table], status)
+        if since:
+            query = query.gte("created_at", since)
+        if until:
+            query = query.lt("created_at", until)
+        if position:
+            created_at, row_id = position
+            query = query.gte("created_at", created_at).or_(
+                f'created_at.gt."{created_at}",id.gt."{row_id}"'
+            )
+        return safe_execute(query).data
+
+    # ---- Bulk transfer ----
+
+    def export_rows(self, table, batch_size=500):
+        pk = TABLES[table]
+        last = None
+        while True:
+            query = self._table(table).select("*").order(pk).limit(batch_size)
+            if last is not None:
+                query = query.gt(pk, last)
+            rows = safe_execute(query).data
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][pk]
+
+    def import_rows(self, table, rows):
+        generated = GENERATED_COLUMNS.get(table, set())
+        rows = [{k: v for k, v in row.items() if k not in generated} for row in rows]
+        if rows:
+            safe_execute(self._table(table).upsert(rows, on_conflict=TABLES[table]))
+            if table in SERIAL_TABLES:
+                safe_execute(self.client.rpc("sync_id_sequence", {"table_name": table}))
@@ -1,222 +1,695 @@
 import os
+import re
 import time
-from supabase import create_client, Client
+import json
+import base64
+import threading
+from datetime import datetime, timedelta, timezone
 from utils.logger import get_logger
+from utils.recorder import recordable
+from memory.backends import create_backend
+from memory.backends.base import EXPORT_TABLES, topic_content_hash
+from memory.post_events import publish_post_update
+from memory import search
 from dotenv import load_dotenv
-import sys
 
 load_dotenv()
 logger = get_logger("DB Handler")
 
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
+# Storage backend selected by STORAGE_BACKEND (see memory/backends/__init__.py).
+# Every function below keeps its old contract: errors are logged and a safe default returned.
+backend = None
 
-# Initialize client only if valid credentials exist
-supabase: Client = None
-
-if not (url and key):
-    logger.error("Supabase credentials not found.")
-else:
-    try:
-        supabase = create_client(url, key)
-        logger.info("Supabase client initialized successfully.")
-    except Exception as e:
-        logger.error(f"Failed to initialize Supabase: {e}")
-
-def safe_execute(query_builder, max_retries=3):
-    """
-    Executes a Supabase query with retries specifically for WinError 10035 (Windows socket busy).
-    """
-    for attempt in range(max_retries):
-        try:
-            return query_builder.execute()
-        except Exception as e:
-            err_msg = str(e)
-            if ("10035" in err_msg or "WSAEWOULDBLOCK" in err_msg) and attempt < max_retries - 1:
-                wait_time = 0.2 * (attempt + 1)
-                logger.warning(f"Database busy (10035). Retrying in {wait_time}s... (Attempt {attempt + 1})")
-                time.sleep(wait_time)
-                continue
-            raise e
+try:
+    backend = create_backend()
+except Exception as e:
+    logger.error(f"Failed to initialize storage backend: {e}")
 
+@recordable("db.get_stats")
 def get_stats():
     """Fetch statistics from the database."""
-    if not supabase:
+    if not backend:
         return {"total_generated": 0, "pending_review": 0, "topics_available": 0}
     
     try:
-        posts = safe_execute(supabase.table("posts").select("id", count="exact"))
-        pending = safe_execute(supabase.table("posts").select("id", count="exact").eq("status", "pending"))
-        topics = safe_execute(supabase.table("topics").select("id", count="exact").eq("used", False))
-        
-        return {
-            "total_generated": posts.count or 0,
-            "pending_review": pending.count or 0,
-            "topics_available": topics.count or 0
-        }
+        return backend.get_stats()
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
         return {"total_generated": 0, "pending_review": 0, "topics_available": 0}
 
-def get_activity(limit=5):
-    """Fetch recent system activity."""
-    if not supabase:
+# Bumped on every activity insert from this process; lets pollers revalidate without a query
+_activity_version = 0
+_activity_lock = threading.Lock()
+
+
+def get_activity_version():
+    """Returns the in-process activity version counter."""
+    return _activity_version
+
+
+@recordable("db.get_activity")
+def get_activity(limit=5, cursor=None):
+    """
+    Fetch recent system activity, newest first.
+    If a cursor (see activity_cursor) is given, up to `limit` rows after it are returned
+    instead, oldest first; a full page means there may be more. Raises ValueError if the
+    cursor is malformed.
+    """
+    position = decode_cursor(cursor) if cursor else None
+
+    if not backend:
+        if position:
+            return []
         # Fallback dummy data
         return [{"type": "info", "message": "Database not configured. Using placeholder data.", "time": "Just now"}]
     
     try:
-        response = safe_execute(supabase.table("activity").select("*").order("created_at", desc=True).limit(limit))
-        return response.data
+        return backend.get_activity(limit, position=position)
     except Exception as e:
         logger.error(f"Error fetching activity: {e}")
         return []
 
+
+def activity_cursor(row):
+    """Cursor for get_activity that returns the rows logged after `row`."""
+    return encode_cursor(row["created_at"], row["id"])
+
+@recordable("db.log_activity")
 def log_activity(activity_type, message):
     """Log a new activity to the database."""
-    if not supabase:
+    global _activity_version
+    if not backend:
         logger.info(f"MOCK LOG [{activity_type}]: {message}")
         return
     
     try:
-        safe_execute(supabase.table("activity").insert({"type": activity_type, "message": message}))
+        backend.log_activity(activity_type, message)
+        with _activity_lock:
+            _activity_version += 1
     except Exception as e:
         logger.error(f"Error logging activity: {e}")
 
-def get_pending_posts():
-    """Fetch posts awaiting review."""
-    if not supabase:
+@recordable("db.log_activities")
+def log_activities(entries):
+    """Log several (activity_type, message) entries in one insert."""
+    global _activity_version
+    if not entries:
+        return
+    if not backend:
+        for activity_type, message in entries:
+            logger.info(f"MOCK LOG [{activity_type}]: {message}")
+        return
+
+    try:
+        backend.log_activities(entries)
+        with _activity_lock:
+            _activity_version += 1
+    except Exception as e:
+        logger.error(f"Error logging activities: {e}")
+
+# Columns needed to render a post card on the review page
+REVIEW_POST_COLUMNS = "id,topic,content,created_at,platform"
+
+
+def encode_cursor(created_at, post_id):
+    """Encodes a (created_at, id) keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps([created_at, post_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+# Ids a cursor may point at: generated post ids, or the integer ids of topics and activity.
+# Anything else is rejected, since the Supabase backend puts cursor values in a filter string.
+CURSOR_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        if isinstance(row_id, bool) or not (
+            isinstance(row_id, int) or CURSOR_ID_PATTERN.fullmatch(row_id)
+        ):
+            raise ValueError(f"unexpected id {row_id!r}")
+        return created_at, row_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+@recordable("db.get_pending_posts")
+def get_pending_posts(limit=None, columns="*"):
+    """Fetch posts awaiting review, newest first."""
+    if not backend:
         return []
     
     try:
-        response = safe_execute(supabase.table("posts").select("*").eq("status", "pending").order("created_at", desc=True))
-        return response.data
+        return backend.get_pending_posts(limit=limit, columns=columns)
     except Exception as e:
         logger.error(f"Error fetching pending posts: {e}")
         return []
 
+@recordable("db.get_pending_posts_page")
+def get_pending_posts_page(limit=20, cursor=None, columns=REVIEW_POST_COLUMNS):
+    """
+    Fetch one page of posts awaiting review using keyset pagination on (created_at, id).
+
+    Args:
+        limit (int): Page size
+        cursor (str): Cursor returned with the previous page, or None for the first page
+        columns (str): Comma-separated column projection
+
+    Returns:
+        tuple: (list of posts, next cursor or None when there are no more pages)
+    """
+    # Validate before touching the DB so callers get a ValueError for a bad cursor
+    position = decode_cursor(cursor) if cursor else None
+
+    if not backend:
+        return [], None
+
+    try:
+        # One extra row tells us whether another page exists
+        rows = backend.get_pending_posts_page(limit + 1, position=position, columns=columns)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return rows, next_cursor
+    except Exception as e:
+        logger.error(f"Error fetching pending posts page: {e}")
+        return [], None
+
+@recordable("db.update_post_status")
 def update_post_status(post_id, status, content=None):
     """Update a post's status and optionally its content."""
-    if not supabase:
+    if not backend:
         return False
     
     try:
-        update_data = {"status": status}
-        if content:
-            update_data["content"] = content
-        
-        safe_execute(supabase.table("posts").update(update_data).eq("id", post_id))
+        backend.update_post_status(post_id, status, content)
+        publish_post_update(post_id, status)
+        search.update_status([post_id], status, content)
         return True
     except Exception as e:
         logger.error(f"Error updating post {post_id}: {e}")
         return False
 
+@recordable("db.update_posts_status")
+def update_posts_status(post_ids, status, from_status=None):
+    """
+    Set the status of many posts in one set-based update.
+
+    Args:
+        from_status (str): Only update posts currently in this status (e.g. "pending")
+
+    Returns:
+        list: Ids of the posts that were updated (empty on error)
+    """
+    if not backend or not post_ids:
+        return []
+
+    try:
+        updated = backend.update_posts_status(post_ids, status, from_status=from_status)
+        for post_id in updated:
+            publish_post_update(post_id, status)
+        search.update_status(updated, status)
+        return updated
+    except Exception as e:
+        logger.error(f"Error updating {len(post_ids)} posts: {e}")
+        return []
+
+@recordable("db.get_post")
 def get_post(post_id):
     """Fetch a single post by ID."""
-    if not supabase:
+    if not backend:
         return None
     
     try:
-        response = safe_execute(supabase.table("posts").select("*").eq("id", post_id))
-        if response.data:
-            return response.data[0]
-        return None
+        return backend.get_post(post_id)
     except Exception as e:
         logger.error(f"Error fetching post {post_id}: {e}")
         return None
 
-def add_post(post_id, topic, content, status="pending"):
+@recordable("db.get_posts")
+def get_posts(post_ids):
+    """Fetch several posts by ID in one query; ids that don't exist are left out."""
+    if not backend or not post_ids:
+        return []
+
+    try:
+        return backend.get_posts(post_ids)
+    except Exception as e:
+        logger.error(f"Error fetching {len(post_ids)} posts: {e}")
+        return []
+
+@recordable("db.get_post_variants")
+def get_post_variants(group_id):
+    """Every post of a variant group (the platform versions of one topic)."""
+    if not backend or not group_id:
+        return []
+
+    try:
+        return backend.get_post_variants(group_id)
+    except Exception as e:
+        logger.error(f"Error fetching variants of group {group_id}: {e}")
+        return []
+
+@recordable("db.add_post")
+def add_post(post_id, topic, content, status="pending", platform="linkedin", group_id=None):
     """Insert a new post draft into the database."""
-    if not supabase:
+    if not backend:
         logger.info(f"MOCK POST SAVE: {topic}")
         return False
     
     try:
-        safe_execute(supabase.table("posts").upsert({
-            "id": post_id,
-            "topic": topic,
-            "content": content,
-            "status": status
-        }))
+        backend.add_post(post_id, topic, content, status, platform=platform, group_id=group_id)
+        # Wakes long-polling /api/post/<id>/wait requests
+        publish_post_update(post_id, status)
+        search.index_posts([{
+            "id": post_id, "topic": topic, "content": content, "status": status, "platform": platform
+        }])
         return True
     except Exception as e:
         logger.error(f"Error adding post: {e}")
         return False
 
+@recordable("db.add_posts")
+def add_posts(posts):
+    """
+    Insert several post drafts (e.g. the platform variants of one topic) in one write.
+
+    Args:
+        posts (list): dicts with id, topic, content, status, platform and group_id
+    """
+    if not posts:
+        return True
+    if not backend:
+        for post in posts:
+            logger.info(f"MOCK POST SAVE: {post['topic']} ({post.get('platform', 'linkedin')})")
+        return False
+
+    try:
+        backend.add_posts(posts)
+        for post in posts:
+            publish_post_update(post["id"], post["status"])
+        search.index_posts(posts)
+        return True
+    except Exception as e:
+        logger.error(f"Error adding posts: {e}")
+        return False
+
+@recordable("db.claim_post_publish")
+def claim_post_publish(post_id, publish_key):
+    """Atomically queue a post for LinkedIn publishing; False if it is already queued or published, or not a LinkedIn post."""
+    if not backend:
+        return False
+
+    try:
+        return backend.claim_post_publish(post_id, publish_key)
+    except Exception as e:
+        logger.error(f"Error claiming post {post_id} for publishing: {e}")
+        return False
+
+@recordable("db.update_publish_status")
+def update_publish_status(post_id, publish_status, expected=None, **fields):
+    """
+    Record a post's LinkedIn publish status (and attempts, error, LinkedIn id, published_at).
+    With `expected`, only succeeds if the post is currently in that publish status.
+    """
+    if not backend:
+        return False
+
+    try:
+        return backend.update_publish_status(post_id, publish_status, expected, **fields)
+    except Exception as e:
+        logger.error(f"Error updating publish status of post {post_id}: {e}")
+        return False
+
+@recordable("db.get_queued_publishes")
+def get_queued_publishes():
+    """Posts queued for publishing but not yet picked up, e.g. after a restart."""
+    if not backend:
+        return []
+
+    try:
+        return backend.get_queued_publishes()
+    except Exception as e:
+        logger.error(f"Error fetching queued publishes: {e}")
+        return []
+
+@recordable("db.save_post_attempt")
+def save_post_attempt(attempt):
+    """Checkpoint one editor attempt (inserted, or updated once it has been evaluated)."""
+    if not backend:
+        return False
+
+    try:
+        backend.save_post_attempt(attempt)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving attempt {attempt.get('attempt')} of post {attempt.get('post_id')}: {e}")
+        return False
+
+@recordable("db.finish_post_run")
+def finish_post_run(run_id, outcome):
+    """Mark an editor run finished (passed, exhausted, stalled, invalid or error)."""
+    if not backend:
+        return False
+
+    try:
+        backend.finish_post_run(run_id, outcome)
+        return True
+    except Exception as e:
+        logger.error(f"Error finishing editor run {run_id}: {e}")
+        return False
+
+@recordable("db.get_post_attempts")
+def get_post_attempts(post_id):
+    """Every checkpointed editor attempt for a post, oldest first."""
+    if not backend:
+        return []
+
+    try:
+        return backend.get_post_attempts(post_id)
+    except Exception as e:
+        logger.error(f"Error fetching attempts of post {post_id}: {e}")
+        return []
+
+@recordable("db.get_recent_post_attempts")
+def get_recent_post_attempts(limit=2000):
+    """The most recent editor attempts, newest first (used to learn rewrite budgets)."""
+    if not backend:
+        return []
+
+    try:
+        return backend.get_recent_post_attempts(limit)
+    except Exception as e:
+        logger.error(f"Error fetching recent attempts: {e}")
+        return []
+
+@recordable("db.get_interrupted_runs")
+def get_interrupted_runs(idle_seconds):
+    """
+    Editor runs that never finished and haven't checkpointed for `idle_seconds`.
+
+    Returns:
+        list: The latest attempt of each such run
+    """
+    if not backend:
+        return []
+
+    updated_before = (datetime.now(timezone.utc) - timedelta(seconds=idle_seconds)).isoformat(timespec="microseconds")
+    try:
+        return backend.get_unfinished_attempts(updated_before)
+    except Exception as e:
+        logger.error(f"Error fetching interrupted editor runs: {e}")
+        return []
+
+@recordable("db.add_topics")
 def add_topics(topic_list):
     """Insert multiple topics into the database."""
-    if not supabase:
+    if not backend:
         logger.info(f"MOCK TOPICS SAVE: {len(topic_list)} topics")
         return False
     
     try:
-        data = [{"content": t, "used": False} for t in topic_list]
-        safe_execute(supabase.table("topics").insert(data))
+        backend.add_topics(topic_list)
         return True
     except Exception as e:
         logger.error(f"Error adding topics: {e}")
         return False
 
+def _topic_lookup(topic):
+    """
+    Resolves a topic row (dict), id (int) or content (str) to an indexed lookup,
+    so topics are never matched on their full text.
+    """
+    if isinstance(topic, dict):
+        if topic.get("id") is not None:
+            return {"topic_id": topic["id"]}
+        topic = topic["content"]
+    if isinstance(topic, int):
+        return {"topic_id": topic}
+    return {"content_hash": topic_content_hash(topic)}
+
+@recordable("db.mark_topic_used")
 def mark_topic_used(topic):
-    """Mark a topic as used in the database."""
-    if not supabase:
+    """Mark a topic as used in the database. Accepts a topic row, id or content string."""
+    if not backend:
         logger.info(f"MOCK TOPIC MARK AS USED: {topic}")
         return False
     
     try:
-        safe_execute(supabase.table("topics").update({"used": True}).eq("content", topic))
+        backend.mark_topic_used(**_topic_lookup(topic))
         return True
     except Exception as e:
         logger.error(f"Error marking topic as used: {e}")
         return False
 
+@recordable("db.get_unused_topics")
 def get_unused_topics():
     """Get unused topics from the database."""
-    if not supabase:
+    if not backend:
         logger.info("MOCK GET UNUSED TOPICS")
         return []
     
     try:
-        response = safe_execute(supabase.table("topics").select("*").eq("used", False))
-        return response.data
+        return backend.get_unused_topics()
     except Exception as e:
         logger.error(f"Error getting unused topics: {e}")
         return []
 
+@recordable("db.delete_topic")
 def delete_topic(topic):
     """
-    Deletes a topic from the database.
+    Deletes a topic from the database. Accepts a topic row, id or content string.
     """
-    if not supabase:
+    if not backend:
         logger.info(f"MOCK TOPIC DELETE: {topic}")
         return False
     
     try:
-        safe_execute(supabase.table("topics").delete().eq("content", topic))
+        backend.delete_topic(**_topic_lookup(topic))
         return True
     except Exception as e:
         logger.error(f"Error deleting topic: {e}")
         return False
 
-def get_setting(key, default=None):
-    """Fetch a configuration setting from the database."""
-    if not supabase:
-        return default
+@recordable("db.add_rollups")
+def add_rollups(increments):
+    """Adds increments (dicts with day, platform, metric, total, count) to the analytics rollups."""
+    if not backend or not increments:
+        return False
+
     try:
-        response = safe_execute(supabase.table("settings").select("value").eq("key", key))
-        if response.data:
-            return response.data[0]["value"]
-        return default
+        backend.add_rollups(increments)
+        return True
+    except Exception as e:
+        logger.error(f"Error updating analytics rollups: {e}")
+        return False
+
+@recordable("db.get_rollups")
+def get_rollups(since_day, until_day=None):
+    """Analytics rollup rows for days in [since_day, until_day)."""
+    if not backend:
+        return []
+
+    try:
+        return backend.get_rollups(since_day, until_day)
     except Exception as e:
-        logger.error(f"Error fetching setting {key}: {e}")
+        logger.error(f"Error fetching analytics rollups: {e}")
+        return []
+
+@recordable("db.replace_rollups")
+def replace_rollups(rollups):
+    """Replaces every analytics rollup row (a rebuild from history)."""
+    if not backend:
+        return False
+
+    try:
+        backend.replace_rollups(rollups)
+        return True
+    except Exception as e:
+        logger.error(f"Error replacing analytics rollups: {e}")
+        return False
+
+# Rows read per export page; an export holds at most one page in memory
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+
+# Values of the status filter for topics (which filters on the used flag)
+TOPIC_EXPORT_STATUSES = {"used": True, "unused": False}
+
+
+def _export_bound(value, name):
+    """An ISO date or timestamp as a UTC timestamp in the stored created_at format."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as e:
+        raise ValueError(f"Invalid {name}: {value!r} (expected an ISO date or timestamp)") from e
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+@recordable("db.export_page")
+def _export_page(table, batch_size, position, since, until, status):
+    """One keyset page of iter_export; recorded page by page, since a generator can't be."""
+    return backend.export_page(table, batch_size, position=position, since=since, until=until, status=status)
+
+
+def iter_export(table, since=None, until=None, status=None, cursor=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Streams a table's rows, oldest first, paging with a (created_at, id) keyset cursor.
+
+    Args:
+        table (str): One of EXPORT_TABLES ("posts", "topics", "activity")
+        since (str): ISO date or timestamp; only rows created at or after it
+        until (str): ISO date or timestamp; only rows created before it
+        status (str): Post status, activity type, or "used"/"unused" for topics
+        cursor (str): Resume after the row this cursor points at (see export_cursor)
+
+    Returns:
+        generator: Row dicts. Filters are checked before the first read (ValueError).
+        Unlike the readers above, storage errors are raised mid-stream: a silently
+        truncated export would look complete.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {table!r} (expected one of: {', '.join(EXPORT_TABLES)})")
+    position = decode_cursor(cursor) if cursor else None
+    since, until = _export_bound(since, "since"), _export_bound(until, "until")
+    if status is not None and table == "topics":
+        if status not in TOPIC_EXPORT_STATUSES:
+            raise ValueError("Topic status must be 'used' or 'unused'")
+        status = TOPIC_EXPORT_STATUSES[status]
+
+    def rows():
+        nonlocal position
+        if not backend:
+            return
+        while True:
+            page = _export_page(table, batch_size, position, since, until, status)
+            yield from page
+            if len(page) < batch_size:
+                return
+            position = (page[-1]["created_at"], page[-1]["id"])
+
+    return rows()
+
+
+def export_cursor(row):
+    """Cursor that resumes an export after `row`."""
+    return encode_cursor(row["created_at"], row["id"])
+
+# Settings are loaded in one query and served from memory. Writes from this process update
+# the cache immediately; changes made by other processes show up within SETTINGS_CACHE_TTL.
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", 30))
+
+# Defaults used by the typed accessors when a setting has never been saved
+SETTING_DEFAULTS = {
+    "daily_generation_enabled": True,
+}
+
+_settings_cache = None
+_settings_loaded_at = 0.0
+_settings_lock = threading.Lock()
+_settings_listeners = []
+
+
+def on_setting_change(callback):
+    """
+    Registers callback(key, old_value, new_value), called whenever a setting changes,
+    whether through update_setting() or a reload that picks up another process's write.
+    """
+    _settings_listeners.append(callback)
+
+
+def _notify_setting_change(key, old_value, new_value):
+    for callback in list(_settings_listeners):
+        try:
+            callback(key, old_value, new_value)
+        except Exception as e:
+            logger.error(f"Setting change listener failed for {key}: {e}")
+
+
+def _cached_settings():
+    """Returns the settings dict, reloading it when the TTL has expired."""
+    global _settings_cache, _settings_loaded_at
+    with _settings_lock:
+        if _settings_cache is not None and time.monotonic() - _settings_loaded_at < SETTINGS_CACHE_TTL:
+            return _settings_cache
+
+        try:
+            fresh = backend.get_all_settings()
+        except Exception as e:
+            logger.error(f"Error loading settings: {e}")
+            # Serve stale values rather than nothing; retry after another TTL
+            _settings_loaded_at = time.monotonic()
+            return _settings_cache or {}
+
+        previous, _settings_cache = _settings_cache, fresh
+        _settings_loaded_at = time.monotonic()
+
+    if previous is not None:
+        for key in set(previous) | set(fresh):
+            if previous.get(key) != fresh.get(key):
+                _notify_setting_change(key, previous.get(key), fresh.get(key))
+    return fresh
+
+
+def invalidate_settings_cache():
+    """Forces the next read to reload settings from the database."""
+    global _settings_loaded_at
+    with _settings_lock:
+        _settings_loaded_at = 0.0
+
+
+@recordable("db.get_setting")
+def get_setting(key, default=None):
+    """Fetch a configuration setting (served from the settings cache)."""
+    if not backend:
         return default
+    return _cached_settings().get(key, default)
 
+@recordable("db.update_setting")
 def update_setting(key, value):
     """Update or create a configuration setting in the database."""
-    if not supabase:
+    if not backend:
         return False
     try:
-        safe_execute(supabase.table("settings").upsert({"key": key, "value": value}))
-        return True
+        backend.update_setting(key, value)
     except Exception as e:
         logger.error(f"Error updating setting {key}: {e}")
-        return False
\ No newline at end of file
+        invalidate_settings_cache()
+        return False
+
+    with _settings_lock:
+        old_value = (_settings_cache or {}).get(key)
+        if _settings_cache is not None:
+            _settings_cache[key] = value
+    if old_value != value:
+        _notify_setting_change(key, old_value, value)
+    return True
+
+
+def _setting_default(key, default):
+    return SETTING_DEFAULTS.get(key) if default is None else default
+
+
+def get_bool_setting(key, default=None):
+    """Typed accessor: booleans may be stored as JSON booleans or as "true"/"false" strings."""
+    default = _setting_default(key, default)
+    value = get_setting(key, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "on")
+    return bool(value) if value is not None else default
+
+
+def get_int_setting(key, default=None):
+    """Typed accessor for integer settings; falls back to the default if unparseable."""
+    default = _setting_default(key, default)
+    try:
+        return int(get_setting(key, default))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,122 @@
+# memory/export.py: Streams post, topic and activity history as NDJSON or CSV for offline analysis.
+#
+# Usage:
+#   python -m memory.export posts --since 2025-01-01 --status approved > posts.ndjson
+#   python -m memory.export activity --format csv --until 2025-02-01 -o activity.csv
+#   python -m memory.export posts --cursor <cursor printed by an interrupted export>
+#
+# Rows are read in keyset pages (see db_handler.iter_export) and written as they arrive,
+# so memory use stays flat however large the table is. The dashboard serves the same
+# streams at /api/export/<table>.
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from utils.logger import get_logger
+from memory.backends.base import EXPORT_TABLES
+
+load_dotenv()
+logger = get_logger("Export")
+
+# Format -> content type
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# CSV columns per table, fixed so the header can be written before the first row arrives
+CSV_COLUMNS = {
+    "posts": [
+        "id", "topic", "content", "status", "platform", "group_id", "created_at",
+        "publish_status", "publish_attempts", "publish_error", "linkedin_post_id", "published_at",
+    ],
+    "topics": ["id", "content", "used", "created_at"],
+    "activity": ["id", "type", "message", "created_at"],
+}
+
+# Output is handed on in chunks of about this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_export(rows, table, fmt="ndjson", chunk_size=CHUNK_SIZE):
+    """
+    Formats rows as they are read.
+
+    Args:
+        rows (iterable): Row dicts, e.g. from db_handler.iter_export
+        table (str): Table the rows come from (picks the CSV columns)
+        fmt (str): "ndjson" or "csv"
+        chunk_size (int): Characters buffered before a chunk is yielded (0: one per row)
+
+    Returns:
+        generator: Text chunks
+    """
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS[table], extrasaction="ignore")
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(row):
+            buffer.write(json.dumps(row, ensure_ascii=False, default=str))
+            buffer.write("\n")
+
+    for row in rows:
+        write(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def main():
+    from memory.db_handler import export_cursor, iter_export
+
+    parser = argparse.ArgumentParser(description="Stream post, topic or activity history as NDJSON or CSV.")
+    parser.add_argument("table", choices=list(EXPORT_TABLES))
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--since", help="ISO date or timestamp (inclusive)")
+    parser.add_argument("--until", help="ISO date or timestamp (exclusive)")
+    parser.add_argument("--status", help="post status, activity type, or used/unused for topics")
+    parser.add_argument("--cursor", help="resume after the row this cursor points at")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    try:
+        rows = iter_export(args.table, since=args.since, until=args.until, status=args.status, cursor=args.cursor)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Track the last row written, so an interrupted export can be resumed; rows are
+    # handed over one at a time (the file is buffered anyway) so none is lost in a chunk
+    last = {}
+
+    def tracked():
+        for row in rows:
+            yield row
+            last["row"] = row
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for chunk in stream_export(tracked(), args.table, args.format, chunk_size=0):
+            out.write(chunk)
+    except (Exception, KeyboardInterrupt) as e:
+        resume = f" Resume with --cursor {export_cursor(last['row'])}" if last else ""
+        logger.error(f"Export of '{args.table}' stopped: {e!r}.{resume}")
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
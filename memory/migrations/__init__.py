@@ -0,0 +1,130 @@
+# memory/migrations: Versioned schema migrations for the storage backends.
+#
+# sqlite/NNNN_name.sql    Applied automatically by SQLiteBackend on first connection.
+# postgres/NNNN_name.sql  Applied to Supabase by hand (SQL editor or psql), in order.
+#
+# Usage:
+#   python -m memory.migrations --print postgres        # SQL to paste into the Supabase SQL editor
+#   python -m memory.migrations --apply data/redraft.db # migrate a SQLite file
+#
+# tests/test_query_plans.py checks that every query SQLiteBackend issues uses an index.
+
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from utils.logger import get_logger
+from memory.backends.base import topic_content_hash
+
+logger = get_logger("Migrations")
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def list_migrations(dialect):
+    """
+    Returns [(version, name, sql)] for a dialect ("sqlite" or "postgres"), in version order.
+    """
+    folder = os.path.join(MIGRATIONS_DIR, dialect)
+    migrations = []
+    for filename in sorted(os.listdir(folder)):
+        if not filename.endswith(".sql"):
+            continue
+        version, name = filename[:-4].split("_", 1)
+        with open(os.path.join(folder, filename), encoding="utf-8") as f:
+            migrations.append((int(version), name, f.read()))
+    return migrations
+
+
+def register_functions(conn):
+    """
+    Registers the SQL functions migrations rely on.
+    """
+    conn.create_function("content_hash", 1, topic_content_hash, deterministic=True)
+
+
+def apply_sqlite_migrations(conn):
+    """
+    Applies pending SQLite migrations. Each one runs in its own transaction and records
+    its version first, so concurrent processes can't apply the same migration twice.
+
+    Returns:
+        list[int]: Versions applied by this call
+    """
+    register_functions(conn)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+    newly_applied = []
+    for version, name, sql in list_migrations("sqlite"):
+        if version in applied:
+            continue
+        try:
+            conn.executescript(
+                f"BEGIN IMMEDIATE;\n"
+                f"INSERT INTO schema_migrations (version, name) VALUES ({version}, '{name}');\n"
+                f"{sql}\n"
+                f"COMMIT;"
+            )
+        except sqlite3.IntegrityError:
+            # Another process applied this version first
+            conn.execute("ROLLBACK")
+            continue
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Applied migration {version:04d}_{name}")
+        newly_applied.append(version)
+    return newly_applied
+
+
+def query_plan_problems(conn, sql, full_scan_ok=False):
+    """
+    Runs EXPLAIN QUERY PLAN for a statement (with its parameters inlined) and reports
+    any full-table scan or temporary sort. tests/test_query_plans.py runs it on every
+    statement SQLiteBackend issues.
+
+    Args:
+        full_scan_ok (bool): The statement reads the whole table (or walks it in rowid
+                             order up to a LIMIT) on purpose, so a plain SCAN is fine
+
+    Returns:
+        list: Offending plan steps (empty when the statement is indexed)
+    """
+    steps = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    # Reading back a subquery's own result (materialized or a co-routine) scans no table
+    derived = {step.split()[1] for step in steps if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    return [
+        step for step in steps
+        if (
+            step.startswith("SCAN") and "INDEX" not in step and step != "SCAN CONSTANT ROW"
+            and step.split()[1] not in derived and not full_scan_ok
+        )
+        or "TEMP B-TREE" in step
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema migrations for the storage backends.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--print", dest="dialect", choices=["sqlite", "postgres"], help="print all migrations")
+    group.add_argument("--apply", metavar="SQLITE_PATH", help="apply pending migrations to a SQLite file")
+    args = parser.parse_args()
+
+    if args.dialect:
+        for version, name, sql in list_migrations(args.dialect):
+            print(f"-- {version:04d}_{name}\n{sql}")
+        return
+
+    conn = sqlite3.connect(args.apply, isolation_level=None)
+    print(f"Applied: {apply_sqlite_migrations(conn) or 'nothing, already up to date'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from memory.migrations import main
+
+main()
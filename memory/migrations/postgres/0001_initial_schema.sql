@@ -0,0 +1,28 @@
+-- Core tables. IF NOT EXISTS so existing Supabase projects are adopted as-is.
+
+CREATE TABLE IF NOT EXISTS posts (
+    id text PRIMARY KEY,
+    topic text,
+    content text,
+    status text NOT NULL DEFAULT 'pending',
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS topics (
+    id bigserial PRIMARY KEY,
+    content text NOT NULL,
+    used boolean NOT NULL DEFAULT false,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS activity (
+    id bigserial PRIMARY KEY,
+    type text,
+    message text,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key text PRIMARY KEY,
+    value jsonb
+);
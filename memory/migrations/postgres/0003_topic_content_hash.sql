@@ -0,0 +1,14 @@
+-- Topics are identified by a hash of their content instead of matching the full text.
+-- Must match memory.backends.base.topic_content_hash (sha256 of the stripped text).
+
+ALTER TABLE topics ADD COLUMN IF NOT EXISTS content_hash text
+    GENERATED ALWAYS AS (encode(sha256(convert_to(btrim(content, E' \t\r\n'), 'UTF8')), 'hex')) STORED;
+
+-- Keep the oldest copy of duplicated topics (preferring one already marked used)
+DELETE FROM topics WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY content_hash ORDER BY used DESC, id) AS rank FROM topics
+    ) ranked WHERE rank > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_topics_content_hash ON topics (content_hash);
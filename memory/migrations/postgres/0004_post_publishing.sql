@@ -0,0 +1,12 @@
+-- LinkedIn publishing state, recorded on the post (see services/linkedin.py).
+-- publish_status: NULL (never queued), queued, publishing, published, failed
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS publish_status text;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS publish_key text;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS publish_attempts integer NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS publish_error text;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS linkedin_post_id text;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS published_at timestamptz;
+
+-- get_queued_publishes: re-queue posts left in the queue by a restart
+CREATE INDEX IF NOT EXISTS idx_posts_publish_status ON posts (publish_status) WHERE publish_status IS NOT NULL;
@@ -0,0 +1,27 @@
+-- Checkpointed editor attempts (see pipeline/editor.py): one row per draft of a run.
+-- evaluation columns stay NULL until the draft is evaluated; outcome is set on every
+-- attempt of a run when it finishes, so runs with a NULL outcome were interrupted.
+
+CREATE TABLE IF NOT EXISTS post_attempts (
+    id bigserial PRIMARY KEY,
+    run_id text NOT NULL,
+    post_id text NOT NULL,
+    topic text,
+    attempt integer NOT NULL,
+    max_retries integer NOT NULL,
+    draft text NOT NULL,
+    passed boolean,
+    scores jsonb,
+    issues jsonb,
+    rewrite_instructions text,
+    outcome text,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (run_id, attempt)
+);
+
+-- get_post_attempts
+CREATE INDEX IF NOT EXISTS idx_post_attempts_post ON post_attempts (post_id, id);
+
+-- get_interrupted_runs
+CREATE INDEX IF NOT EXISTS idx_post_attempts_open ON post_attempts (updated_at) WHERE outcome IS NULL;
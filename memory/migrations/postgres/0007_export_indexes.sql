@@ -0,0 +1,11 @@
+-- Bulk export (see memory/export.py): every exported table is paged in (created_at, id)
+-- order, optionally filtered by status (posts), used (topics) or type (activity).
+
+-- posts with a status filter use idx_posts_status_created_id
+CREATE INDEX IF NOT EXISTS idx_posts_created_id ON posts (created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_topics_created_id ON topics (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_topics_used_created_id ON topics (used, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_activity_created_id ON activity (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_activity_type_created_id ON activity (type, created_at, id);
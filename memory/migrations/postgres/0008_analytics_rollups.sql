@@ -0,0 +1,31 @@
+-- Evaluation analytics (see memory/analytics.py): running totals per UTC day, platform and
+-- metric, added to as the editor records evaluations and finishes runs. Every metric is
+-- a (total, count) pair, so averages and rates are total / count.
+
+CREATE TABLE IF NOT EXISTS analytics_rollups (
+    day date NOT NULL,
+    platform text NOT NULL,
+    metric text NOT NULL,
+    total double precision NOT NULL DEFAULT 0,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, platform, metric)
+);
+
+-- Adds a batch of increments atomically (PostgREST upserts can only overwrite)
+CREATE OR REPLACE FUNCTION add_analytics_rollups(increments jsonb) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO analytics_rollups (day, platform, metric, total, count)
+    SELECT day, platform, metric, total, count
+    FROM jsonb_to_recordset(increments) AS x(day date, platform text, metric text, total double precision, count bigint)
+    ON CONFLICT (day, platform, metric) DO UPDATE
+    SET total = analytics_rollups.total + excluded.total, count = analytics_rollups.count + excluded.count;
+$$;
+
+-- Replaces every rollup in one transaction (rebuild from history)
+CREATE OR REPLACE FUNCTION replace_analytics_rollups(rollups jsonb) RETURNS void
+LANGUAGE sql AS $$
+    DELETE FROM analytics_rollups WHERE true;
+    INSERT INTO analytics_rollups (day, platform, metric, total, count)
+    SELECT day, platform, metric, total, count
+    FROM jsonb_to_recordset(rollups) AS x(day date, platform text, metric text, total double precision, count bigint);
+$$;
@@ -0,0 +1,21 @@
+-- memory.transfer upserts rows with their ids, and an explicit id doesn't advance a
+-- bigserial sequence: the next insert would reuse an imported id. SupabaseBackend.import_rows
+-- calls this after each batch to move the table's sequence past the highest id.
+
+CREATE OR REPLACE FUNCTION sync_id_sequence(table_name text) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    max_id bigint;
+    seq text;
+BEGIN
+    IF table_name NOT IN ('topics', 'activity', 'post_attempts') THEN
+        RAISE EXCEPTION 'Table % has no id sequence', table_name;
+    END IF;
+    EXECUTE format('SELECT MAX(id) FROM %I', table_name) INTO max_id;
+    seq := pg_get_serial_sequence(table_name, 'id');
+    -- Only ever moves forward, so ids handed out while the import ran stay unique
+    IF max_id IS NOT NULL AND max_id > COALESCE(pg_sequence_last_value(seq::regclass), 0) THEN
+        PERFORM setval(seq, max_id);
+    END IF;
+END;
+$$;
@@ -0,0 +1,17 @@
+-- get_unfinished_attempts groups open attempts by run, so a run counts as interrupted
+-- only when its latest checkpoint is old; the index walks open attempts in run order.
+DROP INDEX IF EXISTS idx_post_attempts_open;
+CREATE INDEX IF NOT EXISTS idx_post_attempts_open_runs ON post_attempts (run_id, attempt, updated_at) WHERE outcome IS NULL;
+
+-- The latest attempt of every unfinished run whose last checkpoint is older than
+-- updated_before (PostgREST can't express GROUP BY ... HAVING)
+CREATE OR REPLACE FUNCTION interrupted_editor_runs(updated_before timestamptz) RETURNS SETOF post_attempts
+LANGUAGE sql STABLE AS $$
+    SELECT a.* FROM post_attempts a
+    JOIN (
+        SELECT run_id, MAX(attempt) AS attempt FROM post_attempts
+        WHERE outcome IS NULL
+        GROUP BY run_id
+        HAVING MAX(updated_at) < updated_before
+    ) latest ON a.run_id = latest.run_id AND a.attempt = latest.attempt;
+$$;
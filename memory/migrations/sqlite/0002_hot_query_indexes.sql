@@ -0,0 +1,11 @@
+-- Indexes for every hot db_handler query.
+
+-- get_pending_posts / get_pending_posts_page / get_stats: status filter, (created_at, id) keyset order
+DROP INDEX IF EXISTS idx_posts_status_created;
+CREATE INDEX IF NOT EXISTS idx_posts_status_created_id ON posts (status, created_at DESC, id DESC);
+
+-- get_unused_topics / get_stats
+CREATE INDEX IF NOT EXISTS idx_topics_used ON topics (used);
+
+-- get_activity (optionally with a since cursor)
+CREATE INDEX IF NOT EXISTS idx_activity_created ON activity (created_at DESC);
@@ -0,0 +1,15 @@
+-- Topics are identified by a hash of their content instead of matching the full text.
+-- content_hash() is registered on the connection by memory.migrations (sha256 of the stripped text).
+
+ALTER TABLE topics ADD COLUMN content_hash TEXT;
+UPDATE topics SET content_hash = content_hash(content);
+
+-- Keep the oldest copy of duplicated topics (preferring one already marked used)
+DELETE FROM topics WHERE id NOT IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY content_hash ORDER BY used DESC, id) AS rank FROM topics
+    ) WHERE rank = 1
+);
+
+DROP INDEX IF EXISTS idx_topics_content;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_topics_content_hash ON topics (content_hash);
@@ -0,0 +1,12 @@
+-- LinkedIn publishing state, recorded on the post (see services/linkedin.py).
+-- publish_status: NULL (never queued), queued, publishing, published, failed
+
+ALTER TABLE posts ADD COLUMN publish_status TEXT;
+ALTER TABLE posts ADD COLUMN publish_key TEXT;
+ALTER TABLE posts ADD COLUMN publish_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE posts ADD COLUMN publish_error TEXT;
+ALTER TABLE posts ADD COLUMN linkedin_post_id TEXT;
+ALTER TABLE posts ADD COLUMN published_at TEXT;
+
+-- get_queued_publishes: re-queue posts left in the queue by a restart
+CREATE INDEX IF NOT EXISTS idx_posts_publish_status ON posts (publish_status) WHERE publish_status IS NOT NULL;
@@ -0,0 +1,27 @@
+-- Checkpointed editor attempts (see pipeline/editor.py): one row per draft of a run.
+-- evaluation columns stay NULL until the draft is evaluated; outcome is set on every
+-- attempt of a run when it finishes, so runs with a NULL outcome were interrupted.
+
+CREATE TABLE IF NOT EXISTS post_attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    topic TEXT,
+    attempt INTEGER NOT NULL,
+    max_retries INTEGER NOT NULL,
+    draft TEXT NOT NULL,
+    passed INTEGER,
+    scores TEXT,
+    issues TEXT,
+    rewrite_instructions TEXT,
+    outcome TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (run_id, attempt)
+);
+
+-- get_post_attempts
+CREATE INDEX IF NOT EXISTS idx_post_attempts_post ON post_attempts (post_id, id);
+
+-- get_interrupted_runs
+CREATE INDEX IF NOT EXISTS idx_post_attempts_open ON post_attempts (updated_at) WHERE outcome IS NULL;
@@ -0,0 +1,11 @@
+-- Multi-platform variants (see pipeline/worker.py): every post targets one platform, and
+-- the variants generated from one topic share a group_id.
+
+ALTER TABLE posts ADD COLUMN platform TEXT NOT NULL DEFAULT 'linkedin';
+ALTER TABLE posts ADD COLUMN group_id TEXT;
+
+ALTER TABLE post_attempts ADD COLUMN platform TEXT NOT NULL DEFAULT 'linkedin';
+ALTER TABLE post_attempts ADD COLUMN group_id TEXT;
+
+-- get_post_variants
+CREATE INDEX IF NOT EXISTS idx_posts_group ON posts (group_id, created_at) WHERE group_id IS NOT NULL;
@@ -0,0 +1,12 @@
+-- Bulk export (see memory/export.py): every exported table is paged in (created_at, id)
+-- order, optionally filtered by status (posts), used (topics) or type (activity).
+-- topics.id and activity.id are rowids, so an ascending index on created_at already ends in id.
+
+-- posts with a status filter use idx_posts_status_created_id
+CREATE INDEX IF NOT EXISTS idx_posts_created_id ON posts (created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_topics_created ON topics (created_at);
+CREATE INDEX IF NOT EXISTS idx_topics_used_created ON topics (used, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_activity_created_asc ON activity (created_at);
+CREATE INDEX IF NOT EXISTS idx_activity_type_created ON activity (type, created_at);
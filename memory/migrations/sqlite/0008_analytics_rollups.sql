@@ -0,0 +1,12 @@
+-- Evaluation analytics (see memory/analytics.py): running totals per UTC day, platform and
+-- metric, added to as the editor records evaluations and finishes runs. Every metric is
+-- a (total, count) pair, so averages and rates are total / count.
+
+CREATE TABLE IF NOT EXISTS analytics_rollups (
+    day TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, platform, metric)
+);
@@ -0,0 +1,4 @@
+-- get_unfinished_attempts groups open attempts by run, so a run counts as interrupted
+-- only when its latest checkpoint is old; the index walks open attempts in run order.
+DROP INDEX IF EXISTS idx_post_attempts_open;
+CREATE INDEX IF NOT EXISTS idx_post_attempts_open_runs ON post_attempts (run_id, attempt, updated_at) WHERE outcome IS NULL;
@@ -0,0 +1,73 @@
+# memory/post_events.py: In-process notifications for post status changes.
+# Lets request handlers block until a background job (e.g. a rewrite) updates a post,
+# instead of polling the database.
+
+import threading
+from collections import OrderedDict
+
+# Remember the latest update for this many posts
+MAX_TRACKED_POSTS = 1000
+
+_condition = threading.Condition()
+_sequence = 0
+_updates = OrderedDict()  # post_id -> (sequence, status)
+
+
+def current_sequence():
+    """
+    Returns the global update sequence number. Take it *before* reading a post from the
+    database and pass it to wait_for_post_update() so no update can slip in between.
+    """
+    with _condition:
+        return _sequence
+
+
+def publish_post_update(post_id, status):
+    """
+    Records a status change for a post and wakes any waiters.
+    """
+    global _sequence
+    with _condition:
+        _sequence += 1
+        _updates[post_id] = (_sequence, status)
+        _updates.move_to_end(post_id)
+        while len(_updates) > MAX_TRACKED_POSTS:
+            _updates.popitem(last=False)
+        _condition.notify_all()
+
+
+def wait_for_post_update(post_id, predicate, after_sequence, timeout):
+    """
+    Blocks until the post is updated after `after_sequence` with a status matching predicate.
+
+    Args:
+        post_id (str): Post to watch
+        predicate (callable): status -> bool
+        after_sequence (int): Value from current_sequence() taken before the caller's last read
+        timeout (float): Maximum seconds to wait
+
+    Returns:
+        str | None: The matching status, or None on timeout
+    """
+    return wait_for_posts_update([post_id], predicate, after_sequence, timeout).get(post_id)
+
+
+def wait_for_posts_update(post_ids, predicate, after_sequence, timeout):
+    """
+    Blocks until any of the posts is updated after `after_sequence` with a matching status,
+    so one request can watch a whole batch (see wait_for_post_update).
+
+    Returns:
+        dict: post_id -> matching status for every post that matched (empty on timeout)
+    """
+    def matching():
+        matched = {}
+        for post_id in post_ids:
+            update = _updates.get(post_id)
+            if update and update[0] > after_sequence and predicate(update[1]):
+                matched[post_id] = update[1]
+        return matched
+
+    with _condition:
+        _condition.wait_for(lambda: bool(matching()), timeout=timeout)
+        return matching()
@@ -0,0 +1,464 @@
+# memory/search.py: Local full-text search over post history (SQLite FTS5).
+#
+# Usage:
+#   python -m memory.search "hiring #ai"     # ranked matches
+#   python -m memory.search --rebuild        # rebuild the index from the posts table
+#
+# The index is derived data in its own SQLite file: next to the posts database
+# (data/redraft-search.db), or SEARCH_INDEX_PATH when posts live in Supabase. db_handler updates it on every add_post and
+# status update, so searches never touch the posts table. Posts written by other processes
+# (e.g. the cron pipeline against Supabase) are picked up by a catch-up pass the first time
+# the index is used; `--rebuild` also refreshes their statuses.
+#
+# Query syntax: words match anywhere (the last one as a prefix, for search-as-you-type),
+# "quoted phrases" match exactly and #tags match hashtags.
+
+import argparse
+import html
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from utils.logger import get_logger
+
+load_dotenv()
+logger = get_logger("Search")
+
+SEARCH_ENABLED = os.getenv("SEARCH_ENABLED", "True").lower() == "true"
+# Index file (defaults to one next to the SQLite database, or this path with Supabase)
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "data/search.db")
+# Most results one search returns
+SEARCH_MAX_RESULTS = 50
+
+# Column weights for ranking (bm25): topic, content, hashtags
+_WEIGHTS = (2.0, 1.0, 3.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    rowid INTEGER PRIMARY KEY,
+    post_id TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    hashtags TEXT NOT NULL DEFAULT '',
+    status TEXT,
+    platform TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_status ON search_docs (status);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS post_search USING fts5(
+    topic, content, hashtags, content = 'search_docs', content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+    INSERT INTO post_search (rowid, topic, content, hashtags) VALUES (new.rowid, new.topic, new.content, new.hashtags);
+END;
+CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+    INSERT INTO post_search (post_search, rowid, topic, content, hashtags)
+    VALUES ('delete', old.rowid, old.topic, old.content, old.hashtags);
+END;
+CREATE TRIGGER IF NOT EXISTS search_docs_au AFTER UPDATE OF topic, content, hashtags ON search_docs BEGIN
+    INSERT INTO post_search (post_search, rowid, topic, content, hashtags)
+    VALUES ('delete', old.rowid, old.topic, old.content, old.hashtags);
+    INSERT INTO post_search (rowid, topic, content, hashtags) VALUES (new.rowid, new.topic, new.content, new.hashtags);
+END;
+
+CREATE TABLE IF NOT EXISTS search_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_UPSERT_DOC = (
+    "INSERT INTO search_docs (post_id, topic, content, hashtags, status, platform, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(post_id) DO UPDATE SET topic = excluded.topic, content = excluded.content, "
+    "hashtags = excluded.hashtags, status = excluded.status, platform = excluded.platform"
+)
+
+_HASHTAG = re.compile(r"#(\w+)")
+_QUERY_TOKEN = re.compile(r'"[^"]*"?|\S+')
+_WORD = re.compile(r"\w+")
+# Shortest last word searched as a prefix (shorter prefixes match too many terms to rank quickly)
+MIN_PREFIX_LENGTH = 3
+# Words of post content shown around the first match
+SNIPPET_WORDS = 16
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _fold(text):
+    """Lowercased, without diacritics, like the index tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def parse_query(query):
+    """
+    Splits a user query into terms: (kind, text, prefix) with kind "word", "phrase" or "tag".
+    The last word may still be being typed, so it is a prefix once it is long enough.
+    """
+    terms = []
+    tokens = _QUERY_TOKEN.findall(query or "")
+    for i, token in enumerate(tokens):
+        if token.startswith('"'):
+            phrase = " ".join(_WORD.findall(token))
+            if phrase:
+                terms.append(("phrase", phrase, False))
+        elif token.startswith("#"):
+            tag = " ".join(_WORD.findall(token))
+            if tag:
+                terms.append(("tag", tag, False))
+        else:
+            word = " ".join(_WORD.findall(token))
+            if word:
+                prefix = i == len(tokens) - 1 and len(word) >= MIN_PREFIX_LENGTH and " " not in word
+                terms.append(("word", word, prefix))
+    return terms
+
+
+def build_match(terms):
+    """
+    An FTS5 MATCH expression for parsed terms, or None if there are none. Every term is
+    quoted, so FTS5 operators in the input are matched as plain words.
+    """
+    parts = []
+    for kind, text, prefix in terms:
+        quoted = f'"{text}"' + ("*" if prefix else "")
+        parts.append(f"hashtags : {quoted}" if kind == "tag" else quoted)
+    return " ".join(parts) or None
+
+
+def make_snippet(content, terms):
+    """
+    HTML excerpt of `content` around the first matched word, with <mark> around matches.
+    Built here for the returned rows only: FTS5's snippet() costs a pass over every match.
+    """
+    exact, prefixes = set(), []
+    for kind, text, prefix in terms:
+        for word in _fold(text).split():
+            if prefix:
+                prefixes.append(word)
+            else:
+                exact.add(word)
+
+    def matches(word):
+        return any(w in exact or w.startswith(tuple(prefixes)) for w in _WORD.findall(_fold(word)))
+
+    content = content or ""
+    # Find the first match with one regex pass; the word-by-word scan (which also folds
+    # diacritics, e.g. "cafe" in "Café") only runs when that finds nothing
+    pattern = "|".join([re.escape(w) + r"\b" for w in exact] + [re.escape(p) for p in prefixes])
+    hit = re.search(rf"\b(?:{pattern})", content, re.IGNORECASE) if pattern else None
+    words = content.split()
+    if hit:
+        first = len(content[:hit.start()].split())
+        if content[:hit.start()] and not content[hit.start() - 1].isspace():
+            first -= 1
+    else:
+        first = next((i for i, word in enumerate(words) if matches(word)), 0)
+
+    start = max(0, first - SNIPPET_WORDS // 3)
+    end = min(len(words), start + SNIPPET_WORDS)
+    shown = [f"<mark>{html.escape(w)}</mark>" if matches(w) else html.escape(w) for w in words[start:end]]
+    return ("… " if start else "") + " ".join(shown) + (" …" if end < len(words) else "")
+
+
+class SearchIndex:
+    """
+    FTS5 index of posts (topic, content and hashtags), with each post's status and platform.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conn()  # create the schema eagerly
+
+    def _conn(self):
+        """One connection per thread, like SQLiteBackend."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _doc(post, created_at):
+        content = post.get("content") or ""
+        return (
+            post["id"], post.get("topic") or "", content, " ".join(_HASHTAG.findall(content)),
+            post.get("status"), post.get("platform") or "linkedin", post.get("created_at") or created_at,
+        )
+
+    def index_posts(self, posts):
+        """Adds or replaces posts (dicts with id, topic, content, status and optionally platform, created_at)."""
+        created_at = _now()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_UPSERT_DOC, [self._doc(post, created_at) for post in posts])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_status(self, post_ids, status, content=None):
+        """
+        Sets the status (and optionally the content) of indexed posts.
+
+        Returns:
+            list: The ids that are not in the index
+        """
+        conn = self._conn()
+        missing = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for post_id in post_ids:
+                if content is None:
+                    cursor = conn.execute("UPDATE search_docs SET status = ? WHERE post_id = ?", (status, post_id))
+                else:
+                    cursor = conn.execute(
+                        "UPDATE search_docs SET status = ?, content = ?, hashtags = ? WHERE post_id = ?",
+                        (status, content, " ".join(_HASHTAG.findall(content)), post_id)
+                    )
+                if cursor.rowcount == 0:
+                    missing.append(post_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return missing
+
+    def search(self, query, status=None, platform=None, limit=20):
+        """
+        Ranked matches, best first.
+
+        Returns:
+            list: dicts with id, topic, status, platform, created_at, snippet (HTML with
+                  <mark> around matches) and score (higher is better)
+        """
+        terms = parse_query(query)
+        match = build_match(terms)
+        if not match:
+            return []
+        # Rank on the index alone; row details are read for the top results only
+        sql = f"SELECT post_search.rowid, bm25(post_search, {', '.join(map(str, _WEIGHTS))}) AS rank FROM post_search"
+        params = [match]
+        if status or platform:
+            sql += " JOIN search_docs d ON d.rowid = post_search.rowid WHERE post_search MATCH ?"
+            if status:
+                sql += " AND d.status = ?"
+                params.append(status)
+            if platform:
+                sql += " AND d.platform = ?"
+                params.append(platform)
+        else:
+            sql += " WHERE post_search MATCH ?"
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(min(limit, SEARCH_MAX_RESULTS))
+
+        conn = self._conn()
+        ranked = conn.execute(sql, params).fetchall()
+        if not ranked:
+            return []
+        docs = {
+            row["rowid"]: row for row in conn.execute(
+                "SELECT rowid, post_id, topic, content, status, platform, created_at FROM search_docs "
+                f"WHERE rowid IN ({', '.join('?' for _ in ranked)})", [row["rowid"] for row in ranked]
+            )
+        }
+        return [
+            {
+                "id": doc["post_id"], "topic": doc["topic"], "status": doc["status"],
+                "platform": doc["platform"], "created_at": doc["created_at"],
+                "snippet": make_snippet(doc["content"], terms), "score": round(-row["rank"], 4),
+            }
+            for row in ranked if (doc := docs.get(row["rowid"])) is not None
+        ]
+
+    def get_meta(self, key):
+        row = self._conn().execute("SELECT value FROM search_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key, value):
+        self._conn().execute(
+            "INSERT INTO search_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value)
+        )
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM search_docs")
+        conn.execute("INSERT INTO post_search (post_search) VALUES ('rebuild')")
+        conn.execute("DELETE FROM search_meta")
+
+
+#-------------------------------
+# Module-level index, used by db_handler and /api/search
+#-------------------------------
+_index = None
+_index_lock = threading.Lock()
+# Syncs and rebuilds run one at a time (a clear under a running sync would lose posts)
+_sync_lock = threading.Lock()
+
+# Posts created up to this time have been read from the posts table (see sync)
+SYNCED_THROUGH = "synced_through"
+
+
+def _index_path():
+    from memory.db_handler import backend
+    path = getattr(backend, "path", None)
+    if os.getenv("SEARCH_INDEX_PATH") or not path or path == ":memory:":
+        return SEARCH_INDEX_PATH
+    # Own file, so index writes never wait on the posts database's write lock
+    return f"{os.path.splitext(path)[0]}-search.db"
+
+
+def get_index():
+    """The process-wide index (None when search is disabled or unavailable)."""
+    global _index
+    if _index is not None or not SEARCH_ENABLED:
+        return _index
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = SearchIndex(_index_path())
+            except Exception as e:
+                logger.error(f"Search index unavailable: {e}")
+                return None
+            # Pick up posts written while this process wasn't running, without delaying the caller
+            threading.Thread(target=sync, name="search-sync", daemon=True).start()
+    return _index
+
+
+def sync(batch_size=500):
+    """
+    Indexes posts created since the last sync (all of them the first time).
+
+    Returns:
+        int: Number of posts read
+    """
+    index = get_index()
+    if index is None:
+        return 0
+    with _sync_lock:
+        return _sync(index, batch_size)
+
+
+def rebuild():
+    """Drops the index and rebuilds it from the posts table. Returns the number of posts indexed."""
+    index = get_index()
+    if index is None:
+        return 0
+    with _sync_lock:
+        index.clear()
+        return _sync(index)
+
+
+def _sync(index, batch_size=500):
+    from memory.db_handler import iter_export
+
+    since = index.get_meta(SYNCED_THROUGH)
+    count = 0
+    batch = []
+    try:
+        for post in iter_export("posts", since=since, batch_size=batch_size):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                index.index_posts(batch)
+                index.set_meta(SYNCED_THROUGH, batch[-1]["created_at"])
+                count += len(batch)
+                batch = []
+        if batch:
+            index.index_posts(batch)
+            index.set_meta(SYNCED_THROUGH, batch[-1]["created_at"])
+            count += len(batch)
+    except Exception as e:
+        logger.error(f"Search index sync failed after {count} posts: {e}")
+    if count:
+        logger.info(f"Search index caught up on {count} posts.")
+    return count
+
+
+def index_posts(posts):
+    """Adds or replaces posts in the index. Errors are logged; the posts table stays the source of truth."""
+    index = get_index()
+    if index is None:
+        return
+    try:
+        index.index_posts(posts)
+    except Exception as e:
+        logger.error(f"Error indexing {len(posts)} posts: {e}")
+
+
+def update_status(post_ids, status, content=None):
+    """Mirrors a status (and content) change into the index; posts it hasn't seen are fetched and added."""
+    index = get_index()
+    if index is None:
+        return
+    try:
+        missing = index.update_status(post_ids, status, content)
+        if missing:
+            from memory.db_handler import get_post
+            posts = [post for post in map(get_post, missing) if post]
+            if posts:
+                index.index_posts(posts)
+    except Exception as e:
+        logger.error(f"Error updating {len(post_ids)} posts in the search index: {e}")
+
+
+def search_posts(query, status=None, platform=None, limit=20):
+    """
+    Ranked full-text matches over post topics, content and hashtags.
+
+    Returns:
+        list: see SearchIndex.search ([] when search is unavailable)
+    """
+    index = get_index()
+    if index is None:
+        return []
+    try:
+        return index.search(query, status=status, platform=platform, limit=limit)
+    except sqlite3.OperationalError as e:
+        # e.g. a query FTS5 can't parse
+        logger.warning(f"Search failed for {query!r}: {e}")
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over post history.")
+    parser.add_argument("query", nargs="?", help="words, \"phrases\" and #hashtags")
+    parser.add_argument("--status", help="only posts with this status")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from the posts table")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"Indexed {rebuild()} posts.")
+    if args.query:
+        started = time.perf_counter()
+        results = search_posts(args.query, status=args.status, limit=args.limit)
+        took = (time.perf_counter() - started) * 1000
+        for result in results:
+            snippet = re.sub(r"</?mark>", "*", html.unescape(result["snippet"]))
+            print(f"{result['score']:8.3f}  {result['id']}  [{result['status']}]  {result['topic']}\n          {snippet}")
+        print(f"{len(results)} results in {took:.1f} ms")
+    elif not args.rebuild:
+        parser.error("give a query or --rebuild")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# memory/transfer.py: Copies data between storage backends (e.g. Supabase -> local SQLite).
+#
+# Usage:
+#   python -m memory.transfer --from supabase --to sqlite
+#   python -m memory.transfer --from sqlite --to supabase --tables posts,topics
+#
+# Rows are streamed in batches and upserted, so the copy can be re-run safely.
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from utils.logger import get_logger
+from memory.backends import create_backend
+from memory.backends.base import TABLES
+
+load_dotenv()
+logger = get_logger("Storage Transfer")
+
+
+def transfer(source, target, tables=None, batch_size=500):
+    """
+    Copies tables from one backend to another.
+
+    Args:
+        source (StorageBackend): Backend to read from
+        target (StorageBackend): Backend to upsert into
+        tables (list): Table names (defaults to all of TABLES)
+        batch_size (int): Rows per read/write batch
+
+    Returns:
+        dict: table -> number of rows copied
+    """
+    copied = {}
+    for table in tables or list(TABLES):
+        count = 0
+        batch = []
+        for row in source.export_rows(table, batch_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                target.import_rows(table, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            target.import_rows(table, batch)
+            count += len(batch)
+
+        copied[table] = count
+        logger.info(f"Copied {count} rows of '{table}' from {source.name} to {target.name}")
+    return copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy data between storage backends.")
+    parser.add_argument("--from", dest="source", required=True, choices=["supabase", "sqlite"])
+    parser.add_argument("--to", dest="target", required=True, choices=["supabase", "sqlite"])
+    parser.add_argument("--tables", help="Comma-separated subset of: " + ", ".join(TABLES))
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("--from and --to must differ")
+
+    tables = args.tables.split(",") if args.tables else None
+    copied = transfer(create_backend(args.source), create_backend(args.target), tables, args.batch_size)
+    print(", ".join(f"{table}: {count}" for table, count in copied.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# notifier/fake_telegram.py: Local stand-in for the Telegram Bot API, for testing the webhook locally.
+#
+# Usage:
+#   python -m notifier.fake_telegram --port 8098
+#   TELEGRAM_API_BASE=http://127.0.0.1:8098/bot TELEGRAM_WEBHOOK_SECRET=test python app/main.py
+#   TELEGRAM_WEBHOOK_SECRET=test python -m notifier.telegram press approve <post_id>
+#
+# POST /bot<token>/<method>   Answers the Bot API methods the app uses (getMe, sendMessage,
+#                             answerCallbackQuery, editMessageText, setWebhook, deleteWebhook,
+#                             getUpdates - which never has updates, so polling just idles)
+# GET  /calls                 Lists the calls received (for assertions)
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Redraft", "username": "redraft_test_bot"}
+
+
+class FakeTelegramState:
+    """Calls received by every request handler."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+
+def _result(method, params):
+    if method == "getMe":
+        return BOT_USER
+    if method == "getUpdates":
+        # Long poll that never has anything, held briefly so pollers don't spin
+        time.sleep(min(float(params.get("timeout") or 0), 1.0))
+        return []
+    if method in ("sendMessage", "editMessageText"):
+        chat_id = params.get("chat_id") or 1
+        return {
+            "message_id": int(params.get("message_id") or 1),
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id), "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+    return True
+
+
+def _make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") != "/calls":
+                return self._reply(404, {"ok": False, "description": "Not Found"})
+            with state.lock:
+                self._reply(200, {"calls": list(state.calls)})
+
+        def do_POST(self):
+            parts = self.path.strip("/").split("/")
+            if len(parts) != 2 or not parts[0].startswith("bot"):
+                return self._reply(404, {"ok": False, "description": "Not Found"})
+            method = parts[1]
+
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                params = json.loads(body or "{}")
+            else:
+                from urllib.parse import parse_qsl
+                params = dict(parse_qsl(body))
+
+            with state.lock:
+                state.calls.append({"method": method, "params": params})
+            self._reply(200, {"ok": True, "result": _result(method, params)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(port=0):
+    """
+    Starts the fake Bot API on a background thread.
+
+    Returns:
+        tuple: (server, api_base, state); api_base is the value for TELEGRAM_API_BASE.
+               Call server.shutdown() to stop.
+    """
+    state = FakeTelegramState()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/bot", state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API for local testing.")
+    parser.add_argument("--port", type=int, default=8098)
+    args = parser.parse_args()
+
+    server, api_base, _ = start_fake_server(args.port)
+    print(f"Fake Telegram Bot API listening; set TELEGRAM_API_BASE={api_base}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
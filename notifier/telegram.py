@@ -9,7 +9,13 @@ from llms.gemini_evaluator import evaluate_post
 import asyncio
 
 from dotenv import load_dotenv
+from collections import OrderedDict
+import argparse
+import hmac
+import json
 import os
+import sys
+import threading
 import uuid
 
 load_dotenv()
@@ -21,6 +27,16 @@ TELEGRAM_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 if not TELEGRAM_TOKEN:
     raise ValueError("Set TELEGRAM_BOT_TOKEN environment variable")
 
+# Bot API endpoint; point it at notifier/fake_telegram.py to test locally
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org/bot")
+# Webhook mode: Telegram POSTs updates to /telegram/webhook on the Flask app. The route
+# is enabled only when a secret is set; Telegram echoes it in X-Telegram-Bot-Api-Secret-Token.
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+# Public HTTPS URL of the route, registered with `python -m notifier.telegram set-webhook`
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+# Append every webhook update received to this JSONL file, for replaying locally
+TELEGRAM_UPDATE_LOG = os.getenv("TELEGRAM_UPDATE_LOG")
+
 # Store pending posts in memory (topic -> post draft)
 pending_posts = {}
 # Mapping for short callback IDs (id -> topic)
@@ -42,7 +58,7 @@ def get_bot():
             connect_timeout=10, 
             read_timeout=10
         )
-        _shared_bot = Bot(token=TELEGRAM_TOKEN, request=request)
+        _shared_bot = Bot(token=TELEGRAM_TOKEN, request=request, base_url=TELEGRAM_API_BASE)
     return _shared_bot
 
 
@@ -100,23 +116,35 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     data = query.data.split("|")
     action, callback_id = data[0], data[1]
 
+    from memory.db_handler import get_post, update_post_status, log_activity
+
     topic = topic_id_map.get(callback_id)
+    draft_post = pending_posts.get(topic, None) if topic else None
+    if not draft_post:
+        # The draft may have been sent by another process (e.g. another gunicorn worker
+        # when updates arrive by webhook); fall back to the stored post
+        post = await asyncio.to_thread(get_post, callback_id)
+        if post and post.get("status") == "pending":
+            topic, draft_post = topic or post["topic"], post["content"]
+
     if not topic:
         await query.edit_message_text(text="Error: topic mapping expired.")
         return
-
-    draft_post = pending_posts.get(topic, None)
     if not draft_post:
         await query.edit_message_text(text="Error: draft not found.")
         return
 
-    from memory.db_handler import update_post_status, log_activity
     if action == "approve":
-        # Placeholder: call LinkedIn API here
-        await query.edit_message_text(text="✅ Approved and posted to LinkedIn!")
-        logger.info(f"Post for topic '{topic}' approved and sent to LinkedIn.")
+        from services.linkedin import enqueue_publish
         update_post_status(callback_id, "approved")
         log_activity("success", f"Post '{topic}' approved via Telegram.")
+        # Published in the background so the callback answers immediately
+        if enqueue_publish(callback_id):
+            await query.edit_message_text(text="✅ Approved and queued for LinkedIn!")
+            logger.info(f"Post for topic '{topic}' approved and queued for LinkedIn.")
+        else:
+            await query.edit_message_text(text="✅ Approved!")
+            logger.info(f"Post for topic '{topic}' approved (not queued for LinkedIn).")
         pending_posts.pop(topic, None)
         topic_id_map.pop(callback_id, None)
 
@@ -131,11 +159,12 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Trigger rewrite loop in background using a fresh event loop
         import threading
         def run_rewrite():
-            from pipeline.editor import run_evaluation_flow
+            # Attaches to a rewrite of the same post already running (e.g. dismissed on the dashboard)
+            from pipeline.editor import run_redraft
             new_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(new_loop)
             try:
-                new_loop.run_until_complete(run_evaluation_flow(draft_post, topic, post_id=callback_id, force_rewrite=True))
+                new_loop.run_until_complete(run_redraft(draft_post, topic, callback_id))
             except Exception as e:
                 logger.error(f"Telegram rewrite failed: {e}")
             finally:
@@ -149,12 +178,191 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # Initialize bot
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-bot_app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+bot_app = ApplicationBuilder().token(TELEGRAM_TOKEN).base_url(TELEGRAM_API_BASE).build()
 bot_app.add_handler(CallbackQueryHandler(button_callback))
 
 
 async def start_bot():
-    logger.info("Starting Telegram bot...")
+    """
+    Long-polling mode: fetches updates in a loop until cancelled. The fallback when
+    the app isn't reachable from Telegram; a registered webhook is removed first,
+    since Telegram refuses getUpdates while one is set.
+    """
+    logger.info("Starting Telegram bot (polling)...")
+    await bot_app.initialize()
+    await bot_app.bot.delete_webhook()
     await bot_app.start()
-    await bot_app.updater.start_polling()
-    await bot_app.updater.idle()
+    await bot_app.updater.start_polling(allowed_updates=["callback_query"])
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await bot_app.updater.stop()
+        await bot_app.stop()
+        await bot_app.shutdown()
+
+
+#-------------------------------
+# Webhook mode
+#-------------------------------
+# Telegram redelivers an update until the webhook answers 200; remember recent ids
+RECENT_UPDATES = 1000
+
+_dispatch_loop = None
+_dispatch_thread = None
+_dispatch_lock = threading.Lock()
+_initialized = None
+_recent_updates = OrderedDict()
+
+
+def webhook_enabled():
+    """True when the webhook route should accept updates."""
+    return bool(TELEGRAM_WEBHOOK_SECRET)
+
+
+def verify_webhook_secret(token):
+    """Constant-time check of the X-Telegram-Bot-Api-Secret-Token header."""
+    return webhook_enabled() and token is not None and hmac.compare_digest(token, TELEGRAM_WEBHOOK_SECRET)
+
+
+def _ensure_dispatcher():
+    """Starts the thread whose event loop runs every webhook update, once per process."""
+    global _dispatch_loop, _dispatch_thread
+    with _dispatch_lock:
+        if _dispatch_thread and _dispatch_thread.is_alive():
+            return
+        ready = threading.Event()
+
+        def run():
+            global _dispatch_loop
+            _dispatch_loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(_dispatch_loop)
+            _dispatch_loop.call_soon(ready.set)
+            try:
+                _dispatch_loop.run_forever()
+            finally:
+                _dispatch_loop.close()
+
+        _dispatch_thread = threading.Thread(target=run, name="telegram-webhook", daemon=True)
+        _dispatch_thread.start()
+        ready.wait()
+
+
+async def _process(data):
+    global _initialized
+    # Initialized lazily (it calls getMe), and retried if Telegram was unreachable
+    if _initialized is None:
+        _initialized = asyncio.ensure_future(bot_app.initialize())
+    try:
+        await _initialized
+    except Exception:
+        _initialized = None
+        raise
+    await bot_app.process_update(Update.de_json(data, bot_app.bot))
+
+
+def dispatch_update(data):
+    """
+    Hands one webhook update to the bot's handlers on the shared dispatcher loop and
+    returns without waiting for them. Redelivered updates are ignored.
+
+    Args:
+        data (dict): The update JSON as posted by Telegram
+
+    Returns:
+        bool: True if the update was dispatched, False if it was a duplicate
+    """
+    update_id = data.get("update_id")
+    with _dispatch_lock:
+        if update_id in _recent_updates:
+            return False
+        _recent_updates[update_id] = True
+        while len(_recent_updates) > RECENT_UPDATES:
+            _recent_updates.popitem(last=False)
+
+    if TELEGRAM_UPDATE_LOG:
+        with open(TELEGRAM_UPDATE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data) + "\n")
+
+    _ensure_dispatcher()
+    future = asyncio.run_coroutine_threadsafe(_process(data), _dispatch_loop)
+
+    def report(done):
+        if done.exception():
+            logger.error(f"Telegram update {update_id} failed: {done.exception()}")
+    future.add_done_callback(report)
+    return True
+
+
+#-------------------------------
+# CLI
+#-------------------------------
+def _post_updates(url, updates):
+    import httpx
+    headers = {"X-Telegram-Bot-Api-Secret-Token": TELEGRAM_WEBHOOK_SECRET or ""}
+    for update in updates:
+        response = httpx.post(url, json=update, headers=headers, timeout=10)
+        print(f"update {update.get('update_id')}: {response.status_code} {response.text.strip()}")
+
+
+def callback_update(action, post_id, update_id=None):
+    """A callback_query update like the one Telegram sends when a review button is pressed."""
+    chat_id = int(TELEGRAM_CHAT_ID or 1)
+    user = {"id": chat_id, "is_bot": False, "first_name": "Reviewer"}
+    return {
+        "update_id": update_id or uuid.uuid4().int % 2**31,
+        "callback_query": {
+            "id": uuid.uuid4().hex[:16],
+            "from": user,
+            "chat_instance": "local",
+            "data": f"{action}|{post_id}",
+            "message": {
+                "message_id": 1, "date": 0, "text": "Draft Post",
+                "chat": {"id": chat_id, "type": "private"}, "from": {**user, "is_bot": True},
+            },
+        },
+    }
+
+
+async def _set_webhook():
+    await bot_app.bot.set_webhook(
+        TELEGRAM_WEBHOOK_URL, secret_token=TELEGRAM_WEBHOOK_SECRET, allowed_updates=["callback_query"]
+    )
+    print(f"Webhook set to {TELEGRAM_WEBHOOK_URL}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram review bot: polling, webhook setup and local replay.")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("poll", help="run the bot in long-polling mode (default)")
+    commands.add_parser("set-webhook", help="register TELEGRAM_WEBHOOK_URL with Telegram")
+    commands.add_parser("delete-webhook", help="unregister the webhook")
+    replay = commands.add_parser("replay", help="POST recorded updates (JSONL) to a webhook")
+    replay.add_argument("path")
+    replay.add_argument("--url", default="http://127.0.0.1:5000/telegram/webhook")
+    press = commands.add_parser("press", help="POST a simulated button press to a webhook")
+    press.add_argument("action", choices=["approve", "reject"])
+    press.add_argument("post_id")
+    press.add_argument("--url", default="http://127.0.0.1:5000/telegram/webhook")
+    args = parser.parse_args()
+
+    if args.command == "set-webhook":
+        if not (TELEGRAM_WEBHOOK_URL and TELEGRAM_WEBHOOK_SECRET):
+            sys.exit("Set TELEGRAM_WEBHOOK_URL and TELEGRAM_WEBHOOK_SECRET first.")
+        asyncio.run(_set_webhook())
+    elif args.command == "delete-webhook":
+        asyncio.run(bot_app.bot.delete_webhook())
+        print("Webhook deleted; use polling.")
+    elif args.command == "replay":
+        with open(args.path, encoding="utf-8") as f:
+            _post_updates(args.url, [json.loads(line) for line in f if line.strip()])
+    elif args.command == "press":
+        _post_updates(args.url, [callback_update(args.action, args.post_id)])
+    else:
+        try:
+            asyncio.run(start_bot())
+        except KeyboardInterrupt:
+            logger.info("Telegram bot stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# pipeline/budget.py: Decides how many rewrites a draft gets, from its evaluator score trajectory.
+#
+# Instead of a fixed number of rewrites, each run starts from a base budget (learned from
+# stored attempt history, see learned_default_budget) and then:
+#   - stops early once a rewrite improves the average score by less than REWRITE_MIN_IMPROVEMENT
+#     (unless the draft is close to passing),
+#   - allows one extra rewrite past the budget when the draft is within REWRITE_NEAR_PASS_MARGIN
+#     points of passing.
+
+import math
+import os
+import threading
+import time
+
+from utils.logger import get_logger
+from utils.metrics import increment
+
+logger = get_logger("Rewrite Budget")
+
+# Pass conditions from the evaluator prompt (llms/prompts.py)
+PASS_AVERAGE = 7.0
+PASS_MINIMUM = 6
+
+DEFAULT_REWRITE_BUDGET = int(os.getenv("DEFAULT_REWRITE_BUDGET", 2))
+# Hard cap on a learned budget
+MAX_REWRITE_BUDGET = int(os.getenv("MAX_REWRITE_BUDGET", 4))
+# Average-score gain per rewrite below which a run is considered stalled
+REWRITE_MIN_IMPROVEMENT = float(os.getenv("REWRITE_MIN_IMPROVEMENT", 0.25))
+# Distance from passing (in score points) that earns one extra rewrite
+REWRITE_NEAR_PASS_MARGIN = float(os.getenv("REWRITE_NEAR_PASS_MARGIN", 0.5))
+
+# Budget learning: the smallest budget within which this share of runs passed (or would have)
+BUDGET_LEARNING_QUANTILE = 0.9
+# Passed or exhausted runs needed before the learned budget replaces the default
+BUDGET_LEARNING_MIN_RUNS = 20
+# Attempts read from history, and how long the learned value is reused (seconds)
+BUDGET_LEARNING_WINDOW = 2000
+BUDGET_LEARNING_TTL = 3600
+
+
+def average_score(scores):
+    """Mean of the numeric category scores, or None if there are none."""
+    values = [v for v in (scores or {}).values() if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    return sum(values) / len(values) if values else None
+
+
+def pass_gap(scores):
+    """
+    Score points still missing to pass: the larger of the average shortfall and the
+    worst category's shortfall. 0 when the scores meet both pass conditions.
+    """
+    values = [v for v in (scores or {}).values() if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if not values:
+        return math.inf
+    return max(0.0, PASS_AVERAGE - sum(values) / len(values), PASS_MINIMUM - min(values))
+
+
+class RewriteBudget:
+    """
+    Tracks the scores of one editor run and decides whether another rewrite is worth it.
+    Record each evaluation's scores (in attempt order), then call next_rewrite().
+    """
+
+    def __init__(self, budget, min_improvement=REWRITE_MIN_IMPROVEMENT, near_pass_margin=REWRITE_NEAR_PASS_MARGIN):
+        self.budget = budget
+        self.min_improvement = min_improvement
+        self.near_pass_margin = near_pass_margin
+        self.history = []
+
+    def record(self, scores):
+        self.history.append(scores or {})
+
+    def next_rewrite(self):
+        """
+        Decides after a failed evaluation.
+
+        Returns:
+            tuple: (rewrite: bool, reason: str); reason is "budget", "near_pass", "stalled" or "exhausted"
+        """
+        rewrites_done = len(self.history) - 1
+        near_pass = pass_gap(self.history[-1]) <= self.near_pass_margin
+
+        if rewrites_done >= 1 and not near_pass:
+            previous, current = average_score(self.history[-2]), average_score(self.history[-1])
+            if previous is not None and current is not None and current - previous < self.min_improvement:
+                increment("budget.stopped_early")
+                return False, "stalled"
+
+        if rewrites_done < self.budget:
+            return True, "budget"
+        if near_pass and rewrites_done < self.budget + 1:
+            increment("budget.extended")
+            return True, "near_pass"
+        return False, "exhausted"
+
+
+#-------------------------------
+# Learned default budget
+#-------------------------------
+_learned = {"value": None, "at": 0.0}
+_learned_lock = threading.Lock()
+
+
+def budget_from_history(attempts):
+    """
+    Smallest budget within which BUDGET_LEARNING_QUANTILE of runs passed.
+
+    A run that passed needed the rewrites it made. A run that ran out of budget
+    ("exhausted") is a censored sample: it needed at least one rewrite more than it got,
+    so runs that keep hitting the budget push the learned value up (one step per
+    learning cycle, up to MAX_REWRITE_BUDGET) instead of being ignored. Stalled runs
+    are left out: they stopped for lack of improvement, which more budget doesn't fix.
+
+    Args:
+        attempts (list): post_attempts rows (run_id, attempt, outcome)
+
+    Returns:
+        int or None: None when there are too few passed or exhausted runs to tell
+    """
+    rewrites_needed = {}
+    for row in attempts:
+        outcome = row.get("outcome")
+        if outcome in ("passed", "exhausted"):
+            needed = row["attempt"] + (1 if outcome == "exhausted" else 0)
+            run_id = row["run_id"]
+            rewrites_needed[run_id] = max(rewrites_needed.get(run_id, 0), needed)
+
+    if len(rewrites_needed) < BUDGET_LEARNING_MIN_RUNS:
+        return None
+    needed = sorted(rewrites_needed.values())
+    index = math.ceil(BUDGET_LEARNING_QUANTILE * len(needed)) - 1
+    return max(1, min(MAX_REWRITE_BUDGET, needed[index]))
+
+
+def learned_default_budget():
+    """
+    Default rewrite budget learned from recent attempt history (cached for
+    BUDGET_LEARNING_TTL seconds), or DEFAULT_REWRITE_BUDGET without enough history.
+    """
+    with _learned_lock:
+        if _learned["value"] is not None and time.monotonic() - _learned["at"] < BUDGET_LEARNING_TTL:
+            return _learned["value"]
+
+    from memory.db_handler import get_recent_post_attempts
+    learned = budget_from_history(get_recent_post_attempts(BUDGET_LEARNING_WINDOW))
+    value = learned if learned is not None else DEFAULT_REWRITE_BUDGET
+    if learned is not None:
+        logger.info(f"Learned default rewrite budget: {learned}")
+
+    with _learned_lock:
+        _learned.update(value=value, at=time.monotonic())
+    return value
@@ -1,15 +1,24 @@
 from llms.gpt4_generator import generate_post, rewrite_post
-from llms.gemini_evaluator import evaluate_post
+from llms.gemini_evaluator import evaluate_post, evaluate_posts
 from notifier.telegram import send_to_telegram
-from memory.db_handler import add_post, log_activity
-from utils.logger import get_logger
+from memory.db_handler import (
+    add_post, add_posts, get_post, log_activity, save_post_attempt, finish_post_run, get_post_attempts, get_interrupted_runs
+)
+from utils.jobs import JobCancelled, current_job, join_flight, single_flight
+from utils.logger import get_logger, payload, with_job_id
 from utils.validators import validate_evaluation
+from pipeline.budget import RewriteBudget, learned_default_budget
+from memory.analytics import record_evaluation, record_run
 import asyncio
 import copy
+import os
 import uuid
 
 logger = get_logger("Rewrite Module")
 
+# Longest wait for a Telegram notification, in seconds
+TELEGRAM_NOTIFY_TIMEOUT = 7.0
+
 async def _safe_notify(draft, topic, post_id, review_required=False):
     """
     Guarded notification helper. 
@@ -17,99 +26,399 @@ async def _safe_notify(draft, topic, post_id, review_required=False):
     """
     try:
         # We wrap the call in wait_for to ensure it doesn't hang the AI loop
-        # The timeout here is 5 seconds.
         await asyncio.wait_for(
             send_to_telegram(draft, topic, post_id=post_id, review_required=review_required),
-            timeout=7.0
+            timeout=TELEGRAM_NOTIFY_TIMEOUT
         )
     except asyncio.TimeoutError:
         logger.error(f"Telegram notification timed out for '{topic}'")
     except Exception as e:
         logger.error(f"Telegram notification failed for '{topic}': {e}")
 
-async def run_evaluation_flow(initial_post, topic, max_retries=2, post_id=None, force_rewrite=False):
+
+# Earlier evaluator issues passed to a forced rewrite
+MAX_FEEDBACK_ISSUES = 5
+
+
+def _forced_rewrite_instructions(post_id):
+    """
+    Instructions for a user-requested redraft. Earlier evaluator feedback on the post
+    (from its checkpointed attempts) is passed along so the rewrite doesn't repeat
+    problems the evaluator already found.
+    """
+    instructions = "The user wants a fresh version. Try a different hook and a new perspective."
+    evaluated = [a for a in get_post_attempts(post_id) if a.get("passed") is not None] if post_id else []
+    if not evaluated:
+        return instructions
+
+    # Most recent first, without repeats
+    issues = list(dict.fromkeys(str(issue) for a in reversed(evaluated) for issue in (a.get("issues") or [])))
+    latest_instructions = next((a["rewrite_instructions"] for a in reversed(evaluated) if a.get("rewrite_instructions")), None)
+
+    feedback = []
+    if issues:
+        feedback.append("Issues: " + "; ".join(issues[:MAX_FEEDBACK_ISSUES]))
+    if latest_instructions:
+        feedback.append("Instructions: " + latest_instructions)
+    if not feedback:
+        return instructions
+    return instructions + "\n\nEarlier evaluator feedback on this post (still address it):\n" + "\n".join(feedback)
+
+
+def _checkpoint(run, attempt, draft, evaluation=None):
+    """Saves one attempt of a run, with its evaluation once there is one."""
+    row = {**run, "attempt": attempt, "draft": draft}
+    if evaluation is not None:
+        row.update({
+            "passed": bool(evaluation.get("pass")),
+            "scores": evaluation.get("scores"),
+            "issues": evaluation.get("issues"),
+            "rewrite_instructions": evaluation.get("rewrite_instructions"),
+        })
+    save_post_attempt(row)
+    if evaluation is not None:
+        record_evaluation(run["platform"], attempt, evaluation)
+
+
+async def _forced_rewrite(content, topic, post_id, platform=None, group_id=None):
+    """
+    The rewrite a redraft starts with, fed with earlier evaluator feedback on the post.
+    Without a platform, the stored post's platform, group and topic are used.
+
+    Returns:
+        tuple: (draft, topic, platform, group_id)
+    """
+    if platform is None:
+        stored = get_post(post_id) or {}
+        platform, group_id = stored.get("platform"), group_id or stored.get("group_id")
+        # Callers may pass the review label ("Twitter: ...") rather than the topic
+        topic = stored.get("topic") or topic
+    platform = platform or "linkedin"
+
+    logger.info(f"Manual redraft triggered for '{topic}'. Forcing rewrite.")
+    draft = await asyncio.to_thread(
+        rewrite_post,
+        original_post=content,
+        rewrite_instructions=_forced_rewrite_instructions(post_id),
+        platform=platform
+    )
+    return draft, topic, platform, group_id
+
+
+def review_label(topic, platform):
+    """Topic as shown in review notifications; non-LinkedIn variants are prefixed with their platform."""
+    return topic if platform == "linkedin" else f"{platform.capitalize()}: {topic}"
+
+
+def _end_run(run, attempt, outcome):
+    """Marks a run finished after `attempt` rewrites and adds it to the analytics rollups."""
+    finish_post_run(run["run_id"], outcome)
+    record_run(run["platform"], attempt, outcome)
+
+
+async def _finish_run(run, attempt, draft, outcome, level, message, review_required, save):
+    """Records a run's outcome; with `save`, also stores the draft and sends it for review."""
+    if save:
+        # Save to DB first
+        add_post(run["post_id"], run["topic"], draft, status="pending", platform=run["platform"], group_id=run["group_id"])
+    _end_run(run, attempt, outcome)
+    log_activity(level, message)
+    if save:
+        # Notify with timeout
+        await _safe_notify(draft, review_label(run["topic"], run["platform"]), post_id=run["post_id"], review_required=review_required)
+
+
+@with_job_id
+async def run_evaluation_flow(initial_post, topic, max_retries=None, post_id=None, force_rewrite=False, resume=None,
+                              platform=None, group_id=None, save=True, evaluation=None):
     """
     Handles a single draft post with retry logic:
-    1. If force_rewrite is True, it performs a rewrite first.
+    1. If force_rewrite is True, it performs a rewrite first (fed with earlier evaluator feedback).
     2. Evaluates the post.
-    3. If fails, rewrites and retries (up to max_retries).
-    4. If passes or exhausted, sends to Telegram/DB.
-    """
-    current_post = copy.deepcopy(initial_post)
-    attempt = 0
-    
-    # If the user manually triggered this (Redraft), force a change immediately
-    if force_rewrite:
-        logger.info(f"Manual redraft triggered for '{topic}'. Forcing rewrite.")
-        current_post = rewrite_post(
-            original_post=current_post,
-            rewrite_instructions="The user wants a fresh version. Try a different hook and a new perspective."
-        )
-    
-    # Use existing ID or generate a new one
-    if not post_id:
-        post_id = str(uuid.uuid4())[:8]
+    3. If fails, rewrites and retries while the rewrite budget allows (see pipeline/budget.py):
+       max_retries is the base budget (learned from history when None); flat scores stop
+       early and a near-passing draft gets one extra rewrite.
+    4. If passes or out of budget, sends to Telegram/DB.
+
+    Every draft and evaluation is checkpointed to post_attempts, so a run interrupted by
+    a crash can be continued by passing its latest attempt as `resume`
+    (see resume_interrupted_runs).
+
+    `platform` picks the writer and evaluator rubric (see PLATFORMS in llms/prompts.py);
+    a redraft of a stored post keeps that post's platform and group.
+    With save=False the final draft is neither stored nor sent to Telegram, so a caller
+    can store several variants together (see save_variants).
+    `evaluation` is an evaluation of initial_post the caller already has (e.g. from
+    evaluate_posts, see run_rewrite_batch); the run starts from it instead of
+    calling the evaluator.
+    """
+    if resume:
+        # Continue an interrupted run from its last checkpoint
+        post_id, topic, max_retries = resume["post_id"], resume["topic"], resume["max_retries"]
+        platform, group_id = resume.get("platform") or "linkedin", resume.get("group_id")
+        run = {
+            "run_id": resume["run_id"], "post_id": post_id, "topic": topic, "max_retries": max_retries,
+            "platform": platform, "group_id": group_id,
+        }
+        attempt = resume["attempt"]
+        current_post = resume["draft"]
+        if resume.get("passed") is not None:
+            evaluation = {key: resume.get(key) for key in ("scores", "issues", "rewrite_instructions")}
+            evaluation["pass"] = resume["passed"]
+
+        # Rebuild the score trajectory from the run's evaluated attempts
+        budget = RewriteBudget(max_retries)
+        for previous in get_post_attempts(post_id):
+            if previous["run_id"] == run["run_id"] and previous.get("passed") is not None and previous["attempt"] <= attempt:
+                budget.record(previous.get("scores"))
+        logger.info(f"Resuming editor run {run['run_id']} for '{topic}' at attempt {attempt}.")
+    else:
+        current_post = copy.deepcopy(initial_post)
+        attempt = 0
+        if max_retries is None:
+            max_retries = learned_default_budget()
+        budget = RewriteBudget(max_retries)
+
+        # Use existing ID or generate a new one
+        if not post_id:
+            post_id = str(uuid.uuid4())[:8]
+
+        # If the user manually triggered this (Redraft), force a change immediately
+        if force_rewrite:
+            current_post, topic, platform, group_id = await _forced_rewrite(current_post, topic, post_id, platform, group_id)
+        platform = platform or "linkedin"
+        run = {
+            "run_id": uuid.uuid4().hex, "post_id": post_id, "topic": topic, "max_retries": max_retries,
+            "platform": platform, "group_id": group_id,
+        }
+        _checkpoint(run, attempt, current_post, evaluation)
+        if evaluation is not None:
+            budget.record(evaluation.get("scores"))
 
     try:
-        while attempt <= max_retries:
-            raw_evaluation = evaluate_post(current_post)
+        while True:
+            if evaluation is None:
+                # LLM calls (and their retry backoff) run in a worker thread to keep the loop free
+                raw_evaluation = await asyncio.to_thread(evaluate_post, current_post, platform=platform)
 
-            try:
-                evaluation = validate_evaluation(raw_evaluation)
-            except ValueError as e:
-                logger.error(f"Evaluation validation failed: {e}. Post: {current_post}")
-                # Save to DB first
-                add_post(post_id, topic, current_post, status="pending")
-                log_activity("info", f"Validation failed for '{topic}', saved for manual review.")
-                # Notify with timeout
-                await _safe_notify(current_post, topic, post_id=post_id, review_required=True)
-                return current_post, raw_evaluation
+                try:
+                    evaluation = validate_evaluation(raw_evaluation)
+                except ValueError as e:
+                    logger.error(f"Evaluation validation failed: {e}. Post: {payload(current_post)}")
+                    await _finish_run(
+                        run, attempt, current_post, "invalid", "info",
+                        f"Validation failed for '{topic}', saved for manual review.", True, save
+                    )
+                    return current_post, raw_evaluation
+
+                _checkpoint(run, attempt, current_post, evaluation)
+                budget.record(evaluation.get("scores"))
 
             if evaluation["pass"]:
                 logger.info(
-                    f"Post passed evaluation on attempt {attempt + 1}. Sending to Telegram. Post: {current_post}"
+                    f"Post passed evaluation on attempt {attempt + 1}. Sending to Telegram. Post: {payload(current_post)}"
+                )
+                await _finish_run(
+                    run, attempt, current_post, "passed", "info", f"Post for '{topic}' passed AI evaluation.", False, save
                 )
-                # Save to DB first
-                add_post(post_id, topic, current_post, status="pending")
-                log_activity("info", f"Post for '{topic}' passed AI evaluation.")
-                # Notify with timeout
-                await _safe_notify(current_post, topic, post_id=post_id)
                 return current_post, evaluation
 
             rewrite_instructions = evaluation.get("rewrite_instructions", "")
-            attempt += 1
 
-            if attempt > max_retries:
+            rewrite, reason = budget.next_rewrite()
+            if not rewrite:
                 logger.warning(
-                    f"Post failed after {max_retries} retries. Sending for manual review. Feedback: {evaluation}"
+                    f"Post failed after {attempt} rewrites ({reason}). Sending for manual review. Feedback: {payload(evaluation)}"
                 )
-                # Save to DB first
-                add_post(post_id, topic, current_post, status="pending")
-                log_activity("warning", f"Post for '{topic}' reached retry limit, saved for manual review.")
-                # Notify with timeout
-                await _safe_notify(current_post, topic, post_id=post_id, review_required=True)
+                if reason == "stalled":
+                    message = f"Post for '{topic}' stopped improving, saved for manual review."
+                else:
+                    message = f"Post for '{topic}' reached retry limit, saved for manual review."
+                await _finish_run(run, attempt, current_post, reason, "warning", message, True, save)
                 return current_post, evaluation
 
+            attempt += 1
             logger.info(
-                f"Post failed evaluation on attempt {attempt}. Rewriting using evaluator instructions. Feedback: {evaluation}"
+                f"Post failed evaluation on attempt {attempt} ({reason}). "
+                f"Rewriting using evaluator instructions. Feedback: {payload(evaluation)}"
             )
 
             # rewrite: original post + evaluator instructions
-            current_post = rewrite_post(
+            current_post = await asyncio.to_thread(
+                rewrite_post,
                 original_post=current_post,
-                rewrite_instructions=rewrite_instructions
+                rewrite_instructions=rewrite_instructions,
+                platform=platform
+            )
+            evaluation = None
+            _checkpoint(run, attempt, current_post)
+
+    except (asyncio.CancelledError, JobCancelled):
+        job = current_job()
+        if job is not None and job.reason == "deadline":
+            # Out of time: keep the latest draft for manual review
+            logger.warning(f"Job deadline reached for '{topic}' on attempt {attempt + 1}. Saving draft for review.")
+            await _finish_run(
+                run, attempt, current_post, "deadline", "warning",
+                f"Time limit reached for '{topic}', saved draft for manual review.", True, save
             )
+            return current_post, {"pass": False, "rewrite_instructions": "", "error": "deadline"}
+        _end_run(run, attempt, "cancelled")
+        log_activity("info", f"Generation for '{topic}' was cancelled.")
+        raise
 
     except Exception as e:
         logger.error(f"Unexpected error in editor loop: {e}", exc_info=True)
-        # Save to DB first
-        add_post(post_id, topic, current_post, status="pending")
-        log_activity("error", f"Unexpected error while processing '{topic}', saved draft.")
-        # Notify with timeout
-        await _safe_notify(current_post, topic, post_id=post_id, review_required=True)
+        await _finish_run(
+            run, attempt, current_post, "error", "error", f"Unexpected error while processing '{topic}', saved draft.", True, save
+        )
         # Return a structured failure evaluation
         return current_post, {
             "pass": False,
             "rewrite_instructions": "",
             "error": str(e)
         }
+
+
+def post_flight_key(post_id):
+    """Single-flight key of the editor run for a stored post (see utils/jobs.py)."""
+    return ("post", post_id)
+
+
+async def run_redraft(content, topic, post_id):
+    """
+    A user-requested redraft of a stored post (Dismiss on the dashboard, Reject in Telegram).
+    If the post is already being redrafted, waits for that run instead of starting another.
+
+    Returns:
+        tuple: (draft, evaluation) as returned by run_evaluation_flow
+    """
+    return await single_flight(
+        post_flight_key(post_id), run_evaluation_flow, content, topic, post_id=post_id, force_rewrite=True
+    )
+
+
+async def save_variants(topic, group_id, variants):
+    """
+    Stores the platform variants of one topic in a single write, then sends each for review.
+
+    Args:
+        variants (list): dicts with post_id, platform, draft and evaluation, as finished by
+                         run_evaluation_flow(..., save=False)
+    """
+    add_posts([
+        {"id": v["post_id"], "topic": topic, "content": v["draft"], "status": "pending",
+         "platform": v["platform"], "group_id": group_id}
+        for v in variants
+    ])
+    await asyncio.gather(*(
+        _safe_notify(
+            v["draft"], review_label(topic, v["platform"]), post_id=v["post_id"],
+            review_required=not (v["evaluation"] or {}).get("pass")
+        )
+        for v in variants
+    ))
+
+
+# Runs with no checkpoint for this long (seconds) are treated as interrupted
+EDITOR_RESUME_AFTER = int(os.getenv("EDITOR_RESUME_AFTER", 600))
+
+
+async def resume_interrupted_runs(idle_seconds=EDITOR_RESUME_AFTER):
+    """
+    Continues editor runs left unfinished by a crash or restart, from their last checkpoint.
+
+    Returns:
+        int: Number of runs resumed
+    """
+    runs = get_interrupted_runs(idle_seconds)
+    for checkpoint in runs:
+        try:
+            await single_flight(post_flight_key(checkpoint["post_id"]), run_evaluation_flow, None, None, resume=checkpoint)
+        except Exception as e:
+            logger.error(f"Resuming editor run {checkpoint['run_id']} failed: {e}")
+    if runs:
+        log_activity("info", f"Resumed {len(runs)} interrupted editor run(s).")
+    return len(runs)
+
+
+# How many forced rewrites from one bulk dismiss run at the same time
+BULK_REWRITE_CONCURRENCY = 3
+
+
+async def run_rewrite_batch(posts, concurrency=BULK_REWRITE_CONCURRENCY):
+    """
+    Runs forced rewrites for several dismissed drafts on one event loop, at most
+    `concurrency` at a time. The rewritten drafts of each platform are graded together
+    with evaluate_posts, then every editor run continues on its own from that evaluation.
+    A post that is already being redrafted is waited for instead (see run_redraft).
+
+    Args:
+        posts (list): dicts with "id", "content" and "topic"
+
+    Returns:
+        list: (post_id, error or None) for each post, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(fn, *args, **kwargs):
+        async with semaphore:
+            return await fn(*args, **kwargs)
+
+    flights = [(post, *join_flight(post_flight_key(post["id"]))) for post in posts]
+    leading = [(post, flight) for post, flight, leader in flights if leader]
+
+    try:
+        rewrites = await asyncio.gather(
+            *(limited(_forced_rewrite, post["content"], post["topic"], post["id"]) for post, _ in leading),
+            return_exceptions=True
+        )
+
+        # One evaluate_posts call per platform; drafts it couldn't grade are evaluated by their own run
+        evaluations = [None] * len(leading)
+        by_platform = {}
+        for index, rewrite in enumerate(rewrites):
+            if not isinstance(rewrite, BaseException):
+                by_platform.setdefault(rewrite[2], []).append(index)
+        for platform, indexes in by_platform.items():
+            try:
+                graded = await asyncio.to_thread(evaluate_posts, [rewrites[i][0] for i in indexes], platform=platform)
+            except Exception as e:
+                logger.warning(f"Batch evaluation of {len(indexes)} {platform} redraft(s) failed: {e}")
+                continue
+            for index, evaluation in zip(indexes, graded):
+                if "error" not in evaluation:
+                    evaluations[index] = evaluation
+
+        prepared = {id(flight): (rewrite, evaluation) for (_, flight), rewrite, evaluation in zip(leading, rewrites, evaluations)}
+
+        async def continue_run(post_id, rewrite, evaluation):
+            if isinstance(rewrite, BaseException):
+                raise rewrite
+            draft, topic, platform, group_id = rewrite
+            return await limited(
+                run_evaluation_flow, draft, topic, post_id=post_id, platform=platform, group_id=group_id,
+                evaluation=evaluation
+            )
+
+        async def finish_one(post, flight, leader):
+            try:
+                if leader:
+                    await flight.run(continue_run, post["id"], *prepared[id(flight)])
+                else:
+                    await flight.wait()
+                return post["id"], None
+            except Exception as e:
+                logger.error(f"Bulk rewrite failed for post {post['id']}: {e}")
+                return post["id"], e
+
+        return await asyncio.gather(*(finish_one(post, flight, leader) for post, flight, leader in flights))
+    finally:
+        # Flights that never ran (e.g. the batch was cancelled) release their followers
+        for _, flight in leading:
+            flight.abandon()
+
+
+if __name__ == "__main__":
+    # Usage: python -m pipeline.editor  (resumes interrupted editor runs)
+    asyncio.run(resume_interrupted_runs())
@@ -1,27 +1,52 @@
 from llms.gpt4_generator import generate_post
 from topics.topic_manager import get_topic
-from llms.prompts import build_linkedin_prompt
-from pipeline.editor import run_evaluation_flow
-from utils.logger import get_logger
+from llms.prompts import PLATFORMS
+from pipeline.editor import run_evaluation_flow, save_variants
+from utils.jobs import JobCancelled, current_job
+from utils.logger import get_logger, payload, with_job_id
 from dotenv import load_dotenv
 import asyncio
 import sys
+import uuid
 
 load_dotenv()
 
 logger = get_logger("Worker")
 
 
-async def create_post(progress_callback=None, user_topic=None):
+def generation_flight_key(user_topic=None, platforms=None):
+    """
+    Single-flight key of a create_post run (see utils/jobs.py): repeated requests for the
+    same topic (or for a picked topic, without one) and platforms share one run.
+    """
+    topic = " ".join(user_topic.split()).lower() if user_topic else None
+    return ("generate", topic, tuple(sorted(set(platforms or ["linkedin"]))))
+
+
+@with_job_id
+async def create_post(progress_callback=None, user_topic=None, platforms=None):
     """ 
     Full content creation pipeline with post evaluation and editing.
+
+    Args:
+        platforms (list): Platforms to write for (keys of PLATFORMS); defaults to LinkedIn only.
+            With more than one, the topic is picked once and the variants are drafted and
+            evaluated concurrently, then stored together as one linked group.
+
+    Returns:
+        str: The finished post, or a dict of platform -> finished post for several platforms
     """
+    platforms = list(dict.fromkeys(platforms or ["linkedin"]))
+    unknown = [p for p in platforms if p not in PLATFORMS]
+    if unknown:
+        raise ValueError(f"Unknown platforms: {', '.join(unknown)}")
+
     try:
         # 10% - Getting Topic
         if progress_callback: progress_callback(10, "Selecting Topic...")
         
         # Get topic from llm or user input
-        topic_data = get_topic(user_topic=user_topic)
+        topic_data = await asyncio.to_thread(get_topic, user_topic=user_topic)
         
         # Handle dict (from DB) or string
         if isinstance(topic_data, dict):
@@ -32,30 +57,72 @@ async def create_post(progress_callback=None, user_topic=None):
         # 25% - building prompt
         if progress_callback: progress_callback(25, "Drafting Content...")
 
+        if len(platforms) > 1:
+            return await _create_variants(topic, platforms, progress_callback)
+        platform = platforms[0]
+
         # Create prompt with the topic
-        prompt = build_linkedin_prompt(topic)
-        logger.info(f"Generated prompt: {prompt}")
+        prompt = PLATFORMS[platform]["build_prompt"](topic)
+        logger.info(f"Generated prompt: {payload(prompt)}")
 
         # Generate a post with the prompt
-        post = generate_post(prompt)
-        logger.info(f"Generated post: {post}")
+        post = await asyncio.to_thread(generate_post, prompt)
+        logger.info(f"Generated post: {payload(post)}")
 
         # 50% - Evaluating
         if progress_callback: progress_callback(50, "Evaluating Draft...")
 
         # Run evaluation flow
-        finished_post, evaluation = await run_evaluation_flow(post, topic)
-        logger.info(f"Finished post: {finished_post} \n Evaluation: {evaluation}")
+        finished_post, evaluation = await run_evaluation_flow(post, topic, platform=platform)
+        logger.info(f"Finished post: {payload(finished_post)} \n Evaluation: {payload(evaluation)}")
         
         # 90% - Finalizing
         if progress_callback: progress_callback(90, "Finalizing...")
         
         return finished_post
 
+    except (asyncio.CancelledError, JobCancelled):
+        job = current_job()
+        if progress_callback: progress_callback(0, "Timed Out" if job and job.reason == "deadline" else "Cancelled")
+        raise
+
     except Exception as e:
         logger.error(f"Error creating post: {e}")
         if progress_callback: progress_callback(0, "Error Occurred")
         raise
 
+async def _create_variants(topic, platforms, progress_callback=None):
+    """Drafts, evaluates and stores one linked variant per platform for a single topic."""
+    group_id = uuid.uuid4().hex[:8]
+
+    # One draft per platform, generated concurrently
+    drafts = await asyncio.gather(*(
+        asyncio.to_thread(generate_post, PLATFORMS[platform]["build_prompt"](topic)) for platform in platforms
+    ))
+    for platform, draft in zip(platforms, drafts):
+        logger.info(f"Generated {platform} post: {payload(draft)}")
+
+    # 50% - Evaluating
+    if progress_callback: progress_callback(50, f"Evaluating {len(platforms)} Drafts...")
+
+    post_ids = [str(uuid.uuid4())[:8] for _ in platforms]
+    results = await asyncio.gather(*(
+        run_evaluation_flow(draft, topic, post_id=post_id, platform=platform, group_id=group_id, save=False)
+        for platform, draft, post_id in zip(platforms, drafts, post_ids)
+    ))
+
+    # 90% - Finalizing
+    if progress_callback: progress_callback(90, "Finalizing...")
+
+    variants = [
+        {"post_id": post_id, "platform": platform, "draft": finished_post, "evaluation": evaluation}
+        for platform, post_id, (finished_post, evaluation) in zip(platforms, post_ids, results)
+    ]
+    await save_variants(topic, group_id, variants)
+    logger.info(f"Stored {len(variants)} variants for '{topic}' as group {group_id}")
+
+    return {v["platform"]: v["draft"] for v in variants}
+
+
 if __name__ == "__main__":
     asyncio.run(create_post())
@@ -15,8 +15,8 @@ async def main():
     
     try:
         # Check if automation is enabled in DB
-        from memory.db_handler import get_setting
-        is_enabled = get_setting("daily_generation_enabled", default=True)
+        from memory.db_handler import get_bool_setting
+        is_enabled = get_bool_setting("daily_generation_enabled")
         
         if not is_enabled:
             logger.info("Automation is DISABLED via dashboard. Skipping generation.")
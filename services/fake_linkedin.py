@@ -0,0 +1,124 @@
+# services/fake_linkedin.py: Local stand-in for the LinkedIn Posts API, for testing services/linkedin.py.
+#
+# Usage:
+#   python -m services.fake_linkedin --port 8099 --rate-limit-every 3
+#   LINKEDIN_API_BASE=http://127.0.0.1:8099 LINKEDIN_ACCESS_TOKEN=test LINKEDIN_AUTHOR_URN=urn:li:person:test python app/main.py
+#
+# POST /rest/posts   Creates a post; repeats of an Idempotency-Key return the original post
+# GET  /rest/posts   Lists created posts (for assertions), with request counters
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLinkedInState:
+    """Posts and request counters shared by every request handler."""
+
+    def __init__(self, rate_limit_every=0, retry_after=1, latency=0.0):
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.posts = []
+        self.by_key = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+
+
+def _make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body=None, headers=None):
+            data = json.dumps(body).encode("utf-8") if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") != "/rest/posts":
+                return self._reply(404, {"message": "Not found"})
+            with state.lock:
+                body = {"elements": list(state.posts), "requests": state.requests, "rate_limited": state.rate_limited}
+            self._reply(200, body)
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/rest/posts":
+                return self._reply(404, {"message": "Not found"})
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self._reply(401, {"message": "Missing access token"})
+
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not payload.get("author") or not payload.get("commentary"):
+                return self._reply(422, {"message": "author and commentary are required"})
+
+            if state.latency:
+                time.sleep(state.latency)
+
+            key = self.headers.get("Idempotency-Key")
+            with state.lock:
+                state.requests += 1
+                if state.rate_limit_every and state.requests % state.rate_limit_every == 0:
+                    state.rate_limited += 1
+                    return self._reply(429, {"message": "Too many requests"}, {"Retry-After": str(state.retry_after)})
+
+                if key and key in state.by_key:
+                    post = state.by_key[key]
+                else:
+                    post = {"id": f"urn:li:share:{uuid.uuid4().int % 10**19}", **payload}
+                    state.posts.append(post)
+                    if key:
+                        state.by_key[key] = post
+
+            self._reply(201, headers={"x-restli-id": post["id"]})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(port=0, **options):
+    """
+    Starts the fake API on a background thread.
+
+    Args:
+        port (int): Port to bind on 127.0.0.1 (0 picks a free one)
+        **options: rate_limit_every, retry_after, latency (see FakeLinkedInState)
+
+    Returns:
+        tuple: (server, base_url, state); call server.shutdown() to stop
+    """
+    state = FakeLinkedInState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake LinkedIn Posts API for local testing.")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth create with a 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each create")
+    args = parser.parse_args()
+
+    server, base_url, _ = start_fake_server(
+        args.port, rate_limit_every=args.rate_limit_every, retry_after=args.retry_after, latency=args.latency
+    )
+    print(f"Fake LinkedIn API listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# services/linkedin.py: Publishes approved posts to LinkedIn from an outbound queue.
+#
+# Approving a post (dashboard or Telegram) only claims it and queues its id, so the
+# request never waits on LinkedIn. A background thread with its own event loop drains
+# the queue with at most LINKEDIN_PUBLISH_CONCURRENCY requests in flight, backs off on
+# 429s (honouring Retry-After) and records the outcome on the post row.
+#
+# Idempotency: claim_post_publish() is an atomic conditional update, so a double
+# approve queues the post once. Every request for a post also carries the same
+# Idempotency-Key, derived from the post id.
+#
+# Test locally against the fake API in services/fake_linkedin.py:
+#   python -m services.fake_linkedin --port 8099
+#   LINKEDIN_API_BASE=http://127.0.0.1:8099 LINKEDIN_ACCESS_TOKEN=test LINKEDIN_AUTHOR_URN=urn:li:person:test ...
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from dotenv import load_dotenv
+
+from utils.logger import get_logger, with_job_id
+from utils.metrics import increment
+from utils.retry import RetryPolicy, get_retry_after
+
+load_dotenv()
+logger = get_logger("LinkedIn Publisher")
+
+LINKEDIN_API_BASE = os.getenv("LINKEDIN_API_BASE", "https://api.linkedin.com").rstrip("/")
+LINKEDIN_ACCESS_TOKEN = os.getenv("LINKEDIN_ACCESS_TOKEN")
+# Author of the posts, e.g. urn:li:person:abc123 or urn:li:organization:456
+LINKEDIN_AUTHOR_URN = os.getenv("LINKEDIN_AUTHOR_URN")
+LINKEDIN_API_VERSION = os.getenv("LINKEDIN_API_VERSION", "202405")
+LINKEDIN_PUBLISH_CONCURRENCY = int(os.getenv("LINKEDIN_PUBLISH_CONCURRENCY", 2))
+
+# Publishing is not latency sensitive, so keep retrying rate limits for a while
+LINKEDIN_RETRY_POLICY = RetryPolicy(
+    "linkedin",
+    max_attempts=int(os.getenv("LINKEDIN_MAX_ATTEMPTS", 6)),
+    base_delay=2.0,
+    max_delay=300.0,
+    call_timeout=30.0,
+    deadline=float(os.getenv("LINKEDIN_DEADLINE", 3600)),
+)
+
+_thread = None
+_loop = None
+_queue = None
+_start_lock = threading.Lock()
+# Monotonic time before which no new request is sent, set by the last 429
+_paused_until = 0.0
+
+
+def is_configured():
+    """True when LinkedIn credentials are set."""
+    return bool(LINKEDIN_ACCESS_TOKEN and LINKEDIN_AUTHOR_URN)
+
+
+def publish_key_for(post_id):
+    """Stable idempotency key for a post: every publish attempt for it sends the same key."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"redraft:post:{post_id}"))
+
+
+#-------------------------------
+# LinkedIn API
+#-------------------------------
+async def create_linkedin_post(client, text, publish_key, timeout):
+    """
+    Creates a post through the LinkedIn Posts API.
+
+    Returns:
+        str: The LinkedIn post URN
+    """
+    global _paused_until
+    response = await client.post(
+        f"{LINKEDIN_API_BASE}/rest/posts",
+        json={
+            "author": LINKEDIN_AUTHOR_URN,
+            "commentary": text,
+            "visibility": "PUBLIC",
+            "distribution": {
+                "feedDistribution": "MAIN_FEED",
+                "targetEntities": [],
+                "thirdPartyDistributionChannels": [],
+            },
+            "lifecycleState": "PUBLISHED",
+            "isReshareDisabledByAuthor": False,
+        },
+        headers={"Idempotency-Key": publish_key},
+        timeout=timeout,
+    )
+    if response.status_code == 429:
+        # Pause every worker, not just this one
+        increment("linkedin.rate_limited")
+        error = httpx.HTTPStatusError("Rate limited by LinkedIn", request=response.request, response=response)
+        _paused_until = max(_paused_until, time.monotonic() + (get_retry_after(error) or LINKEDIN_RETRY_POLICY.base_delay))
+        raise error
+    response.raise_for_status()
+    return response.headers.get("x-restli-id") or response.json().get("id")
+
+
+async def _wait_for_rate_limit():
+    delay = _paused_until - time.monotonic()
+    if delay > 0:
+        logger.info(f"LinkedIn rate limit: pausing publishing for {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+@with_job_id
+async def _publish(client, post_id):
+    """Publishes one queued post and records the result on it."""
+    from memory.db_handler import get_post, update_publish_status, log_activity
+
+    post = await asyncio.to_thread(get_post, post_id)
+    if not post or post.get("publish_status") != "queued":
+        return
+    if (post.get("platform") or "linkedin") != "linkedin":
+        # Variants written for other platforms are approved, not published here
+        logger.info(f"Post {post_id} is a {post['platform']} variant; not publishing to LinkedIn.")
+        await asyncio.to_thread(update_publish_status, post_id, "unsupported", expected="queued")
+        return
+
+    # Conditional, so a post is only ever picked up by one worker (or process)
+    started = await asyncio.to_thread(
+        update_publish_status, post_id, "publishing", expected="queued",
+        publish_attempts=(post.get("publish_attempts") or 0) + 1,
+    )
+    if not started:
+        return
+    publish_key = post.get("publish_key") or publish_key_for(post_id)
+
+    async def attempt(timeout):
+        await _wait_for_rate_limit()
+        return await create_linkedin_post(client, post["content"], publish_key, timeout)
+
+    try:
+        linkedin_post_id = await LINKEDIN_RETRY_POLICY.acall(attempt, label=f"LinkedIn publish {post_id}")
+    except Exception as e:
+        increment("linkedin.failed")
+        logger.error(f"Publishing post {post_id} to LinkedIn failed: {e}")
+        await asyncio.to_thread(update_publish_status, post_id, "failed", publish_error=str(e)[:500])
+        await asyncio.to_thread(log_activity, "error", f"LinkedIn publish failed for '{post.get('topic')}'.")
+        return
+
+    increment("linkedin.published")
+    logger.info(f"Post {post_id} published to LinkedIn as {linkedin_post_id}")
+    await asyncio.to_thread(
+        update_publish_status, post_id, "published",
+        linkedin_post_id=linkedin_post_id,
+        published_at=datetime.now(timezone.utc).isoformat(),
+        publish_error=None,
+    )
+    await asyncio.to_thread(log_activity, "success", f"Post '{post.get('topic')}' published to LinkedIn.")
+
+
+#-------------------------------
+# Queue
+#-------------------------------
+async def _run_publisher(ready):
+    global _queue
+    from memory.db_handler import get_queued_publishes
+
+    _queue = asyncio.Queue()
+
+    # Re-queue posts a previous process claimed but never picked up. Posts left in
+    # "publishing" by a crash are not retried automatically: LinkedIn may already
+    # have them, so they need a manual check.
+    for post in await asyncio.to_thread(get_queued_publishes):
+        _queue.put_nowait(post["id"])
+    ready.set()
+
+    async def worker(client):
+        while True:
+            post_id = await _queue.get()
+            try:
+                await _publish(client, post_id)
+            except Exception as e:
+                logger.error(f"Publisher error for post {post_id}: {e}")
+
+    headers = {
+        "Authorization": f"Bearer {LINKEDIN_ACCESS_TOKEN}",
+        "LinkedIn-Version": LINKEDIN_API_VERSION,
+        "X-Restli-Protocol-Version": "2.0.0",
+    }
+    limits = httpx.Limits(max_connections=LINKEDIN_PUBLISH_CONCURRENCY)
+    async with httpx.AsyncClient(headers=headers, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(LINKEDIN_PUBLISH_CONCURRENCY)))
+
+
+def _ensure_started():
+    """Starts the publisher thread (and its event loop) once per process."""
+    global _thread, _loop
+    with _start_lock:
+        if _thread and _thread.is_alive():
+            return
+        ready = threading.Event()
+
+        def run():
+            global _loop
+            _loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(_loop)
+            try:
+                _loop.run_until_complete(_run_publisher(ready))
+            except Exception as e:
+                logger.error(f"LinkedIn publisher stopped: {e}")
+            finally:
+                ready.set()
+                _loop.close()
+
+        _thread = threading.Thread(target=run, name="linkedin-publisher", daemon=True)
+        _thread.start()
+        ready.wait()
+
+
+def enqueue_publish(post_id):
+    """
+    Queues an approved post for publishing and returns immediately. Only LinkedIn posts
+    are claimed, so approving a variant for another platform never reports it as queued.
+
+    Returns:
+        bool: True if the post was queued; False if it is already queued or published,
+              isn't a LinkedIn post, or LinkedIn isn't configured
+    """
+    if not is_configured():
+        logger.info(f"LinkedIn is not configured; post {post_id} approved without publishing.")
+        return False
+
+    from memory.db_handler import claim_post_publish
+    if not claim_post_publish(post_id, publish_key_for(post_id)):
+        logger.info(f"Post {post_id} is not a LinkedIn post, or is already queued or published; not publishing it.")
+        return False
+
+    _ensure_started()
+    try:
+        _loop.call_soon_threadsafe(_queue.put_nowait, post_id)
+    except RuntimeError as e:
+        # Publisher loop died; the post stays "queued" and is picked up on the next start
+        logger.error(f"Could not queue post {post_id} for publishing: {e}")
+        return False
+    increment("linkedin.queued")
+    return True
@@ -0,0 +1,359 @@
+# services/sheduler.py: Resident scheduler for automated post generation.
+#
+# Runs inside the Flask app (SCHEDULER_ENABLED=True) or as a long-lived daemon:
+#   python -m services.sheduler
+#
+# Unlike a cron job running run_pipeline.py, the process stays up, so the OpenAI,
+# Gemini and Telegram clients are built once and reused by every run.
+#
+# Only one process per host fires: every gunicorn worker starts the scheduler, but
+# only the one holding the leader lock file (SCHEDULER_LOCK_PATH) runs jobs; the
+# others retry the lock in case the leader exits.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from utils.logger import get_job_id, get_logger, with_job_id
+
+load_dotenv()
+logger = get_logger("Scheduler")
+
+# Start the scheduler when the Flask app is imported
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "False").lower() == "true"
+# Cron expression (minute hour day-of-month month day-of-week), evaluated in UTC
+GENERATION_SCHEDULE = os.getenv("GENERATION_SCHEDULE", "0 0 * * *")
+# Random delay, in seconds, added to every run
+SCHEDULER_JITTER = int(os.getenv("SCHEDULER_JITTER", 300))
+# A run missed while no scheduler was up is made up on start if it is at most this many hours old
+SCHEDULER_CATCHUP_HOURS = float(os.getenv("SCHEDULER_CATCHUP_HOURS", 24))
+SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", "data/scheduler.lock")
+
+# Setting holding the last scheduled time that was run, shared by every process
+LAST_RUN_SETTING = "scheduler_last_run"
+# How often a non-leader retries the lock
+LEADER_RETRY_SECONDS = 60
+# Longest single sleep, so stop requests and clock changes are noticed
+MAX_SLEEP_SECONDS = 60
+
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+class CronSchedule:
+    """
+    A standard 5-field cron expression: "*", lists, ranges and steps ("*/15", "1-5", "0,30").
+    Day-of-week 0 and 7 are both Sunday. When both day fields are restricted a day
+    matches either one, as in cron.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+        ]
+        self.weekdays = {d % 7 for d in self.weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field, low, high):
+        values = set()
+        # Day-of-week accepts 7 for Sunday
+        top = 7 if (low, high) == (0, 6) else high
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/", 1)
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+                if step != 1:
+                    end = high
+            if not (low <= start <= end <= top) or step < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day):
+        in_month = day.day in self.days
+        # Python: Monday=0; cron: Sunday=0
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return in_week
+        if self._any_weekday:
+            return in_month
+        return in_month or in_week
+
+    def next_after(self, moment):
+        """
+        First scheduled time strictly after `moment` (a timezone-aware datetime).
+        """
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = moment.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            if day.month in self.months and self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= moment:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+#-------------------------------
+# Leader lock
+#-------------------------------
+def _try_lock(path):
+    """
+    Takes an exclusive, non-blocking lock on `path`. Returns the open file (keep it
+    open to hold the lock) or None if another process holds it.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handle = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+#-------------------------------
+# Jobs
+#-------------------------------
+def warm_clients():
+    """
+    Builds the LLM and Telegram clients up front so scheduled runs reuse them.
+    """
+    try:
+        from llms import gemini_evaluator, gpt4_generator
+        from notifier.telegram import get_bot
+        gpt4_generator._get_client()
+        gemini_evaluator._get_client()
+        get_bot()
+        logger.info("Clients warmed up for scheduled runs.")
+    except Exception as e:
+        logger.warning(f"Client warm-up failed (will retry on first run): {e}")
+
+
+@with_job_id
+async def run_scheduled_generation():
+    """
+    One scheduled generation run. Skipped when daily_generation_enabled is off.
+
+    Returns:
+        bool: True if a post was generated
+    """
+    from memory.db_handler import get_bool_setting, invalidate_settings_cache, log_activity
+    from pipeline.worker import create_post, generation_flight_key
+    from utils.jobs import GENERATION_JOB_TIMEOUT, JobCancelled, join_flight, run_job
+
+    # The toggle may have changed in another worker; don't trust the cache here
+    invalidate_settings_cache()
+    if not get_bool_setting("daily_generation_enabled"):
+        logger.info("Automation is DISABLED via dashboard. Skipping scheduled generation.")
+        return False
+
+    try:
+        # Registered as a job, so it has a deadline and can be cancelled via /api/jobs.
+        # A dashboard generation already picking a topic is joined rather than repeated.
+        flight, leader = join_flight(generation_flight_key(), job_id=get_job_id())
+        if leader:
+            post_content = await flight.run(
+                run_job, create_post, kind="scheduled", label="Scheduled generation",
+                timeout=GENERATION_JOB_TIMEOUT, job_id=flight.job_id
+            )
+        else:
+            post_content = await flight.wait()
+    except JobCancelled as e:
+        logger.warning(f"Scheduled generation stopped: {e}")
+        log_activity("warning", "Scheduled content generation timed out." if e.reason == "deadline" else "Scheduled content generation cancelled.")
+        return False
+    except Exception as e:
+        logger.error(f"Scheduled generation failed: {e}")
+        log_activity("error", "Scheduled content generation failed.")
+        return False
+
+    if not post_content:
+        logger.error("Scheduled generation returned no content.")
+        return False
+    log_activity("info", "Scheduled content generation completed.")
+    return True
+
+
+#-------------------------------
+# Scheduler loop
+#-------------------------------
+_stop = threading.Event()
+_thread = None
+
+
+def _last_run():
+    from memory.db_handler import get_setting, invalidate_settings_cache
+    invalidate_settings_cache()
+    value = get_setting(LAST_RUN_SETTING)
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _record_run(scheduled_for):
+    from memory.db_handler import update_setting
+    update_setting(LAST_RUN_SETTING, scheduled_for.isoformat())
+
+
+async def _sleep_until(moment):
+    """Sleeps until `moment`; returns False if the scheduler was stopped first."""
+    while not _stop.is_set():
+        remaining = (moment - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return True
+        await asyncio.sleep(min(remaining, MAX_SLEEP_SECONDS))
+    return False
+
+
+async def _run_as_leader(schedule, jitter, catchup_hours):
+    now = datetime.now(timezone.utc)
+    last_run = _last_run()
+
+    if last_run is None:
+        # First start: nothing to catch up on
+        _record_run(now)
+        last_run = now
+    else:
+        missed = schedule.next_after(last_run)
+        if missed <= now and now - missed <= timedelta(hours=catchup_hours):
+            logger.info(f"Catching up on missed run scheduled for {missed.isoformat()}")
+            await run_scheduled_generation()
+            _record_run(now)
+            last_run = now
+
+    while not _stop.is_set():
+        scheduled_for = schedule.next_after(max(last_run, datetime.now(timezone.utc)))
+        fire_at = scheduled_for + timedelta(seconds=random.uniform(0, jitter))
+        logger.info(f"Next generation scheduled for {fire_at.isoformat()}")
+        if not await _sleep_until(fire_at):
+            return
+
+        # Another process may have taken over and run this slot already
+        recorded = _last_run()
+        if recorded and recorded >= scheduled_for:
+            last_run = recorded
+            continue
+
+        await run_scheduled_generation()
+        # Recorded only once the run is over: if the process dies mid-run, the slot is
+        # still open and the next leader catches it up
+        _record_run(scheduled_for)
+        last_run = scheduled_for
+
+
+async def run_scheduler(schedule=None, jitter=None, catchup_hours=None, lock_path=None):
+    """
+    Runs the scheduler until stop_scheduler() is called. Waits for the leader lock
+    first, so it is safe to start in every worker.
+
+    Args:
+        schedule (str): Cron expression (defaults to GENERATION_SCHEDULE)
+        jitter (int): Maximum random delay in seconds (defaults to SCHEDULER_JITTER)
+        catchup_hours (float): Oldest missed run to make up (defaults to SCHEDULER_CATCHUP_HOURS)
+        lock_path (str): Leader lock file (defaults to SCHEDULER_LOCK_PATH)
+    """
+    schedule = CronSchedule(schedule or GENERATION_SCHEDULE)
+    jitter = SCHEDULER_JITTER if jitter is None else jitter
+    catchup_hours = SCHEDULER_CATCHUP_HOURS if catchup_hours is None else catchup_hours
+    lock_path = lock_path or SCHEDULER_LOCK_PATH
+
+    lock = None
+    while lock is None:
+        lock = _try_lock(lock_path)
+        if lock is None:
+            if not await _sleep_until(datetime.now(timezone.utc) + timedelta(seconds=LEADER_RETRY_SECONDS)):
+                return
+
+    logger.info(f"Scheduler is leader (pid {os.getpid()}), schedule '{schedule.expression}' UTC")
+    try:
+        warm_clients()
+        # Finish editor runs a previous process left half-done (see pipeline/editor.py)
+        from pipeline.editor import resume_interrupted_runs
+        await resume_interrupted_runs()
+        await _run_as_leader(schedule, jitter, catchup_hours)
+    finally:
+        lock.close()
+
+
+def start_scheduler():
+    """
+    Starts the scheduler on a background thread with its own long-lived event loop.
+    Calling it again while running does nothing.
+    """
+    global _thread
+    if _thread and _thread.is_alive():
+        return _thread
+    _stop.clear()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(run_scheduler())
+        except Exception as e:
+            logger.error(f"Scheduler stopped: {e}")
+        finally:
+            loop.close()
+
+    _thread = threading.Thread(target=run, name="scheduler", daemon=True)
+    _thread.start()
+    return _thread
+
+
+def stop_scheduler(timeout=None):
+    """Asks the scheduler to stop and waits for its thread."""
+    _stop.set()
+    if _thread:
+        _thread.join(timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident scheduler for automated post generation.")
+    parser.add_argument("--schedule", help=f"cron expression in UTC (default: {GENERATION_SCHEDULE!r})")
+    parser.add_argument("--next", type=int, metavar="N", help="print the next N run times and exit")
+    args = parser.parse_args()
+
+    if args.next:
+        schedule = CronSchedule(args.schedule or GENERATION_SCHEDULE)
+        moment = datetime.now(timezone.utc)
+        for _ in range(args.next):
+            moment = schedule.next_after(moment)
+            print(moment.isoformat())
+        return
+
+    try:
+        asyncio.run(run_scheduler(schedule=args.schedule))
+    except KeyboardInterrupt:
+        logger.info("Scheduler stopped.")
+
+
+if __name__ == "__main__":
+    main()
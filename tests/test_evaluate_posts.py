@@ -0,0 +1,52 @@
+# tests/test_evaluate_posts.py: evaluate_posts batching and its per-draft fallback.
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llms import gemini_evaluator
+
+
+def _evaluation(draft):
+    return {"pass": True, "scores": {}, "issues": [], "rewrite_instructions": "", "draft": draft}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"batch": [], "single": []}
+
+    def evaluate_batch(drafts, platform="linkedin"):
+        calls["batch"].append(list(drafts))
+        return [_evaluation(draft) for draft in drafts]
+
+    def evaluate_post(draft, platform="linkedin"):
+        calls["single"].append(draft)
+        return _evaluation(draft)
+
+    monkeypatch.setattr(gemini_evaluator, "_evaluate_batch", evaluate_batch)
+    monkeypatch.setattr(gemini_evaluator, "evaluate_post", evaluate_post)
+    return calls
+
+
+@pytest.mark.parametrize("max_batch_size", [0, -3, 1])
+def test_non_positive_batch_size_evaluates_every_draft(calls, max_batch_size):
+    drafts = ["a", "b", "c"]
+
+    evaluations = gemini_evaluator.evaluate_posts(drafts, max_batch_size=max_batch_size)
+
+    assert [e["draft"] for e in evaluations] == drafts
+    assert calls["single"] == drafts
+    assert calls["batch"] == []
+
+
+def test_drafts_are_split_into_batches(calls):
+    drafts = ["a", "b", "c", "d", "e"]
+
+    evaluations = gemini_evaluator.evaluate_posts(drafts, max_batch_size=2)
+
+    assert [e["draft"] for e in evaluations] == drafts
+    assert calls["batch"] == [["a", "b"], ["c", "d"]]
+    assert calls["single"] == ["e"]
@@ -0,0 +1,52 @@
+# tests/test_interrupted_runs.py: Which editor runs SQLiteBackend reports as interrupted.
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from memory.backends.sqlite_backend import SQLiteBackend
+
+OLD = "2024-06-01T00:00:00.000000+00:00"
+RECENT = "2024-06-01T00:10:00.000000+00:00"
+CUTOFF = "2024-06-01T00:05:00.000000+00:00"
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / "redraft.db"))
+
+
+def _checkpoint(backend, run_id, attempt, updated_at):
+    backend.save_post_attempt({
+        "run_id": run_id, "post_id": f"p-{run_id}", "topic": "t", "attempt": attempt,
+        "max_retries": 3, "draft": f"draft {attempt}", "platform": "linkedin",
+    })
+    backend._conn().execute(
+        "UPDATE post_attempts SET updated_at = ? WHERE run_id = ? AND attempt = ?", (updated_at, run_id, attempt)
+    )
+
+
+def test_run_with_a_recent_checkpoint_is_not_interrupted(backend):
+    _checkpoint(backend, "live", 0, OLD)
+    _checkpoint(backend, "live", 1, RECENT)
+
+    assert backend.get_unfinished_attempts(CUTOFF) == []
+
+
+def test_interrupted_run_resumes_from_its_latest_attempt(backend):
+    _checkpoint(backend, "stale", 0, OLD)
+    _checkpoint(backend, "stale", 1, OLD)
+    _checkpoint(backend, "live", 0, RECENT)
+
+    [checkpoint] = backend.get_unfinished_attempts(CUTOFF)
+    assert (checkpoint["run_id"], checkpoint["attempt"], checkpoint["draft"]) == ("stale", 1, "draft 1")
+
+
+def test_finished_run_is_not_interrupted(backend):
+    _checkpoint(backend, "done", 0, OLD)
+    backend.finish_post_run("done", "passed")
+
+    assert backend.get_unfinished_attempts(CUTOFF) == []
@@ -0,0 +1,107 @@
+# tests/test_query_plans.py: Every query SQLiteBackend issues must use an index.
+#
+# The statements are captured with a trace callback while the backend methods run, so
+# the check follows the SQL in memory/backends/sqlite_backend.py as it changes.
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from memory.backends.base import topic_content_hash
+from memory.backends.sqlite_backend import SQLiteBackend
+from memory.migrations import query_plan_problems
+
+CREATED = "2024-06-01T00:00:00.000000+00:00"
+
+# Backend calls whose queries are traced: (method, call)
+CALLS = [
+    ("get_stats", lambda b: b.get_stats()),
+    ("get_pending_posts", lambda b: b.get_pending_posts()),
+    ("get_pending_posts", lambda b: b.get_pending_posts(limit=5, columns="id, topic")),
+    ("get_pending_posts_page", lambda b: b.get_pending_posts_page(20)),
+    ("get_pending_posts_page", lambda b: b.get_pending_posts_page(20, position=(CREATED, "p1"))),
+    ("get_post", lambda b: b.get_post("p1")),
+    ("get_posts", lambda b: b.get_posts(["p1", "p2"])),
+    ("get_post_variants", lambda b: b.get_post_variants("g1")),
+    ("update_post_status", lambda b: b.update_post_status("p1", "approved", "edited")),
+    ("update_posts_status", lambda b: b.update_posts_status(["p1", "p2"], "dismissed")),
+    ("update_posts_status", lambda b: b.update_posts_status(["p1", "p2"], "approved", from_status="pending")),
+    ("claim_post_publish", lambda b: b.claim_post_publish("p1", "key-1")),
+    ("update_publish_status", lambda b: b.update_publish_status("p1", "published", expected="publishing")),
+    ("get_queued_publishes", lambda b: b.get_queued_publishes()),
+    ("finish_post_run", lambda b: b.finish_post_run("r1", "passed")),
+    ("get_post_attempts", lambda b: b.get_post_attempts("p1")),
+    ("get_recent_post_attempts", lambda b: b.get_recent_post_attempts(200)),
+    ("get_unfinished_attempts", lambda b: b.get_unfinished_attempts(CREATED)),
+    ("get_unused_topics", lambda b: b.get_unused_topics()),
+    ("mark_topic_used", lambda b: b.mark_topic_used(content_hash=topic_content_hash("topic a"))),
+    ("mark_topic_used", lambda b: b.mark_topic_used(topic_id=1)),
+    ("delete_topic", lambda b: b.delete_topic(content_hash=topic_content_hash("topic b"))),
+    ("get_activity", lambda b: b.get_activity(5)),
+    ("get_activity", lambda b: b.get_activity(5, position=(CREATED, 1))),
+    ("get_setting", lambda b: b.get_setting("daily_generation_enabled")),
+    ("get_rollups", lambda b: b.get_rollups("2024-01-01", "2024-02-01")),
+    ("export_page", lambda b: b.export_page("posts", 500, position=(CREATED, "p1"), since="2024-01-01", until="2025-01-01")),
+    ("export_page", lambda b: b.export_page("posts", 500, position=(CREATED, "p1"), status="approved")),
+    ("export_page", lambda b: b.export_page("topics", 500, position=(CREATED, 1), status=True)),
+    ("export_page", lambda b: b.export_page("activity", 500, position=(CREATED, 1))),
+    ("export_page", lambda b: b.export_page("activity", 500, status="error")),
+]
+
+# Calls that walk a table in rowid order up to a LIMIT on purpose: a plain SCAN is their plan
+FULL_SCAN_METHODS = {"get_recent_post_attempts"}
+
+# Methods left out: they only insert, or read a whole table on purpose (bulk transfer, settings)
+UNTRACED_METHODS = {
+    "add_post", "add_posts", "save_post_attempt", "add_topics", "log_activity", "log_activities",
+    "update_setting", "add_rollups", "replace_rollups", "import_rows", "export_rows", "get_all_settings",
+}
+
+
+@pytest.fixture(scope="module")
+def backend(tmp_path_factory):
+    backend = SQLiteBackend(str(tmp_path_factory.mktemp("plans") / "redraft.db"))
+    backend.add_posts([
+        {"id": "p1", "topic": "t", "content": "c", "status": "pending", "group_id": "g1"},
+        {"id": "p2", "topic": "t", "content": "c", "status": "pending", "platform": "twitter", "group_id": "g1"},
+    ])
+    backend.save_post_attempt({
+        "run_id": "r1", "post_id": "p1", "topic": "t", "attempt": 0, "max_retries": 3, "draft": "c",
+        "platform": "linkedin", "group_id": "g1",
+    })
+    backend.add_topics(["topic a", "topic b"])
+    backend.log_activity("info", "hello")
+    return backend
+
+
+def _traced(backend, call):
+    statements = []
+    conn = backend._conn()
+    conn.set_trace_callback(statements.append)
+    try:
+        call(backend)
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH"))]
+
+
+@pytest.mark.parametrize("method, call", CALLS, ids=[method for method, _ in CALLS])
+def test_backend_queries_use_indexes(backend, method, call):
+    statements = _traced(backend, call)
+    assert statements, f"{method} issued no query"
+
+    conn = backend._conn()
+    for sql in statements:
+        assert query_plan_problems(conn, sql, full_scan_ok=method in FULL_SCAN_METHODS) == [], sql
+
+
+def test_every_backend_method_is_traced():
+    methods = {
+        name for name, value in vars(SQLiteBackend).items()
+        if callable(value) and not name.startswith("_")
+    }
+    traced = {method for method, _ in CALLS}
+    assert methods - traced - UNTRACED_METHODS == set()
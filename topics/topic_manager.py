@@ -1,6 +1,8 @@
 import random
 from llms.gpt4_generator import generate_post
+from utils.jobs import check_job
 from utils.logger import get_logger
+from utils.recorder import recordable
 from llms.prompts import topics_prompt_linkedin
 from memory.db_handler import add_topics, get_unused_topics, mark_topic_used, delete_topic as db_delete_topic
 
@@ -9,6 +11,7 @@ logger = get_logger("TopicManager")
 # Topic pool pulled in from DB
 
 
+@recordable("topics.generate")
 def _generate_topics():
     """
     Uses GPT-4 to generate a list of post topics.
@@ -43,6 +46,8 @@ def get_topic(user_topic=None):
     1. User-provided topic
     2. AI-generated topic pool
     """
+    # Nothing to do for a job that was cancelled (or ran out of time) while this was queued
+    check_job()
 
     # Manual override always wins
     if user_topic:
@@ -76,7 +81,8 @@ def get_topic(user_topic=None):
     
     logger.info(f"Selected topic: {topic_content}")
     
-    mark_topic_used(topic_content)
+    # Pass the row itself so the DB update goes by id rather than by content
+    mark_topic_used(topic)
     
     return topic
 
@@ -0,0 +1,284 @@
+# utils/jobs.py: Deadlines and cancellation for generation jobs.
+#
+# A job (one create_post run, from the dashboard or the scheduler) is registered here with
+# an overall deadline. The job travels with the context, like the log job id, so every
+# stage it runs - including the ones in worker threads (asyncio.to_thread) - can see it:
+#   - RetryPolicy caps each provider call's timeout at the job's remaining time and stops
+#     retrying once the job is cancelled or out of time,
+#   - streaming provider calls check the job between chunks and close the stream,
+#     aborting the in-flight request,
+#   - the job's asyncio task is cancelled, so awaiting stages stop immediately.
+#
+# The registry is per process: cancel a job in the process that runs it (the Dockerfile
+# runs a single gunicorn process).
+#
+# Duplicate requests for the same work (a double-clicked Dismiss, Reject in Telegram while
+# dismissing on the dashboard, repeated /generate clicks) are coalesced: the first request
+# runs it and the others attach to that flight and get its result (see single_flight).
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from utils.logger import get_logger, use_job_id
+from utils.metrics import increment
+
+logger = get_logger("Jobs")
+
+# Longest a whole generation job (topic, draft, evaluation and rewrites) may take, in seconds
+GENERATION_JOB_TIMEOUT = float(os.getenv("GENERATION_JOB_TIMEOUT", 900))
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that was cancelled, or whose deadline passed."""
+
+    def __init__(self, job_id, reason):
+        super().__init__(f"Job {job_id} {'ran out of time' if reason == 'deadline' else 'was cancelled'}")
+        self.job_id = job_id
+        self.reason = reason
+
+
+class JobDeadlineExceeded(JobCancelled):
+    """A JobCancelled whose reason is the job's deadline."""
+
+
+_current = contextvars.ContextVar("generation_job", default=None)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class Job:
+    """One running job: its deadline and cancellation state."""
+
+    def __init__(self, kind, label=None, timeout=None, job_id=None):
+        self.id = job_id or new_job_id()
+        self.kind = kind
+        self.label = label
+        self.timeout = timeout
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason = None
+        self._stopped = threading.Event()
+        self._task = None
+        self._loop = None
+
+    @property
+    def cancelled(self):
+        return self._stopped.is_set()
+
+    def remaining(self):
+        """Seconds left before the deadline (None without one)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason="cancelled"):
+        """Stops the job from any thread. Returns False if it was already stopped."""
+        if self._stopped.is_set():
+            return False
+        self.reason = reason
+        self._stopped.set()
+        increment(f"jobs.{reason}")
+        logger.warning(f"Job {self.id} ({self.kind}) stopping: {reason}")
+        if self._task is not None and not self._task.done():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        return True
+
+    def check(self):
+        """Raises JobCancelled if the job was cancelled or its deadline has passed."""
+        if not self._stopped.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+        if self._stopped.is_set():
+            raise (JobDeadlineExceeded if self.reason == "deadline" else JobCancelled)(self.id, self.reason)
+
+    def wait(self, seconds):
+        """Sleeps up to `seconds` (a retry backoff), waking early if the job is stopped."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._stopped.wait(seconds)
+        self.check()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "started_at": self.started_at,
+            "remaining": None if self.deadline is None else round(self.remaining(), 1),
+            "cancelled": self.cancelled,
+            "reason": self.reason,
+        }
+
+
+def new_job_id():
+    """A short id for a job, also used as its log correlation id."""
+    return uuid.uuid4().hex[:8]
+
+
+def current_job():
+    """The job the caller runs in, or None."""
+    return _current.get()
+
+
+def check_job():
+    """Raises JobCancelled if the current job (if any) was cancelled or ran out of time."""
+    job = _current.get()
+    if job is not None:
+        job.check()
+
+
+def job_remaining(default=None):
+    """Seconds left for the current job; `default` outside a job or without a deadline."""
+    job = _current.get()
+    remaining = job.remaining() if job is not None else None
+    return default if remaining is None else remaining
+
+
+async def run_job(fn, *args, kind="dashboard", label=None, timeout=None, job_id=None, **kwargs):
+    """
+    Runs `await fn(*args, **kwargs)` as a registered job with an overall deadline.
+
+    Args:
+        kind (str): "dashboard" or "scheduled"
+        timeout (float): Seconds the whole job may take (None for no deadline)
+        job_id (str): Id to register under (e.g. one already returned to a client)
+
+    Raises:
+        JobCancelled: The job was cancelled (JobDeadlineExceeded if it ran out of time)
+    """
+    job = Job(kind, label=label, timeout=timeout, job_id=job_id)
+    job._loop = asyncio.get_running_loop()
+    job._task = asyncio.current_task()
+    with _jobs_lock:
+        _jobs[job.id] = job
+
+    timer = job._loop.call_later(timeout, job.cancel, "deadline") if timeout else None
+    token = _current.set(job)
+    try:
+        with use_job_id(job.id):
+            return await fn(*args, **kwargs)
+    except (asyncio.CancelledError, JobCancelled):
+        if not job.cancelled:
+            # Cancelled from outside (e.g. the loop shutting down), not through the registry
+            raise
+        raise (JobDeadlineExceeded if job.reason == "deadline" else JobCancelled)(job.id, job.reason) from None
+    finally:
+        _current.reset(token)
+        if timer:
+            timer.cancel()
+        with _jobs_lock:
+            _jobs.pop(job.id, None)
+
+
+def list_jobs():
+    """Running jobs, oldest first."""
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    return [job.to_dict() for job in sorted(jobs, key=lambda j: j.started_at)]
+
+
+def cancel_job(job_id):
+    """
+    Cancels a running job in this process.
+
+    Returns:
+        bool: False if no such job is running
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return False
+    job.cancel()
+    return True
+
+
+#-------------------------------
+# Single-flight coalescing
+#-------------------------------
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class Flight:
+    """One piece of in-flight work that duplicate requests attach to (see join_flight)."""
+
+    def __init__(self, key, job_id=None):
+        self.key = key
+        self.job_id = job_id
+        self.followers = 0
+        # Shared across threads: every caller runs its own event loop
+        self._future = concurrent.futures.Future()
+
+    def _land(self):
+        with _flights_lock:
+            if _flights.get(self.key) is self:
+                del _flights[self.key]
+
+    async def run(self, fn, *args, **kwargs):
+        """Leader: runs `await fn(*args, **kwargs)` and hands its outcome to every follower."""
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            self._land()
+            self._future.cancel()
+            raise
+        except BaseException as e:
+            self._land()
+            self._future.set_exception(e)
+            raise
+        self._land()
+        self._future.set_result(result)
+        return result
+
+    async def wait(self):
+        """Follower: the leader's result (or its exception)."""
+        # Shielded, so a follower giving up doesn't cancel the shared future
+        return await asyncio.shield(asyncio.wrap_future(self._future))
+
+    def abandon(self):
+        """Leader that won't run after all: releases the key and fails the followers."""
+        self._land()
+        self._future.cancel()
+
+
+def join_flight(key, job_id=None):
+    """
+    Attaches to the in-flight work for `key`, or starts a new flight if there is none.
+
+    Args:
+        key (tuple): What the work is, e.g. ("post", post_id)
+        job_id (str): Job id of a new flight, returned to followers (e.g. for /api/jobs)
+
+    Returns:
+        tuple: (flight, leader) - the leader must call flight.run() (or abandon()),
+               followers flight.wait()
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            flight.followers += 1
+            leader = False
+        else:
+            flight = _flights[key] = Flight(key, job_id)
+            leader = True
+    if not leader:
+        increment("jobs.coalesced")
+        logger.info(f"Coalesced duplicate request for {key} into job {flight.job_id or '-'}")
+    return flight, leader
+
+
+async def single_flight(key, fn, *args, **kwargs):
+    """
+    Runs `await fn(*args, **kwargs)` unless the same work (`key`) is already running in
+    this process, in which case it waits for that run and returns its result.
+    """
+    flight, leader = join_flight(key)
+    if leader:
+        return await flight.run(fn, *args, **kwargs)
+    return await flight.wait()
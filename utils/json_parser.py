@@ -28,3 +28,72 @@ def parse_json_safely(text):
         return json.loads(clean_text)
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse JSON: {e}\nRaw output: {text}")
+
+
+class IncrementalJSONParser:
+    """
+    Parses the top-level fields of a JSON object while its text is still streaming in.
+
+    Each completed "key": value pair becomes available in `fields` as soon as the value
+    is fully received, so callers can act on early fields without waiting for the rest.
+    Leading markdown fences (```json) are ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self.done = False
+        self._pos = None  # index just after the last consumed token
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk):
+        """
+        Appends a chunk of streamed text and parses any newly completed fields.
+
+        Returns:
+            dict: All fields parsed so far
+        """
+        self.buffer += chunk
+        if not self.done:
+            self._parse()
+        return self.fields
+
+    def _skip(self, pos, chars=" \t\r\n"):
+        while pos < len(self.buffer) and self.buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def _parse(self):
+        if self._pos is None:
+            start = self.buffer.find("{")
+            if start == -1:
+                return
+            self._pos = start + 1
+
+        while True:
+            pos = self._skip(self._pos, " \t\r\n,")
+            if pos >= len(self.buffer):
+                return
+            if self.buffer[pos] == "}":
+                self.done = True
+                return
+
+            try:
+                key, pos = self._decoder.raw_decode(self.buffer, pos)
+                pos = self._skip(pos)
+                if pos >= len(self.buffer):
+                    return
+                if self.buffer[pos] != ":":
+                    raise ValueError(f"Expected ':' after key {key!r}")
+                pos = self._skip(pos + 1)
+                value, end = self._decoder.raw_decode(self.buffer, pos)
+            except json.JSONDecodeError:
+                # Incomplete token; wait for more text
+                return
+
+            # A number at the very end of the buffer may still be growing (e.g. "7" -> "75")
+            if end == len(self.buffer) and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return
+
+            self.fields[key] = value
+            self._pos = end
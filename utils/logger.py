@@ -1,23 +1,161 @@
+import atexit
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
 import logging
 import os
+import queue
+import random
+import uuid
 
 LOG_FILE = "redraft.log"
 
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-# Configure logging with the specified format and handlers
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        RotatingFileHandler(LOG_FILE, encoding='utf-8', maxBytes=1_000_000, backupCount=5),
-        logging.StreamHandler()
-    ]
-)
+# "text" (default) or "json" for one JSON object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Longest prompt/draft/evaluation excerpt logged by payload(), in characters
+LOG_MAX_PAYLOAD = int(os.getenv("LOG_MAX_PAYLOAD", 300))
+# Share of jobs whose payloads are logged in full (0.0 - 1.0)
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", 0.0))
+# Hard cap on any single log message, in characters
+LOG_MAX_MESSAGE = int(os.getenv("LOG_MAX_MESSAGE", 4000))
+
+# Correlation id of the job being processed, and whether its payloads are logged in full
+_job = contextvars.ContextVar("log_job", default=None)
+
+
+class _JobFilter(logging.Filter):
+    """Stamps each record with the current job id, read in the caller's context before queueing."""
+
+    def filter(self, record):
+        job = _job.get()
+        record.job_id = job[0] if job else "-"
+        return True
+
+
+class _CappedQueueHandler(QueueHandler):
+    """Formats the message in the caller, caps its length and hands it to the writer thread."""
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if isinstance(record.msg, str) and len(record.msg) > LOG_MAX_MESSAGE:
+            record.msg = f"{record.msg[:LOG_MAX_MESSAGE]}... [+{len(record.msg) - LOG_MAX_MESSAGE} chars]"
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, job_id, message."""
+
+    def format(self, record):
+        return json.dumps({
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "job_id": getattr(record, "job_id", "-"),
+            "message": record.getMessage(),
+        }, ensure_ascii=False)
+
+
+if LOG_FORMAT == "json":
+    _formatter = JSONFormatter(datefmt='%Y-%m-%dT%H:%M:%S%z')
+else:
+    _formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(job_id)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+# File and console writes happen on a background thread; callers only enqueue records
+_handlers = [
+    RotatingFileHandler(LOG_FILE, encoding='utf-8', maxBytes=1_000_000, backupCount=5),
+    logging.StreamHandler()
+]
+for _handler in _handlers:
+    _handler.setFormatter(_formatter)
+
+_queue_handler = _CappedQueueHandler(queue.SimpleQueue())
+# The queue handler only renders the message (plus any traceback); the writers add the rest
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+_queue_handler.addFilter(_JobFilter())
+
+_listener = QueueListener(_queue_handler.queue, *_handlers, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+# Configure logging with the queue handler
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 
 def get_logger(name):
     """
     Returns a logger with the specified name.
     """
     return logging.getLogger(name)
+
+
+def get_job_id():
+    """Correlation id of the current job, or None outside a job."""
+    job = _job.get()
+    return job[0] if job else None
+
+
+def with_job_id(fn):
+    """
+    Runs a function (sync or async) as a job: its log lines, and those of everything it
+    calls in the same context (awaited coroutines, asyncio.to_thread), carry one job id.
+    Nested jobs keep the outer id. Whether the job's payloads are logged in full is
+    sampled once per job.
+    """
+    def enter():
+        if _job.get() is not None:
+            return None
+        return _job.set((uuid.uuid4().hex[:8], random.random() < LOG_PAYLOAD_SAMPLE_RATE))
+
+    def leave(token):
+        if token is not None:
+            _job.reset(token)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            token = enter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                leave(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            leave(token)
+    return wrapper
+
+
+@contextlib.contextmanager
+def use_job_id(job_id):
+    """Runs the enclosed block as the job `job_id` (e.g. an id already given to a client)."""
+    token = _job.set((job_id, random.random() < LOG_PAYLOAD_SAMPLE_RATE))
+    try:
+        yield
+    finally:
+        _job.reset(token)
+
+
+def payload(value, limit=None):
+    """
+    A large value (prompt, draft, evaluation) for a log line: capped at LOG_MAX_PAYLOAD
+    characters unless the current job was sampled for full payloads.
+    """
+    text = value if isinstance(value, str) else str(value)
+    job = _job.get()
+    if job and job[1]:
+        return text
+    limit = limit or LOG_MAX_PAYLOAD
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [+{len(text) - limit} chars]"
@@ -0,0 +1,30 @@
+import threading
+from collections import defaultdict
+
+# Process-wide counters (e.g. "llm.retries", "db.calls")
+_lock = threading.Lock()
+_counters = defaultdict(int)
+
+
+def increment(name, value=1):
+    """
+    Increments a named counter.
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_metrics():
+    """
+    Returns a snapshot of all counters.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset_metrics():
+    """
+    Clears all counters.
+    """
+    with _lock:
+        _counters.clear()
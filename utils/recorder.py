@@ -0,0 +1,290 @@
+# utils/recorder.py: Record/replay harness for LLM and DB traffic.
+#
+# REDRAFT_RECORD=<path>      Append every recordable call (arguments, result, timing) to a JSONL file.
+# REDRAFT_REPLAY=<path>      Serve recordable calls from a recording instead of live providers/DB.
+# REDRAFT_REPLAY_SPEED=<x>   1.0 replays at recorded latency, 10 is 10x faster, 0 returns immediately.
+#
+# Usage:
+#   python -m utils.recorder summary traffic.jsonl
+#   python -m utils.recorder compare baseline.jsonl candidate.jsonl
+
+import builtins
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+from utils.logger import get_logger
+
+logger = get_logger("Recorder")
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when a call has no matching recording."""
+
+
+class ReplayedError(RuntimeError):
+    """
+    Re-raised in replay mode for calls that failed while recording, when the original
+    exception wasn't a builtin one. The replayed class carries the original class names
+    (and HTTP status), so utils.retry classifies it the same way as the live failure.
+    """
+
+
+_lock = threading.Lock()
+_mode = None          # None | "record" | "replay"
+_path = None
+_speed = 1.0
+_exact = {}           # (channel, request key) -> deque of recordings
+_by_channel = {}      # channel -> deque of recordings (fallback when inputs drift)
+
+# Only the outermost recordable call is captured (e.g. _generate_topics, not the
+# generate_post/add_topics calls it makes), so replay serves it as one unit.
+_inside_call = contextvars.ContextVar("recorder_inside_call", default=False)
+
+_replayed_classes = {}  # class names -> exception class built for replay
+
+
+def _request_key(channel, args, kwargs):
+    payload = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=str)
+    return hashlib.sha1(f"{channel}:{payload}".encode("utf-8")).hexdigest()
+
+
+def start_recording(path):
+    """
+    Starts appending recordable calls to path.
+    """
+    global _mode, _path
+    with _lock:
+        _mode, _path = "record", path
+    logger.info(f"Recording LLM/DB traffic to {path}")
+
+
+def start_replay(path, speed=1.0):
+    """
+    Loads a recording and serves recordable calls from it.
+
+    Calls are matched on channel and arguments first. If the inputs drifted
+    (e.g. a changed prompt), the next unserved recording on the same channel is
+    used, so a whole day's traffic can be pushed through a modified pipeline.
+    """
+    global _mode, _path, _speed, _exact, _by_channel
+    exact = defaultdict(deque)
+    by_channel = defaultdict(deque)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            entry["served"] = False
+            exact[(entry["channel"], entry["key"])].append(entry)
+            by_channel[entry["channel"]].append(entry)
+
+    with _lock:
+        _mode, _path, _speed = "replay", path, speed
+        _exact, _by_channel = exact, by_channel
+    logger.info(f"Replaying {sum(len(q) for q in by_channel.values())} recorded calls from {path} (speed={speed})")
+
+
+def stop():
+    """
+    Returns to live mode.
+    """
+    global _mode, _path
+    with _lock:
+        _mode, _path = None, None
+
+
+def _next_recording(channel, key):
+    with _lock:
+        for queue in (_exact.get((channel, key)), _by_channel.get(channel)):
+            while queue:
+                entry = queue.popleft()
+                if not entry["served"]:
+                    entry["served"] = True
+                    return entry
+    raise ReplayMissError(f"No recording left for channel '{channel}'")
+
+
+def _error_details(exc):
+    """What replay needs to raise an equivalent exception: class names (most derived first) and HTTP status."""
+    from utils.retry import get_status_code
+    return {
+        "types": [cls.__name__ for cls in type(exc).__mro__ if cls not in (object, BaseException, Exception)],
+        "status_code": get_status_code(exc),
+    }
+
+
+def _replayed_class(types):
+    """
+    An exception class with the recorded class names in its MRO. Builtin classes
+    (TimeoutError, ValueError, ...) are used as they are; provider classes are rebuilt
+    by name on top of the nearest builtin ancestor, or of ReplayedError.
+    """
+    key = tuple(types)
+    with _lock:
+        if key not in _replayed_classes:
+            base, names = ReplayedError, list(types)
+            for i, name in enumerate(types):
+                builtin = getattr(builtins, name, None)
+                if isinstance(builtin, type) and issubclass(builtin, Exception):
+                    base, names = builtin, types[:i]
+                    break
+            for name in reversed(names):
+                base = type(name, (base,), {"__module__": __name__})
+            _replayed_classes[key] = base
+        return _replayed_classes[key]
+
+
+def _replayed_error(entry):
+    details = entry.get("error_details")
+    if not details or not details.get("types"):
+        # Recorded before error details were stored
+        return ReplayedError(entry["error"])
+    message = entry["error"].split(": ", 1)[-1]
+    exc = _replayed_class(details["types"])(message)
+    if details.get("status_code") is not None:
+        exc.status_code = details["status_code"]
+    return exc
+
+
+def _replay(channel, key):
+    entry = _next_recording(channel, key)
+    if _speed > 0:
+        time.sleep(entry["elapsed_ms"] / 1000 / _speed)
+    if entry.get("error"):
+        raise _replayed_error(entry)
+    return entry["response"]
+
+
+def _record(channel, key, fn, args, kwargs):
+    started_at = time.time()
+    start = time.perf_counter()
+    response, error, error_details = None, None, None
+    try:
+        response = fn(*args, **kwargs)
+        return response
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        error_details = _error_details(e)
+        raise
+    finally:
+        entry = {
+            "channel": channel,
+            "key": key,
+            "request": {"args": args, "kwargs": kwargs},
+            "response": response,
+            "error": error,
+            "error_details": error_details,
+            "started_at": started_at,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        line = json.dumps(entry, default=str)
+        with _lock:
+            if _path:
+                with open(_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+
+def recordable(channel):
+    """
+    Decorator that makes a function's traffic recordable and replayable under `channel`.
+    Arguments and return values must be JSON-serializable.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _mode is None or _inside_call.get():
+                return fn(*args, **kwargs)
+
+            key = _request_key(channel, args, kwargs)
+            token = _inside_call.set(True)
+            try:
+                if _mode == "replay":
+                    return _replay(channel, key)
+                return _record(channel, key, fn, args, kwargs)
+            finally:
+                _inside_call.reset(token)
+        return wrapper
+    return decorator
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(path):
+    """
+    Returns per-channel call counts, error counts and latency percentiles (ms) for a recording.
+    """
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for entry in _load(path):
+        latencies[entry["channel"]].append(entry["elapsed_ms"])
+        if entry.get("error"):
+            errors[entry["channel"]] += 1
+
+    return {
+        channel: {
+            "calls": len(values),
+            "errors": errors[channel],
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "total_ms": round(sum(values), 3),
+        }
+        for channel, values in sorted(latencies.items())
+    }
+
+
+def compare(baseline_path, candidate_path):
+    """
+    Compares two recordings channel by channel: latency deltas and how many
+    responses differ for calls with identical inputs.
+    """
+    baseline, candidate = summarize(baseline_path), summarize(candidate_path)
+    baseline_responses = {(e["channel"], e["key"]): e["response"] for e in _load(baseline_path)}
+
+    changed = defaultdict(int)
+    for entry in _load(candidate_path):
+        ref = (entry["channel"], entry["key"])
+        if ref in baseline_responses and baseline_responses[ref] != entry["response"]:
+            changed[entry["channel"]] += 1
+
+    report = {}
+    for channel in sorted(set(baseline) | set(candidate)):
+        before, after = baseline.get(channel, {}), candidate.get(channel, {})
+        report[channel] = {
+            "calls": (before.get("calls", 0), after.get("calls", 0)),
+            "p50_ms": (before.get("p50_ms"), after.get("p50_ms")),
+            "p95_ms": (before.get("p95_ms"), after.get("p95_ms")),
+            "changed_outputs": changed[channel],
+        }
+    return report
+
+
+# Enable from the environment so any entry point (Flask, run_pipeline.py) can record or replay
+if os.getenv("REDRAFT_REPLAY"):
+    start_replay(os.getenv("REDRAFT_REPLAY"), speed=float(os.getenv("REDRAFT_REPLAY_SPEED", 1.0)))
+elif os.getenv("REDRAFT_RECORD"):
+    start_recording(os.getenv("REDRAFT_RECORD"))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "summary":
+        print(json.dumps(summarize(sys.argv[2]), indent=2))
+    elif len(sys.argv) == 4 and sys.argv[1] == "compare":
+        print(json.dumps(compare(sys.argv[2], sys.argv[3]), indent=2))
+    else:
+        print("Usage: python -m utils.recorder summary <file> | compare <baseline> <candidate>")
+        sys.exit(1)
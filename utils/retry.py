@@ -0,0 +1,197 @@
+# utils/retry.py: Shared retry policy for transient failures on outbound calls (LLM providers, APIs).
+
+import asyncio
+import inspect
+import math
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+from utils.jobs import JobCancelled, check_job, current_job, job_remaining
+from utils.logger import get_logger
+from utils.metrics import increment
+
+logger = get_logger("Retry")
+
+# HTTP status codes worth retrying (rate limits, timeouts and server-side failures);
+# 409 Conflict is left out: it is deterministic (a duplicate LinkedIn post, for one)
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Provider exception class names that signal a network-level failure
+# (matched by name so this module doesn't depend on any provider SDK)
+RETRYABLE_EXCEPTION_NAMES = {
+    "APIConnectionError", "APITimeoutError",   # openai
+    "ServerError",                             # google-genai
+    "TimeoutException", "TransportError",      # httpx
+}
+
+
+def get_status_code(exc):
+    """
+    Extracts an HTTP status code from a provider exception, if it has one.
+    """
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc):
+    """
+    Classifies an exception as transient (retryable) or permanent.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+
+    status = get_status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+
+    return any(cls.__name__ in RETRYABLE_EXCEPTION_NAMES for cls in type(exc).__mro__)
+
+
+def get_retry_after(exc):
+    """
+    Reads the server-requested delay (in seconds) from a Retry-After header, if present.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            # HTTP-date form
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by a per-call timeout and an overall deadline.
+
+    The wrapped function receives the timeout (seconds) for the current attempt as its only
+    argument so it can pass it straight to the provider client. Inside a job (utils/jobs.py)
+    the timeout is also capped by the job's remaining time, and a cancelled or expired job
+    is never retried.
+    """
+
+    def __init__(self, name, max_attempts=4, base_delay=1.0, max_delay=30.0, call_timeout=60.0, deadline=180.0):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_timeout = call_timeout
+        self.deadline = deadline
+
+    def _backoff(self, attempt, exc):
+        """Returns the delay before the next attempt (0-based attempt index)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = get_retry_after(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _next_delay(self, attempt, exc, started, label):
+        """
+        Decides whether to retry after a failure.
+        Returns the delay in seconds, or None if the error should be re-raised.
+        """
+        if isinstance(exc, JobCancelled) or not is_retryable(exc):
+            return None
+
+        if attempt + 1 >= self.max_attempts:
+            increment(f"{self.name}.giveups")
+            logger.error(f"{label} failed after {attempt + 1} attempts: {exc}")
+            return None
+
+        delay = self._backoff(attempt, exc)
+        if time.monotonic() - started + delay >= self.deadline or delay >= job_remaining(math.inf):
+            increment(f"{self.name}.giveups")
+            logger.error(f"{label} deadline of {self.deadline}s exhausted: {exc}")
+            return None
+
+        increment(f"{self.name}.retries")
+        logger.warning(
+            f"{label} failed with a transient error ({exc}). Retrying in {delay:.2f}s... "
+            f"(Attempt {attempt + 1}/{self.max_attempts})"
+        )
+        return delay
+
+    def _timeout(self, started):
+        """Per-attempt timeout: the call timeout, capped by what is left of the deadline (and of the job)."""
+        remaining = self.deadline - (time.monotonic() - started)
+        return max(0.1, min(self.call_timeout, remaining, job_remaining(math.inf)))
+
+    def call(self, fn, label=None):
+        """
+        Calls fn(timeout) with retries. Blocks the current thread while backing off,
+        so from async code use acall() instead.
+        """
+        label = label or self.name
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            check_job()
+            increment(f"{self.name}.calls")
+            try:
+                return fn(self._timeout(started))
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started, label)
+                if delay is None:
+                    raise
+            job = current_job()
+            if job is not None:
+                job.wait(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn, label=None):
+        """
+        Async variant of call(). Coroutine functions are awaited under the per-call timeout,
+        plain functions run in a worker thread, and backoff uses asyncio.sleep so the
+        event loop is never blocked.
+        """
+        label = label or self.name
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            check_job()
+            increment(f"{self.name}.calls")
+            timeout = self._timeout(started)
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    return await asyncio.wait_for(fn(timeout), timeout=timeout)
+                return await asyncio.to_thread(fn, timeout)
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started, label)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+# Shared policy for every LLM provider call (generation, rewrite, evaluation, topics)
+LLM_RETRY_POLICY = RetryPolicy(
+    "llm",
+    max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", 4)),
+    base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0)),
+    max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", 30.0)),
+    call_timeout=float(os.getenv("LLM_CALL_TIMEOUT", 60.0)),
+    deadline=float(os.getenv("LLM_DEADLINE", 180.0)),
+)